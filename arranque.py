@@ -0,0 +1,64 @@
+# arranque.py
+"""
+⏱️ ARRANQUE DE LA APLICACIÓN
+Precarga de pandas/numpy en segundo plano y reporte de tiempos de inicio
+"""
+import os
+import sys
+import threading
+import time
+
+# Referencia de todos los tiempos: primer import de este módulo (lo hace main.py)
+INICIO = time.perf_counter()
+
+# Variable de entorno que activa el reporte de tiempos (igual que --tiempos)
+VARIABLE_REPORTE = 'ETL_TIEMPOS_ARRANQUE'
+
+# Módulos que se importan en segundo plano, en orden (processor arrastra el resto)
+MODULOS_DATOS = ('numpy', 'pandas', 'openpyxl', 'processor')
+
+_marcas = []
+_bloqueo = threading.Lock()
+_hilo_precarga = None
+reporte_activo = os.environ.get(VARIABLE_REPORTE, '') not in ('', '0')
+
+
+def marcar(etapa):
+    """Registra el momento en que termina una etapa del arranque"""
+    with _bloqueo:
+        _marcas.append((etapa, time.perf_counter() - INICIO))
+
+
+def tiempos():
+    """Lista de (etapa, segundos desde el inicio) registradas hasta ahora"""
+    with _bloqueo:
+        return list(_marcas)
+
+
+def reporte():
+    """Texto con el tiempo acumulado y parcial de cada etapa"""
+    lineas = ["⏱️ Tiempos de arranque:"]
+    anterior = 0.0
+    for etapa, segundos in tiempos():
+        lineas.append(f"  {segundos * 1000:8.1f} ms  (+{(segundos - anterior) * 1000:7.1f} ms)  {etapa}")
+        anterior = segundos
+    return "\n".join(lineas)
+
+
+def _importar_datos():
+    """Importa las librerías de datos; el import de Python es seguro entre hilos"""
+    for modulo in MODULOS_DATOS:
+        __import__(modulo)
+        marcar(f"{modulo} importado (segundo plano)")
+    if reporte_activo:
+        print(reporte(), file=sys.stderr, flush=True)
+
+
+def precargar_datos():
+    """Lanza (una sola vez) la importación de pandas/numpy/processor en un hilo daemon"""
+    global _hilo_precarga
+    if _hilo_precarga is None:
+        _hilo_precarga = threading.Thread(target=_importar_datos, name="precarga-datos", daemon=True)
+        _hilo_precarga.start()
+    return _hilo_precarga
+
@@ -0,0 +1,407 @@
+# benchmark.py
+"""
+⏱️ BENCHMARK REPRODUCIBLE DEL ETL
+Genera archivos CSV/XLSX sintéticos (filas, columnas, mezcla de tipos, nulos, formato
+de fecha y separador decimal controlables, con semilla fija) y mide sin interfaz gráfica
+la vista previa, la lectura, la inferencia del esquema y la carga completa a SQLite.
+
+Cada medición corre en un proceso nuevo para que el pico de memoria (RSS) sea el de
+esa etapa. Los resultados se guardan en JSON para comparar dos ejecuciones:
+
+    python benchmark.py correr --salida antes.json
+    python benchmark.py correr --salida despues.json
+    python benchmark.py comparar antes.json despues.json
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from metricas import pico_rss_mb
+from processor import DataProcessor
+
+# Tipos de columna que sabe generar el benchmark
+TIPOS_GENERADOS = ('entero', 'real', 'texto', 'fecha', 'booleano')
+
+# Peso de cada tipo en la mezcla de columnas por defecto
+MEZCLA_POR_DEFECTO = {'entero': 2, 'real': 2, 'texto': 3, 'fecha': 1, 'booleano': 1}
+
+# Separador decimal y de miles de los reales escritos como texto
+LOCALES_DECIMAL = {
+    'punto': ('.', ''),        # 1234.56 (se escribe como número)
+    'coma': (',', ''),         # 1234,56
+    'miles_us': ('.', ','),    # 1,234.56
+    'miles_eu': (',', '.'),    # 1.234,56
+}
+
+_PALABRAS = np.array(['norte', 'sur', 'este', 'oeste', 'centro', 'alfa', 'beta', 'gamma', 'delta', 'omega'])
+
+ESCENARIOS = {
+    'csv_estrecho': {'formato': 'csv', 'filas': 200000, 'columnas': 8},
+    'csv_ancho_texto': {'formato': 'csv', 'filas': 20000, 'columnas': 120,
+                        'mezcla': {'entero': 1, 'real': 1, 'texto': 6}},
+    'csv_eu_fechas_nulos': {'formato': 'csv', 'filas': 100000, 'columnas': 12, 'nulos': 0.2,
+                            'formato_fecha': '%d/%m/%Y', 'decimal': 'miles_eu'},
+    'csv_streaming': {'formato': 'csv', 'filas': 200000, 'columnas': 8, 'chunk': 20000},
+    # Lotes dimensionados por presupuesto de memoria (MB) en lugar de un chunk fijo
+    'csv_ancho_presupuesto': {'formato': 'csv', 'filas': 20000, 'columnas': 120,
+                              'mezcla': {'entero': 1, 'real': 1, 'texto': 6}, 'memoria': 128},
+    'xlsx_mixto': {'formato': 'xlsx', 'filas': 20000, 'columnas': 12, 'formato_fecha': '%d/%m/%Y %H:%M'},
+}
+
+# Valores por defecto de los parámetros de cada escenario
+PARAMETROS_POR_DEFECTO = {
+    'formato': 'csv',
+    'filas': 10000,
+    'columnas': 10,
+    'mezcla': MEZCLA_POR_DEFECTO,
+    'nulos': 0.0,
+    'formato_fecha': '%Y-%m-%d',
+    'decimal': 'punto',
+    'semilla': 0,
+    'chunk': None,
+    'perfil': 'seguro',
+}
+
+ETAPAS = ('preview', 'lectura', 'esquema', 'carga')
+
+# Cambio relativo de tiempo o memoria a partir del cual "comparar" marca una regresión
+UMBRAL_REGRESION = 0.10
+
+
+def tipos_columnas(columnas, mezcla=None):
+    """Tipo de cada columna repartiendo la mezcla {tipo: peso} de forma cíclica"""
+    mezcla = mezcla or MEZCLA_POR_DEFECTO
+    desconocidos = set(mezcla) - set(TIPOS_GENERADOS)
+    if desconocidos:
+        raise ValueError(f"Tipos desconocidos en la mezcla: {', '.join(sorted(desconocidos))}")
+    patron = [tipo for tipo, peso in mezcla.items() for _ in range(int(peso))]
+    if not patron:
+        raise ValueError("La mezcla de tipos no tiene ningún peso positivo")
+    return [patron[i % len(patron)] for i in range(columnas)]
+
+
+def _reales_como_texto(valores, decimal):
+    """Reales con dos decimales en el formato regional ``decimal``"""
+    separador, miles = LOCALES_DECIMAL[decimal]
+    texto = pd.Series(valores).map('{:,.2f}'.format if miles else '{:.2f}'.format)
+    # '{:,.2f}' produce el formato US: se intercambian separadores para el europeo
+    return texto.str.translate(str.maketrans({',': miles or ',', '.': separador}))
+
+
+def generar_dataframe(filas, columnas, mezcla=None, nulos=0.0, formato_fecha='%Y-%m-%d', decimal='punto', semilla=0):
+    """DataFrame sintético reproducible: la misma semilla produce siempre los mismos datos
+
+    Los reales son numéricos con ``decimal='punto'`` y texto en los demás formatos
+    regionales; las fechas se escriben como texto con ``formato_fecha``. Cada celda
+    queda vacía con probabilidad ``nulos``.
+    """
+    if decimal not in LOCALES_DECIMAL:
+        raise ValueError(f"Formato decimal desconocido: {decimal} (opciones: {', '.join(LOCALES_DECIMAL)})")
+    rng = np.random.default_rng(semilla)
+    datos = {}
+    for i, tipo in enumerate(tipos_columnas(columnas, mezcla)):
+        if tipo == 'entero':
+            serie = pd.Series(rng.integers(0, 1_000_000, filas), dtype='Int64')
+        elif tipo == 'real':
+            valores = np.round(rng.uniform(-5000, 50000, filas), 2)
+            serie = pd.Series(valores) if decimal == 'punto' else _reales_como_texto(valores, decimal)
+        elif tipo == 'texto':
+            sufijos = rng.integers(0, 1000, filas).astype(str)
+            serie = pd.Series(np.char.add(np.char.add(rng.choice(_PALABRAS, filas), '_'), sufijos), dtype=object)
+        elif tipo == 'fecha':
+            segundos = rng.integers(0, 10 * 365 * 86400, filas)
+            fechas = pd.Timestamp('2015-01-01') + pd.to_timedelta(segundos, unit='s')
+            serie = pd.Series(fechas).dt.strftime(formato_fecha).astype(object)
+        else:
+            serie = pd.Series(rng.choice(np.array(['si', 'no']), filas), dtype=object)
+
+        if nulos:
+            serie = serie.mask(rng.random(filas) < nulos)
+        datos[f"{tipo}_{i}"] = serie
+    return pd.DataFrame(datos)
+
+
+def generar_archivo(ruta, filas, columnas, **parametros):
+    """Escribe un archivo sintético CSV o XLSX (según la extensión de ``ruta``) y devuelve la ruta"""
+    df = generar_dataframe(filas, columnas, **parametros)
+    if ruta.lower().endswith('.csv'):
+        df.to_csv(ruta, index=False)
+    else:
+        df.to_excel(ruta, index=False)
+    return ruta
+
+
+def parametros_escenario(nombre, escala=1.0):
+    """Parámetros completos de un escenario con las filas multiplicadas por ``escala``"""
+    if nombre not in ESCENARIOS:
+        raise ValueError(f"Escenario desconocido: {nombre} (opciones: {', '.join(ESCENARIOS)})")
+    parametros = {**PARAMETROS_POR_DEFECTO, **ESCENARIOS[nombre]}
+    parametros['filas'] = max(int(parametros['filas'] * escala), 1)
+    return parametros
+
+
+def firma_parametros(parametros):
+    """Firma corta de los parámetros: dos ejecuciones solo se comparan si coincide"""
+    texto = json.dumps(parametros, sort_keys=True)
+    return hashlib.blake2b(texto.encode(), digest_size=6).hexdigest()
+
+
+def archivo_escenario(nombre, parametros, directorio):
+    """Archivo de datos del escenario, generado solo si no existe ya con esos parámetros"""
+    ruta = os.path.join(directorio, f"{nombre}_{firma_parametros(parametros)}.{parametros['formato']}")
+    if not os.path.exists(ruta):
+        generacion = {k: parametros[k] for k in ('mezcla', 'nulos', 'formato_fecha', 'decimal', 'semilla')}
+        temporal = f"{ruta}.tmp.{parametros['formato']}"
+        generar_archivo(temporal, parametros['filas'], parametros['columnas'], **generacion)
+        os.replace(temporal, ruta)
+    return ruta
+
+
+def _borrar_bd(bd):
+    """Elimina la base de una medición anterior junto con sus archivos WAL/SHM"""
+    for sufijo in ('', '-wal', '-shm', '-journal'):
+        if os.path.exists(bd + sufijo):
+            os.remove(bd + sufijo)
+
+
+def _medir_etapa(etapa, archivo, parametros, bd):
+    """Trabajo del proceso de medición: ejecuta una etapa y devuelve tiempo, filas y memoria"""
+    base_rss = pico_rss_mb()
+    processor = DataProcessor()
+    processor.tamano_chunk = parametros['chunk']
+    processor.presupuesto_memoria_mb = parametros.get('memoria')
+    processor.perfil_carga = parametros['perfil']
+    processor.forzar_recarga = True
+    processor.reutilizar_esquemas = False
+    processor.guardar_esquemas = False
+
+    if etapa == 'esquema':
+        # Solo se mide la inferencia: la lectura tiene su propia etapa
+        df, _ = next(processor.iterar_lotes(archivo, processor.tamano_chunk))
+
+    inicio = time.perf_counter()
+    if etapa == 'preview':
+        filas = len(processor.cargar_preview(archivo))
+    elif etapa == 'lectura':
+        filas = sum(len(lote) for lote, _ in processor.iterar_lotes(archivo, processor.tamano_chunk))
+    elif etapa == 'esquema':
+        processor.obtener_esquema_tabla(df)
+        filas = len(df)
+    else:
+        resultado = {}
+
+        def completado(exito, mensaje, total_filas=0):
+            resultado.update(exito=exito, mensaje=mensaje, filas=total_filas)
+
+        processor.procesar_archivo(archivo, bd, 'benchmark', lambda progreso, mensaje: None, completado)
+        if not resultado.get('exito'):
+            raise Exception(f"La carga falló: {resultado.get('mensaje', 'cancelada')}")
+        filas = resultado['filas']
+    segundos = time.perf_counter() - inicio
+
+    return {'segundos': segundos, 'filas': filas, 'pico_rss_mb': pico_rss_mb(), 'rss_base_mb': base_rss}
+
+
+def _medir_en_proceso(etapa, archivo, parametros, bd):
+    """Ejecuta una medición en un proceso recién creado (memoria y cachés limpias)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_medir_etapa, etapa, archivo, parametros, bd).result()
+
+
+def entorno():
+    """Versiones y máquina de la ejecución, para interpretar las comparaciones"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'sqlite': sqlite3.sqlite_version,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'commit': commit,
+    }
+
+
+def correr(escenarios=None, etapas=ETAPAS, repeticiones=3, escala=1.0, directorio=None, callback=None):
+    """Ejecuta las etapas de cada escenario ``repeticiones`` veces y devuelve los resultados
+
+    Por etapa se informa la mediana y el mínimo del tiempo, las filas por segundo
+    (sobre la mediana) y el mayor pico de RSS observado.
+    """
+    directorio = directorio or os.path.join(tempfile.gettempdir(), 'etl_benchmark')
+    os.makedirs(directorio, exist_ok=True)
+    informar = callback or (lambda mensaje: None)
+
+    resultados = []
+    for nombre in escenarios or list(ESCENARIOS):
+        parametros = parametros_escenario(nombre, escala)
+        informar(f"📄 {nombre}: generando {parametros['filas']:,} filas x {parametros['columnas']} columnas...")
+        archivo = archivo_escenario(nombre, parametros, directorio)
+        bd = os.path.join(directorio, f"{nombre}.db")
+
+        for etapa in etapas:
+            mediciones = []
+            for _ in range(repeticiones):
+                _borrar_bd(bd)
+                mediciones.append(_medir_en_proceso(etapa, archivo, parametros, bd))
+            _borrar_bd(bd)
+
+            tiempos = [m['segundos'] for m in mediciones]
+            picos = [m['pico_rss_mb'] for m in mediciones if m['pico_rss_mb'] is not None]
+            mediana = statistics.median(tiempos)
+            resultado = {
+                'escenario': nombre,
+                'etapa': etapa,
+                'firma': firma_parametros(parametros),
+                'parametros': parametros,
+                'bytes_archivo': os.path.getsize(archivo),
+                'filas': mediciones[0]['filas'],
+                'repeticiones': repeticiones,
+                'segundos': mediana,
+                'segundos_min': min(tiempos),
+                'filas_por_segundo': mediciones[0]['filas'] / mediana if mediana else None,
+                'pico_rss_mb': max(picos) if picos else None,
+                'rss_base_mb': mediciones[0]['rss_base_mb'],
+            }
+            resultados.append(resultado)
+            informar(f"   {etapa:<8} {mediana:8.3f} s  {resultado['filas_por_segundo'] or 0:>12,.0f} filas/s  "
+                     f"pico {resultado['pico_rss_mb'] or 0:7.1f} MB")
+
+    return {
+        'version': 1,
+        'fecha': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'entorno': entorno(),
+        'resultados': resultados,
+    }
+
+
+def comparar(base, nuevo, umbral=UMBRAL_REGRESION):
+    """Compara dos ejecuciones por (escenario, etapa) con los mismos parámetros
+
+    Devuelve una fila por medición común con el cambio relativo de tiempo y de pico
+    de memoria; ``regresion`` es True si alguno empeora más que ``umbral``.
+    """
+    anteriores = {(r['escenario'], r['etapa']): r for r in base['resultados']}
+    filas = []
+    for r in nuevo['resultados']:
+        previo = anteriores.get((r['escenario'], r['etapa']))
+        if previo is None:
+            continue
+        fila = {
+            'escenario': r['escenario'],
+            'etapa': r['etapa'],
+            'comparable': previo['firma'] == r['firma'],
+            'segundos_base': previo['segundos'],
+            'segundos_nuevo': r['segundos'],
+            'cambio_tiempo': r['segundos'] / previo['segundos'] - 1 if previo['segundos'] else None,
+            'pico_rss_base': previo['pico_rss_mb'],
+            'pico_rss_nuevo': r['pico_rss_mb'],
+            'cambio_memoria': None,
+        }
+        if previo['pico_rss_mb'] and r['pico_rss_mb']:
+            fila['cambio_memoria'] = r['pico_rss_mb'] / previo['pico_rss_mb'] - 1
+        fila['regresion'] = fila['comparable'] and any(
+            cambio is not None and cambio > umbral for cambio in (fila['cambio_tiempo'], fila['cambio_memoria'])
+        )
+        filas.append(fila)
+    return filas
+
+
+def _leer_json(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _porcentaje(cambio):
+    return "     -" if cambio is None else f"{cambio:+6.1%}"
+
+
+def main(argv=None):
+    """Línea de comandos del benchmark: correr, comparar, generar y escenarios"""
+    parser = argparse.ArgumentParser(prog="benchmark.py", description="Benchmark reproducible del ETL")
+    acciones = parser.add_subparsers(dest="accion", required=True)
+
+    correr_p = acciones.add_parser("correr", help="Mide los escenarios y guarda los resultados en JSON")
+    correr_p.add_argument("--escenario", action="append", choices=list(ESCENARIOS), help="Repetible; por defecto, todos")
+    correr_p.add_argument("--etapa", action="append", choices=ETAPAS, help="Repetible; por defecto, todas")
+    correr_p.add_argument("--repeticiones", type=int, default=3)
+    correr_p.add_argument("--escala", type=float, default=1.0, help="Multiplica las filas de cada escenario")
+    correr_p.add_argument("--dir", help="Carpeta de archivos generados y bases temporales")
+    correr_p.add_argument("--salida", help="JSON de resultados (por defecto benchmark_<fecha>.json)")
+
+    comparar_p = acciones.add_parser("comparar", help="Compara dos JSON de resultados")
+    comparar_p.add_argument("base")
+    comparar_p.add_argument("nuevo")
+    comparar_p.add_argument("--umbral", type=float, default=UMBRAL_REGRESION, help="Cambio relativo que cuenta como regresión")
+
+    generar_p = acciones.add_parser("generar", help="Solo genera un archivo sintético")
+    generar_p.add_argument("ruta", help="Archivo .csv o .xlsx a crear")
+    generar_p.add_argument("--filas", type=int, default=PARAMETROS_POR_DEFECTO['filas'])
+    generar_p.add_argument("--columnas", type=int, default=PARAMETROS_POR_DEFECTO['columnas'])
+    generar_p.add_argument("--mezcla", help="Pesos por tipo, ej: entero=2,real=1,texto=3,fecha=1,booleano=1")
+    generar_p.add_argument("--nulos", type=float, default=0.0, help="Proporción de celdas vacías (0-1)")
+    generar_p.add_argument("--formato-fecha", default=PARAMETROS_POR_DEFECTO['formato_fecha'])
+    generar_p.add_argument("--decimal", choices=list(LOCALES_DECIMAL), default='punto')
+    generar_p.add_argument("--semilla", type=int, default=0)
+
+    acciones.add_parser("escenarios", help="Lista los escenarios disponibles")
+    args = parser.parse_args(argv)
+
+    if args.accion == "escenarios":
+        for nombre in ESCENARIOS:
+            p = parametros_escenario(nombre)
+            print(f"{nombre}\t{p['formato']}\t{p['filas']:,} filas x {p['columnas']} columnas\t"
+                  f"nulos {p['nulos']:.0%}\t{p['formato_fecha']}\t{p['decimal']}\tchunk {p['chunk'] or '-'}\tmemoria {p.get('memoria') or '-'}")
+        return 0
+
+    if args.accion == "generar":
+        mezcla = None
+        if args.mezcla:
+            mezcla = {tipo.strip(): int(peso) for tipo, peso in (par.split('=') for par in args.mezcla.split(','))}
+        generar_archivo(args.ruta, args.filas, args.columnas, mezcla=mezcla, nulos=args.nulos,
+                        formato_fecha=args.formato_fecha, decimal=args.decimal, semilla=args.semilla)
+        print(args.ruta)
+        return 0
+
+    if args.accion == "comparar":
+        filas = comparar(_leer_json(args.base), _leer_json(args.nuevo), args.umbral)
+        for f in filas:
+            marca = "⚠️ " if f['regresion'] else ("≠ " if not f['comparable'] else "  ")
+            print(f"{marca}{f['escenario']:<22} {f['etapa']:<8} "
+                  f"{f['segundos_base']:8.3f} s → {f['segundos_nuevo']:8.3f} s {_porcentaje(f['cambio_tiempo'])}   "
+                  f"RSS {_porcentaje(f['cambio_memoria'])}")
+        if any(not f['comparable'] for f in filas):
+            print("≠ parámetros distintos entre ejecuciones: no se cuenta como regresión", file=sys.stderr)
+        return 1 if any(f['regresion'] for f in filas) else 0
+
+    resultados = correr(args.escenario, args.etapa or ETAPAS, args.repeticiones, args.escala, args.dir,
+                        callback=lambda mensaje: print(mensaje, file=sys.stderr, flush=True))
+    salida = args.salida or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(salida, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+    print(salida)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,248 @@
+# cache_esquemas.py
+"""
+🧠 ESQUEMAS RECORDADOS POR ENCABEZADO
+Guarda el esquema final de una carga (tras la corrección de tipos) bajo la firma de sus
+columnas: los archivos con el mismo encabezado se cargan sin inferir ni corregir otra vez
+
+El archivo es JSON legible y se puede editar a mano o con:
+
+    python cache_esquemas.py listar
+    python cache_esquemas.py ver FIRMA
+    python cache_esquemas.py tipo FIRMA COLUMNA TIPO
+    python cache_esquemas.py borrar FIRMA
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# Variable de entorno con otra ruta para el archivo de esquemas
+VARIABLE_RUTA = 'ETL_CACHE_ESQUEMAS'
+
+RUTA_POR_DEFECTO = os.path.join(os.path.expanduser('~'), '.etl_visual', 'esquemas.json')
+
+# Datos del esquema que se guardan por columna (el ejemplo y las estadísticas son de cada archivo)
+CAMPOS_COLUMNA = ('tipo', 'es_fecha', 'formato_fecha', 'fecha_ambigua')
+
+
+def ruta_cache(ruta=None):
+    """Ruta del archivo de esquemas: la indicada, la de la variable de entorno o la de por defecto"""
+    return ruta or os.environ.get(VARIABLE_RUTA) or RUTA_POR_DEFECTO
+
+
+def firma_encabezado(columnas):
+    """Firma de un encabezado: blake2b de los nombres de columna en su orden"""
+    nombres = json.dumps([str(c) for c in columnas], ensure_ascii=False)
+    return hashlib.blake2b(nombres.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def _leer(ruta):
+    """{firma: entrada} del archivo de esquemas ({} si todavía no existe)"""
+    ruta = ruta_cache(ruta)
+    if not os.path.exists(ruta):
+        return {}
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError as e:
+        raise Exception(f"Archivo de esquemas ilegible ({ruta}): {e}. Corríjalo o bórrelo")
+
+
+def _escribir(ruta, entradas):
+    """Reemplaza el archivo de esquemas de forma atómica (nunca queda a medio escribir)
+
+    Cada escritura usa su propio temporal: varios procesos pueden guardar a la vez
+    (gana el último) sin pisarse el archivo intermedio.
+    """
+    ruta = ruta_cache(ruta)
+    carpeta = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(carpeta, exist_ok=True)
+    descriptor, temporal = tempfile.mkstemp(dir=carpeta, prefix=os.path.basename(ruta) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+            json.dump(entradas, f, ensure_ascii=False, indent=2)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
+
+
+def _resolver_firma(entradas, firma):
+    """Firma completa a partir de la firma o de un prefijo único"""
+    if firma in entradas:
+        return firma
+    candidatas = [f for f in entradas if f.startswith(firma)]
+    if len(candidatas) != 1:
+        raise ValueError(f"No hay un esquema guardado único con firma '{firma}'")
+    return candidatas[0]
+
+
+def buscar_esquema(columnas, ruta=None):
+    """Esquema guardado para este encabezado (mismas columnas en el mismo orden) o None
+
+    Las claves de ``columna_original`` son las columnas reales del DataFrame, no
+    los textos guardados en el JSON. Solo lee: la consultan a la vez los procesos de
+    una carga múltiple (el uso lo anota :func:`registrar_uso` tras la carga).
+    """
+    entradas = _leer(ruta)
+    firma = firma_encabezado(columnas)
+    entrada = entradas.get(firma)
+    if entrada is None or entrada['columnas'] != [str(c) for c in columnas]:
+        return None
+
+    por_nombre = {str(c): c for c in columnas}
+    esquema = {
+        col_limpio: {
+            'tipo': info['tipo'],
+            'columna_original': por_nombre[info['columna_original']],
+            'es_fecha': bool(info.get('es_fecha')),
+            'formato_fecha': info.get('formato_fecha'),
+            'fecha_ambigua': bool(info.get('fecha_ambigua')),
+            'ejemplo': None,
+            'estadisticas': None,
+        }
+        for col_limpio, info in entrada['esquema'].items()
+    }
+    return esquema
+
+
+def registrar_uso(columnas, ruta=None):
+    """Suma un uso al esquema guardado de este encabezado (si lo hay); True si lo anotó
+
+    Es solo un contador: si el archivo no se puede leer o escribir (carpeta de solo
+    lectura, otro proceso escribiendo) el uso no se anota y la carga sigue igual.
+    """
+    try:
+        entradas = _leer(ruta)
+        entrada = entradas.get(firma_encabezado(columnas))
+        if entrada is None or entrada['columnas'] != [str(c) for c in columnas]:
+            return False
+        entrada['usos'] = entrada.get('usos', 0) + 1
+        entrada['ultimo_uso'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        _escribir(ruta, entradas)
+        return True
+    except Exception:
+        return False
+
+
+def guardar_esquema(esquema, tabla=None, ruta=None):
+    """Guarda el esquema bajo la firma de sus columnas de origen; devuelve la firma
+
+    Una tabla destino tiene un solo encabezado vigente: si el de ``tabla`` cambió,
+    la entrada anterior de esa tabla se elimina.
+    """
+    columnas = [str(info['columna_original']) for info in esquema.values()]
+    firma = firma_encabezado(columnas)
+    entradas = _leer(ruta)
+    ahora = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    if tabla:
+        for otra in [f for f, e in entradas.items() if e.get('tabla') == tabla and f != firma]:
+            del entradas[otra]
+
+    anterior = entradas.get(firma, {})
+    entradas[firma] = {
+        'tabla': tabla or anterior.get('tabla'),
+        'columnas': columnas,
+        'esquema': {
+            col_limpio: {'columna_original': str(info['columna_original']),
+                         **{campo: info.get(campo) for campo in CAMPOS_COLUMNA}}
+            for col_limpio, info in esquema.items()
+        },
+        'creado': anterior.get('creado', ahora),
+        'actualizado': ahora,
+        'usos': anterior.get('usos', 0),
+    }
+    _escribir(ruta, entradas)
+    return firma
+
+
+def listar_esquemas(ruta=None):
+    """Resumen de los esquemas guardados, del más reciente al más antiguo"""
+    resumen = [
+        {
+            'firma': firma,
+            'tabla': entrada.get('tabla'),
+            'columnas': len(entrada['columnas']),
+            'actualizado': entrada.get('actualizado'),
+            'usos': entrada.get('usos', 0),
+        }
+        for firma, entrada in _leer(ruta).items()
+    ]
+    return sorted(resumen, key=lambda e: e['actualizado'] or '', reverse=True)
+
+
+def obtener_esquema(firma, ruta=None):
+    """Entrada completa guardada con esa firma (o prefijo de firma)"""
+    entradas = _leer(ruta)
+    firma = _resolver_firma(entradas, firma)
+    return {'firma': firma, **entradas[firma]}
+
+
+def editar_tipo(firma, columna, tipo, ruta=None):
+    """Cambia el tipo de una columna (nombre limpio u original) de un esquema guardado"""
+    entradas = _leer(ruta)
+    firma = _resolver_firma(entradas, firma)
+    esquema = entradas[firma]['esquema']
+    col_limpio = columna if columna in esquema else next(
+        (c for c, info in esquema.items() if info['columna_original'] == columna), None
+    )
+    if col_limpio is None:
+        raise ValueError(f"La columna '{columna}' no está en el esquema {firma}")
+
+    tipo = tipo.upper()
+    esquema[col_limpio]['tipo'] = tipo
+    esquema[col_limpio]['es_fecha'] = tipo in ['DATE', 'DATETIME']
+    entradas[firma]['actualizado'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    _escribir(ruta, entradas)
+
+
+def eliminar_esquema(firma, ruta=None):
+    """Olvida un esquema guardado: su encabezado vuelve a inferirse en la próxima carga"""
+    entradas = _leer(ruta)
+    firma = _resolver_firma(entradas, firma)
+    del entradas[firma]
+    _escribir(ruta, entradas)
+
+
+def main(argv=None):
+    """Consulta y edición de los esquemas guardados desde la línea de comandos"""
+    parser = argparse.ArgumentParser(prog="cache_esquemas.py", description="Esquemas recordados por encabezado")
+    parser.add_argument("--ruta", help=f"Archivo de esquemas (por defecto {ruta_cache()})")
+    acciones = parser.add_subparsers(dest="accion", required=True)
+    acciones.add_parser("listar", help="Lista los esquemas guardados")
+    ver = acciones.add_parser("ver", help="Muestra las columnas y tipos de un esquema")
+    ver.add_argument("firma")
+    tipo = acciones.add_parser("tipo", help="Cambia el tipo de una columna")
+    tipo.add_argument("firma")
+    tipo.add_argument("columna")
+    tipo.add_argument("tipo")
+    borrar = acciones.add_parser("borrar", help="Elimina un esquema guardado")
+    borrar.add_argument("firma")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.accion == "listar":
+            for e in listar_esquemas(args.ruta):
+                print(f"{e['firma']}\t{e['tabla'] or '-'}\t{e['columnas']} columnas\t{e['usos']} usos\t{e['actualizado']}")
+        elif args.accion == "ver":
+            entrada = obtener_esquema(args.firma, args.ruta)
+            print(f"🧠 {entrada['firma']} · tabla {entrada['tabla'] or '-'} · actualizado {entrada['actualizado']}")
+            for col_limpio, info in entrada['esquema'].items():
+                formato = f" ({info['formato_fecha']})" if info.get('formato_fecha') else ""
+                print(f"{col_limpio}\t{info['tipo']}{formato}\t← {info['columna_original']}")
+        elif args.accion == "tipo":
+            editar_tipo(args.firma, args.columna, args.tipo, args.ruta)
+        else:
+            eliminar_esquema(args.firma, args.ruta)
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
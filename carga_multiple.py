@@ -0,0 +1,561 @@
+# carga_multiple.py
+"""
+📦 CARGA MÚLTIPLE DE ARCHIVOS Y HOJAS
+Lee y convierte varios archivos (u hojas de un libro Excel) en procesos paralelos
+y los inserta con un único escritor SQLite
+"""
+import glob
+import multiprocessing
+import os
+import queue
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from lector_excel import listar_hojas
+from manifiesto import datos_archivo, registrar_carga
+from processor import DataProcessor, nombre_tabla_desde_archivo
+
+# Extensiones que se toman al recibir un directorio
+EXTENSIONES_ARCHIVO = ('.csv', '.xlsx', '.xlsm', '.xls')
+
+# Columna con el nombre de la hoja de origen en la carga unida de un libro
+COLUMNA_HOJA = 'hoja'
+
+# Tipo resultante cuando una columna tiene tipos distintos según la hoja
+_TIPOS_COMPATIBLES = {frozenset({'INTEGER', 'REAL'}): 'REAL'}
+
+# Lotes convertidos que cada proceso puede dejar esperando al escritor
+LOTES_EN_COLA = 2
+
+# Tareas enviadas al pool además de una por proceso (al terminar una, la siguiente ya espera)
+MARGEN_TAREAS = 1
+
+# Presupuesto de memoria (MB, repartido entre los procesos) si el processor no fija lotes
+PRESUPUESTO_MEMORIA_MB = 512
+
+# Segundos entre comprobaciones de cancelación mientras se espera una cola
+ESPERA_COLA = 0.5
+
+# Atributos del processor que los procesos copian para inferir y convertir como una carga secuencial
+ATRIBUTOS_PROCESOS = (
+    'tamano_chunk', 'muestreo_tipos', 'filas_muestra_tipos', 'tipos_forzados',
+    'reutilizar_esquemas', 'ruta_cache_esquemas', 'capacidad_pipeline',
+)
+
+
+def listar_archivos(origen):
+    """Archivos a cargar desde un directorio o un patrón glob, en orden alfabético"""
+    if os.path.isdir(origen):
+        rutas = [os.path.join(origen, nombre) for nombre in os.listdir(origen)]
+        rutas = [r for r in rutas if os.path.isfile(r) and r.lower().endswith(EXTENSIONES_ARCHIVO)]
+    else:
+        rutas = [r for r in glob.glob(origen) if os.path.isfile(r)]
+    return sorted(rutas)
+
+
+def nombre_tabla_hoja(archivo, hoja):
+    """Tabla de una hoja cargada por separado: <archivo>_<hoja>"""
+    sufijo = re.sub(r'[^\w]', '_', str(hoja).strip())
+    return f"{nombre_tabla_desde_archivo(archivo)}_{sufijo}"
+
+
+def _processor_proceso(configuracion):
+    """DataProcessor del proceso trabajador con la configuración del cargador"""
+    processor = DataProcessor()
+    for atributo, valor in configuracion.items():
+        setattr(processor, atributo, valor)
+    return processor
+
+
+def _inferir_esquema(processor, archivo, hoja, tamano_lote, primer_lote):
+    """Esquema de un archivo u hoja igual que en procesar_archivo (recordado, inferido y forzado)
+
+    Devuelve (esquema, recordado): el uso de un esquema guardado lo anota el escritor
+    cuando la carga termina, no el proceso que lo consulta.
+    """
+    esquema = processor.esquema_recordado(primer_lote)
+    if esquema:
+        return esquema, True
+    perfiles = None
+    if tamano_lote and processor.muestreo_tipos != 'desactivado':
+        perfiles = processor.perfilar_archivo(archivo, primer_lote, tamano_lote, hoja)
+    return processor.aplicar_tipos_forzados(processor.obtener_esquema_tabla(primer_lote, perfiles)), False
+
+
+def _leer_esquema(archivo, hoja, configuracion):
+    """Trabajo de cada proceso en la carga unida: solo el esquema de la hoja (o el texto del error)"""
+    resultado = {'archivo': archivo, 'hoja': hoja}
+    lotes = None
+    try:
+        processor = _processor_proceso(configuracion)
+        inicio = time.perf_counter()
+        tamano_lote = processor.dimensionar_lotes(archivo)
+        lotes = processor.iterar_lotes(archivo, tamano_lote, hoja=hoja)
+        primer_lote, _ = next(lotes)
+        resultado['esquema'], resultado['recordado'] = _inferir_esquema(
+            processor, archivo, hoja, tamano_lote, primer_lote
+        )
+        resultado['segundos_lectura'] = time.perf_counter() - inicio
+    except Exception as e:
+        resultado['error'] = str(e)
+    finally:
+        if lotes is not None:
+            lotes.close()
+    return resultado
+
+
+def _poner(cola, detener, mensaje):
+    """Deja un mensaje para el escritor; False si la tarea se detuvo mientras esperaba lugar"""
+    while not detener.is_set():
+        try:
+            cola.put(mensaje, timeout=ESPERA_COLA)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _leer_y_convertir(archivo, hoja, configuracion, cola, detener, esquema=None):
+    """Trabajo de cada proceso: lee el archivo (u hoja) por lotes, infiere el esquema y convierte cada lote
+
+    Los mensajes van por ``cola``, acotada a LOTES_EN_COLA: si el escritor se atrasa el
+    proceso espera en vez de acumular lotes. Primero {'tipo': 'esquema'}, luego un
+    {'tipo': 'lote'} por lote convertido y al final {'tipo': 'fin'} con los tiempos, o
+    {'tipo': 'error'} con el texto del error (las excepciones de pandas no siempre se
+    pueden serializar entre procesos). Con ``esquema`` (carga unida) no se infiere.
+    """
+    lotes = None
+    try:
+        processor = _processor_proceso(configuracion)
+        segundos = {'lectura': 0.0, 'conversion': 0.0}
+        inicio = time.perf_counter()
+        tamano_lote = processor.dimensionar_lotes(archivo)
+        lotes = processor.iterar_lotes(archivo, tamano_lote, hoja=hoja)
+        siguiente = next(lotes)
+        segundos['lectura'] += time.perf_counter() - inicio
+
+        recordado = False
+        if esquema is None:
+            inicio = time.perf_counter()
+            esquema, recordado = _inferir_esquema(processor, archivo, hoja, tamano_lote, siguiente[0])
+            segundos['conversion'] += time.perf_counter() - inicio
+        mensaje = {'tipo': 'esquema', 'esquema': esquema, 'recordado': recordado,
+                   'filas_por_bloque': processor._filas_por_bloque}
+        if not _poner(cola, detener, mensaje):
+            return
+
+        while siguiente is not None:
+            lote, fraccion = siguiente
+            inicio = time.perf_counter()
+            mensaje = {'tipo': 'lote', 'df': processor.aplicar_esquema_a_df(lote, esquema), 'fraccion': fraccion}
+            segundos['conversion'] += time.perf_counter() - inicio
+            del lote
+            if not _poner(cola, detener, mensaje):
+                return
+            del mensaje
+
+            inicio = time.perf_counter()
+            siguiente = next(lotes, None)
+            segundos['lectura'] += time.perf_counter() - inicio
+
+        _poner(cola, detener, {'tipo': 'fin', 'segundos_lectura': segundos['lectura'],
+                               'segundos_conversion': segundos['conversion']})
+    except Exception as e:
+        _poner(cola, detener, {'tipo': 'error', 'error': str(e)})
+    finally:
+        if lotes is not None:
+            lotes.close()
+
+
+def _esquema_unido(esquemas):
+    """Une los esquemas de varias hojas por nombre de columna limpio
+
+    Las columnas se toman en orden de aparición; si el tipo difiere entre hojas
+    se usa REAL para INTEGER/REAL y TEXT en cualquier otro caso.
+    """
+    unido = {}
+    for esquema in esquemas:
+        for col_limpio, info in esquema.items():
+            if col_limpio not in unido:
+                unido[col_limpio] = {**info, 'columna_original': col_limpio}
+            elif unido[col_limpio]['tipo'] != info['tipo']:
+                tipos = frozenset({unido[col_limpio]['tipo'], info['tipo']})
+                unido[col_limpio]['tipo'] = _TIPOS_COMPATIBLES.get(tipos, 'TEXT')
+    unido[COLUMNA_HOJA] = {'tipo': 'TEXT', 'columna_original': COLUMNA_HOJA, 'es_fecha': False}
+    return unido
+
+
+class CargadorMultiple:
+    """Carga un conjunto de archivos u hojas con un pool de lectura y un único escritor"""
+
+    def __init__(self, processor=None, workers=None):
+        """
+        Args:
+            processor: DataProcessor cuya configuración (perfil, modo, commits) usa el escritor
+            workers: procesos de lectura/conversión; None = núcleos disponibles
+        """
+        self.processor = processor or DataProcessor()
+        self.workers = workers or os.cpu_count() or 1
+
+    def cargar(self, origen, bd_destino, callback_progreso=None):
+        """Carga todos los archivos de ``origen`` (directorio o glob) en ``bd_destino``
+
+        Cada archivo va a la tabla con su nombre. Devuelve una lista de dicts por
+        archivo con tabla, éxito, filas, mensaje y tiempos.
+        """
+        archivos = listar_archivos(origen)
+        if not archivos:
+            raise Exception(f"No se encontraron archivos en: {origen}")
+
+        tareas = [(archivo, 0, nombre_tabla_desde_archivo(archivo), datos_archivo(archivo)) for archivo in archivos]
+        return self._cargar_tareas(tareas, bd_destino, callback_progreso, "📦")
+
+    def cargar_hojas(self, archivo, bd_destino, hojas=None, tabla_unida=None, callback_progreso=None):
+        """Carga varias hojas de un libro Excel, leídas en paralelo
+
+        Args:
+            hojas: nombres de hoja a cargar; None = todas
+            tabla_unida: None = una tabla por hoja (<archivo>_<hoja>); si se indica,
+                todas las hojas van a esa tabla con la columna ``hoja`` de origen
+        """
+        disponibles = listar_hojas(archivo)
+        hojas = disponibles if not hojas else list(hojas)
+        faltantes = [h for h in hojas if h not in disponibles]
+        if faltantes:
+            raise Exception(f"Hojas inexistentes en {os.path.basename(archivo)}: {', '.join(map(str, faltantes))}")
+
+        archivo_info = datos_archivo(archivo)
+        if tabla_unida is None:
+            tareas = [(archivo, hoja, nombre_tabla_hoja(archivo, hoja), archivo_info) for hoja in hojas]
+            return self._cargar_tareas(tareas, bd_destino, callback_progreso, "📗")
+        return self._cargar_unido(archivo, hojas, tabla_unida, archivo_info, bd_destino, callback_progreso)
+
+    def _cargar_tareas(self, tareas, bd_destino, callback_progreso, icono):
+        """Convierte las tareas (archivo, hoja, tabla, datos) en paralelo y escribe cada una en su tabla"""
+        processor = self.processor
+        informar = self._preparar(callback_progreso)
+
+        resultados = []
+        pendientes = []
+        for archivo, hoja, tabla, archivo_info in tareas:
+            carga_previa = None
+            if not processor.forzar_recarga:
+                carga_previa = processor._buscar_carga_previa(bd_destino, archivo_info, tabla)
+            if carga_previa:
+                resultados.append(self._resultado(archivo, tabla, True, carga_previa['filas'],
+                                                  "⏭️ Archivo sin cambios", hoja))
+            else:
+                pendientes.append((archivo, hoja, tabla, archivo_info))
+
+        total = len(tareas)
+        informar(len(resultados) / total, f"{icono} {len(pendientes)} por cargar ({total - len(pendientes)} sin cambios)")
+        if not pendientes:
+            return resultados
+
+        conn = processor._conectar(bd_destino)
+        try:
+            for (archivo, hoja, tabla, archivo_info), mensajes, inicio in self._convertir_en_pool(pendientes):
+                resultado = self._escribir(conn, archivo, mensajes, tabla, archivo_info)
+                resultado['hoja'] = hoja
+                resultado['segundos_total'] = time.perf_counter() - inicio
+                resultados.append(resultado)
+
+                nombre = os.path.basename(archivo) if icono == "📦" else hoja
+                informar(len(resultados) / total,
+                         f"{icono} {len(resultados)}/{total} · {nombre}: {resultado['filas']:,} filas")
+        finally:
+            processor._cerrar_conexion(conn)
+
+        return resultados
+
+    def _cargar_unido(self, archivo, hojas, tabla, archivo_info, bd_destino, callback_progreso):
+        """Carga todas las hojas en una tabla con la columna ``hoja``; devuelve un resultado por hoja"""
+        processor = self.processor
+        informar = self._preparar(callback_progreso)
+
+        if not processor.forzar_recarga:
+            carga_previa = processor._buscar_carga_previa(bd_destino, archivo_info, tabla, hojas)
+            if carga_previa:
+                informar(1.0, "⏭️ Archivo sin cambios")
+                return [self._resultado(archivo, tabla, True, carga_previa['filas'], "⏭️ Archivo sin cambios")]
+
+        # Se necesita el esquema de todas las hojas antes de crear la tabla unida: primero
+        # solo los esquemas (resultados pequeños), después los datos por lotes
+        total = len(hojas)
+        esquemas = {}
+        recordados = []
+        for leido in self._esquemas_en_pool(archivo, hojas):
+            if 'error' in leido:
+                # Una hoja ilegible invalida la tabla unida
+                return [self._resultado(archivo, tabla, False, 0, f"Error al leer: {leido['error']}", leido['hoja'])]
+            esquemas[leido['hoja']] = leido['esquema']
+            if leido['recordado']:
+                recordados.append(leido['esquema'])
+            informar(0.2 * len(esquemas) / total, f"📗 Esquema {len(esquemas)}/{total} · {leido['hoja']}")
+        if processor.cancelado or len(esquemas) < total:
+            return [self._resultado(archivo, tabla, False, 0, "Carga cancelada")]
+
+        # Mismo orden que el libro, no el de llegada
+        esquema = _esquema_unido(esquemas[hoja] for hoja in hojas)
+        columnas = list(esquema.keys())
+
+        resultados = []
+        motor = None
+        conn = processor._conectar(bd_destino)
+        try:
+            inicio = time.perf_counter()
+            tareas = [(archivo, hoja, tabla, archivo_info) for hoja in hojas]
+            for (_, hoja, _, _), mensajes, inicio_hoja in self._convertir_en_pool(tareas, esquemas):
+                filas_previas = motor.filas_insertadas if motor else 0
+                fin = None
+                for mensaje in mensajes:
+                    if mensaje['tipo'] == 'error':
+                        # La staging a medio llenar se descarta al cerrar la conexión
+                        return resultados + [self._resultado(archivo, tabla, False, 0,
+                                                             f"Error al leer: {mensaje['error']}", hoja)]
+                    if mensaje['tipo'] == 'esquema' and motor is None:
+                        processor._filas_por_bloque = mensaje['filas_por_bloque']
+                    elif mensaje['tipo'] == 'fin':
+                        fin = mensaje
+                    elif mensaje['tipo'] == 'lote':
+                        df = self._alinear_hoja(mensaje['df'], esquemas[hoja], hoja, columnas)
+                        if motor is None:
+                            tabla_destino = processor._preparar_tabla_destino(conn, tabla, esquema, df)
+                            motor = processor._crear_motor(conn, tabla_destino, esquema)
+                        if not motor.insertar(processor._filas_lote(df, columnas), cancelado=lambda: processor.cancelado):
+                            break
+                if fin is None:
+                    return resultados + [self._resultado(archivo, tabla, False, 0, "Carga cancelada", hoja)]
+
+                resultado = self._resultado(archivo, tabla, True, motor.filas_insertadas - filas_previas,
+                                            "✅ Cargada", hoja)
+                self._anotar_tiempos(resultado, fin, time.perf_counter() - inicio_hoja)
+                resultados.append(resultado)
+                informar(0.2 + 0.75 * len(resultados) / total,
+                         f"📗 Hoja {len(resultados)}/{total} · {hoja}: {resultado['filas']:,} filas")
+            if len(resultados) < total:
+                return resultados + [self._resultado(archivo, tabla, False, 0, "Carga cancelada")]
+            motor.finalizar()
+
+            if processor._claves_incrementales is None:
+                processor._publicar_staging(conn, tabla)
+            else:
+                processor._resumen_incremental(conn, tabla, motor.filas_insertadas)
+            registrar_carga(conn, archivo_info, tabla, esquema, motor.filas_insertadas,
+                            processor._parametros_carga(hojas), processor._claves_incrementales is None)
+            for esquema_hoja in recordados:
+                processor._anotar_uso_esquema(info['columna_original'] for info in esquema_hoja.values())
+
+            segundos_insercion = time.perf_counter() - inicio
+            for resultado in resultados:
+                resultado['segundos_insercion'] = segundos_insercion
+        except Exception as e:
+            return resultados + [self._resultado(archivo, tabla, False, 0, f"Error al insertar: {e}")]
+        finally:
+            processor._cerrar_conexion(conn)
+
+        informar(1.0, f"✅ {total} hojas en {tabla}: {motor.filas_insertadas:,} filas")
+        return resultados
+
+    def _preparar(self, callback_progreso):
+        """Reinicia la cancelación y devuelve la función de progreso a usar"""
+        self.processor.cancelado = False
+        self.processor.callback_progreso = lambda progreso, mensaje: None
+        self.processor._filas_por_bloque = None  # Cada archivo trae el suyo junto con el esquema
+        return callback_progreso or (lambda progreso, mensaje: None)
+
+    def _configuracion_procesos(self):
+        """Configuración de lectura, inferencia y conversión del processor para los procesos
+
+        El presupuesto de memoria es de toda la carga: cada proceso dimensiona sus lotes
+        con su parte. Sin presupuesto ni tamano_chunk se usa PRESUPUESTO_MEMORIA_MB, así un
+        archivo grande nunca viaja completo entre procesos.
+        """
+        processor = self.processor
+        configuracion = {atributo: getattr(processor, atributo) for atributo in ATRIBUTOS_PROCESOS}
+        presupuesto = processor.presupuesto_memoria_mb
+        if not presupuesto and not processor.tamano_chunk:
+            presupuesto = PRESUPUESTO_MEMORIA_MB
+        configuracion['presupuesto_memoria_mb'] = max(presupuesto // self.workers, 1) if presupuesto else None
+        return configuracion
+
+    def _nuevo_pool(self, num_tareas):
+        """Pool de procesos de lectura (spawn: el cargador puede correr en un hilo)"""
+        return ProcessPoolExecutor(
+            max_workers=min(self.workers, num_tareas),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+
+    def _esquemas_en_pool(self, archivo, hojas):
+        """Esquema de cada hoja, leído en procesos; se entregan según terminan"""
+        configuracion = self._configuracion_procesos()
+        pool = self._nuevo_pool(len(hojas))
+        try:
+            futuros = [pool.submit(_leer_esquema, archivo, hoja, configuracion) for hoja in hojas]
+            for futuro in as_completed(futuros):
+                if self.processor.cancelado:
+                    break
+                yield futuro.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    def _convertir_en_pool(self, tareas, esquemas=None):
+        """Lee y convierte las tareas en procesos; entrega (tarea, mensajes, inicio) en el orden de ``tareas``
+
+        Solo hay ``workers`` + MARGEN_TAREAS tareas enviadas a la vez y cada una deja a lo
+        sumo LOTES_EN_COLA lotes convertidos esperando: la memoria no crece con la cantidad
+        de archivos aunque el único escritor vaya más lento que la lectura. Los mensajes de
+        una tarea se consumen antes de pedir la siguiente. ``esquemas`` ({hoja: esquema})
+        evita inferir en los procesos.
+        """
+        configuracion = self._configuracion_procesos()
+        gestor = multiprocessing.get_context('spawn').Manager()
+        pool = self._nuevo_pool(len(tareas))
+        enviadas = deque()
+        por_enviar = iter(tareas)
+
+        def enviar():
+            tarea = next(por_enviar, None)
+            if tarea is None:
+                return
+            cola, detener = gestor.Queue(LOTES_EN_COLA), gestor.Event()
+            esquema = esquemas[tarea[1]] if esquemas else None
+            # El tiempo de cada tarea corre desde que se envía, no desde el inicio del lote
+            inicio = time.perf_counter()
+            futuro = pool.submit(_leer_y_convertir, tarea[0], tarea[1], configuracion, cola, detener, esquema)
+            enviadas.append((tarea, futuro, cola, detener, inicio))
+
+        try:
+            for _ in range(min(self.workers + MARGEN_TAREAS, len(tareas))):
+                enviar()
+
+            # Los lotes se consumen en el hilo del único escritor a medida que llegan
+            while enviadas and not self.processor.cancelado:
+                tarea, futuro, cola, detener, inicio = enviadas.popleft()
+                yield tarea, self._mensajes(futuro, cola), inicio
+                # Si el escritor dejó la tarea a medias (error al insertar), el proceso no queda esperando
+                detener.set()
+                enviar()
+        finally:
+            for _, _, _, detener, _ in enviadas:
+                detener.set()
+            pool.shutdown(cancel_futures=True)
+            gestor.shutdown()
+
+    def _mensajes(self, futuro, cola):
+        """Mensajes de una tarea hasta 'fin' o 'error'; se corta si la carga se cancela"""
+        while True:
+            try:
+                mensaje = cola.get(timeout=ESPERA_COLA)
+            except queue.Empty:
+                if self.processor.cancelado:
+                    return
+                if futuro.done():
+                    # El proceso terminó sin avisar (se cayó): lo que quedó en la cola ya se leyó
+                    error = None if futuro.cancelled() else futuro.exception()
+                    yield {'tipo': 'error', 'error': str(error or "el proceso de lectura terminó sin resultado")}
+                    return
+                continue
+            yield mensaje
+            if mensaje['tipo'] in ('fin', 'error'):
+                return
+
+    @staticmethod
+    def _alinear_hoja(df, esquema_hoja, hoja, columnas):
+        """Lote de una hoja con las columnas del esquema unido (faltantes = None) y su nombre"""
+        df = df.rename(columns={
+            info['columna_original']: col_limpio for col_limpio, info in esquema_hoja.items()
+        })
+        df = df.reindex(columns=columnas[:-1])
+        return df.assign(**{COLUMNA_HOJA: str(hoja)})
+
+    def _escribir(self, conn, archivo, mensajes, tabla, archivo_info):
+        """Inserta los lotes convertidos de un archivo en su tabla (staging o upsert según el modo)"""
+        processor = self.processor
+        motor = None
+        fin = None
+        segundos_insercion = 0.0
+        try:
+            for mensaje in mensajes:
+                if mensaje['tipo'] == 'error':
+                    self._descartar(conn)
+                    return self._resultado(archivo, tabla, False, 0, f"Error al leer: {mensaje['error']}")
+                if mensaje['tipo'] == 'esquema':
+                    esquema = mensaje['esquema']
+                    recordado = mensaje['recordado']
+                    processor._filas_por_bloque = mensaje['filas_por_bloque']
+                    columnas_origen = [info['columna_original'] for info in esquema.values()]
+                    continue
+                if mensaje['tipo'] == 'fin':
+                    fin = mensaje
+                    break
+
+                inicio = time.perf_counter()
+                df = mensaje['df']
+                if motor is None:
+                    # El primer lote sirve de muestra para la clave del modo incremental
+                    tabla_destino = processor._preparar_tabla_destino(conn, tabla, esquema, df)
+                    motor = processor._crear_motor(conn, tabla_destino, esquema)
+                if not motor.insertar(processor._filas_lote(df, columnas_origen), cancelado=lambda: processor.cancelado):
+                    break
+                segundos_insercion += time.perf_counter() - inicio
+
+            if fin is None or motor is None:
+                self._descartar(conn)
+                return self._resultado(archivo, tabla, False, 0, "Carga cancelada")
+
+            inicio = time.perf_counter()
+            motor.finalizar()
+            if processor._claves_incrementales is None:
+                processor._publicar_staging(conn, tabla)
+                mensaje = "✅ Cargado"
+            else:
+                mensaje = "✅ Cargado" + processor._resumen_incremental(conn, tabla, motor.filas_insertadas).replace("\n", " ")
+            registrar_carga(conn, archivo_info, tabla, esquema, motor.filas_insertadas,
+                            processor._parametros_carga(), processor._claves_incrementales is None)
+            if recordado:
+                processor._anotar_uso_esquema(columnas_origen)
+            segundos_insercion += time.perf_counter() - inicio
+        except Exception as e:
+            self._descartar(conn)
+            return self._resultado(archivo, tabla, False, 0, f"Error al insertar: {e}")
+
+        resultado = self._resultado(archivo, tabla, True, motor.filas_insertadas, mensaje)
+        self._anotar_tiempos(resultado, fin, 0.0)
+        resultado['segundos_insercion'] = segundos_insercion
+        resultado['filas_por_segundo'] = motor.filas_por_segundo
+        return resultado
+
+    def _descartar(self, conn):
+        """Deshace lo no confirmado de un archivo fallido o cancelado y borra su staging"""
+        processor = self.processor
+        conn.rollback()
+        if processor._tabla_staging:
+            conn.execute(f"DROP TABLE IF EXISTS {processor._tabla_staging}")
+            conn.commit()
+            processor._tabla_staging = None
+
+    @staticmethod
+    def _anotar_tiempos(resultado, tiempos, segundos_total):
+        """Copia al resultado los tiempos medidos en el proceso trabajador"""
+        resultado['segundos_lectura'] = tiempos.get('segundos_lectura', 0.0)
+        resultado['segundos_conversion'] = tiempos.get('segundos_conversion', 0.0)
+        resultado['segundos_total'] = segundos_total
+
+    @staticmethod
+    def _resultado(archivo, tabla, exito, filas, mensaje, hoja=None):
+        """Estructura común del resultado de cada archivo u hoja"""
+        return {
+            'archivo': archivo,
+            'hoja': hoja,
+            'tabla': tabla,
+            'exito': exito,
+            'filas': filas,
+            'mensaje': mensaje,
+            'segundos_lectura': 0.0,
+            'segundos_conversion': 0.0,
+            'segundos_insercion': 0.0,
+            'segundos_total': 0.0,
+        }
@@ -0,0 +1,181 @@
+# cli.py
+"""
+🖥️ CARGA DESDE LÍNEA DE COMANDOS
+Ejecuta DataProcessor.procesar_archivo sin interfaz gráfica (cron, contenedores, servidores)
+"""
+import argparse
+import json
+import os
+import sys
+
+from processor import DataProcessor, PERFILES_SQLITE, nombre_tabla_desde_archivo
+
+# Códigos de salida
+SALIDA_OK = 0
+SALIDA_ERROR = 1
+SALIDA_CANCELADA = 130
+
+TIPOS_SQLITE = ('INTEGER', 'REAL', 'TEXT', 'BLOB', 'NUMERIC', 'BOOLEAN', 'DATE', 'DATETIME')
+
+
+def _tipo_columna(texto):
+    """Convierte 'columna=TIPO' en una tupla (columna, TIPO)"""
+    columna, separador, tipo = texto.rpartition('=')
+    if not separador or not columna or tipo.upper() not in TIPOS_SQLITE:
+        raise argparse.ArgumentTypeError(
+            f"'{texto}' no es COLUMNA=TIPO válido (tipos: {', '.join(TIPOS_SQLITE)})"
+        )
+    return columna, tipo.upper()
+
+
+def crear_parser():
+    """Argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Carga un archivo Excel/CSV (o una carpeta/glob de archivos) a SQLite sin interfaz gráfica"
+    )
+    parser.add_argument("archivo", help="Archivo CSV/Excel, carpeta o patrón glob")
+    parser.add_argument("--bd", default="datos", help="Base de datos destino (se añade .db si falta)")
+    parser.add_argument("--tabla", help="Tabla destino (por defecto, el nombre del archivo)")
+    parser.add_argument("--perfil", choices=list(PERFILES_SQLITE), default="seguro", help="Perfil de PRAGMAs de SQLite")
+    parser.add_argument("--tipo", action="append", type=_tipo_columna, default=[], metavar="COLUMNA=TIPO",
+                        help="Fuerza el tipo de una columna (repetible)")
+    parser.add_argument("--modo", choices=["reemplazar", "incremental"], default="reemplazar", help="Modo de carga")
+    parser.add_argument("--clave", action="append", default=[], help="Columna clave del modo incremental (repetible)")
+    parser.add_argument("--hojas", help="Excel: 'todas' o lista de hojas separadas por comas (en paralelo)")
+    parser.add_argument("--unir", action="store_true",
+                        help="Con --hojas: una sola tabla (--tabla) con la columna 'hoja' en vez de una por hoja")
+    parser.add_argument("--muestreo", choices=["muestra", "completo", "desactivado"], default="muestra",
+                        help="Inferencia de tipos: muestra repartida, todos los valores o solo dtypes de pandas")
+    parser.add_argument("--reinferir", action="store_true",
+                        help="Inferir tipos aunque haya un esquema guardado para este encabezado")
+    parser.add_argument("--no-guardar-esquema", dest="guardar_esquema", action="store_false",
+                        help="No recordar el esquema de --tipo para próximos archivos con este encabezado")
+    parser.add_argument("--chunk", type=int, help="Filas por lote (modo streaming)")
+    parser.add_argument("--memoria", type=int, metavar="MB",
+                        help="Presupuesto de memoria: lotes de lectura e inserción según los bytes por fila (reemplaza a --chunk)")
+    parser.add_argument("--commit", type=int, help="Filas entre commits")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para convertir columnas / leer archivos")
+    parser.add_argument("--forzar", action="store_true", help="Recargar aunque el archivo no haya cambiado")
+    parser.add_argument("--eventos", action="store_true",
+                        help="Escribir en stderr un JSON por línea con cada evento de tiempo por etapa")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="No mostrar el progreso")
+    return parser
+
+
+class ReporteConsola:
+    """Escribe el progreso en stderr sin repetir líneas con el mismo porcentaje y mensaje"""
+
+    def __init__(self, silencioso=False):
+        self.silencioso = silencioso
+        self._ultimo = None
+        self.exito = None
+        self.mensaje = ""
+        self.total_filas = 0
+
+    def progreso(self, progreso, mensaje):
+        """Callback de progreso de DataProcessor"""
+        # Durante la inserción el mensaje cambia en cada bloque: basta con el porcentaje
+        clave = (int(progreso * 100), mensaje.split(':')[0])
+        if self.silencioso or clave == self._ultimo:
+            return
+        self._ultimo = clave
+        print(f"[{progreso:4.0%}] {mensaje}", file=sys.stderr, flush=True)
+
+    def completado(self, exito, mensaje, total_filas=0):
+        """Callback de fin de carga de DataProcessor"""
+        self.exito = exito
+        self.mensaje = mensaje
+        self.total_filas = total_filas
+
+
+def _cargar_archivo(processor, args, bd):
+    """Carga un único archivo y devuelve el código de salida"""
+    tabla = args.tabla or nombre_tabla_desde_archivo(args.archivo)
+    reporte = ReporteConsola(args.silencioso)
+    processor.procesar_archivo(args.archivo, bd, tabla, reporte.progreso, reporte.completado)
+
+    if reporte.exito is None:
+        print("⚠️ Carga cancelada", file=sys.stderr)
+        return SALIDA_CANCELADA
+    if not reporte.exito:
+        print(f"❌ {reporte.mensaje}", file=sys.stderr)
+        return SALIDA_ERROR
+
+    print(reporte.mensaje, file=sys.stderr)
+    print(f"{tabla}\t{reporte.total_filas}")
+    return SALIDA_OK
+
+
+def _cargar_hojas(processor, args, bd):
+    """Carga varias hojas de un libro con el cargador múltiple y devuelve el código de salida"""
+    from carga_multiple import CargadorMultiple
+
+    hojas = None if args.hojas.strip().lower() == 'todas' else [h.strip() for h in args.hojas.split(',') if h.strip()]
+    tabla_unida = (args.tabla or nombre_tabla_desde_archivo(args.archivo)) if args.unir else None
+
+    reporte = ReporteConsola(args.silencioso)
+    resultados = CargadorMultiple(processor, args.workers).cargar_hojas(
+        args.archivo, bd, hojas, tabla_unida, reporte.progreso
+    )
+    for r in resultados:
+        print(f"{r['tabla']}\t{r['hoja']}\t{r['filas'] if r['exito'] else 'ERROR'}\t{r['segundos_total']:.2f}")
+        if not r['exito']:
+            print(f"❌ {r['hoja']}: {r['mensaje']}", file=sys.stderr)
+    return SALIDA_OK if all(r['exito'] for r in resultados) else SALIDA_ERROR
+
+
+def _cargar_varios(processor, args, bd):
+    """Carga una carpeta o glob con el cargador múltiple y devuelve el código de salida"""
+    from carga_multiple import CargadorMultiple
+
+    if args.tabla:
+        print("⚠️ --tabla se ignora al cargar varios archivos (cada uno va a la tabla con su nombre)", file=sys.stderr)
+
+    reporte = ReporteConsola(args.silencioso)
+    resultados = CargadorMultiple(processor, args.workers).cargar(args.archivo, bd, reporte.progreso)
+    for r in resultados:
+        print(f"{r['tabla']}\t{r['filas'] if r['exito'] else 'ERROR'}\t{r['segundos_total']:.2f}")
+        if not r['exito']:
+            print(f"❌ {r['archivo']}: {r['mensaje']}", file=sys.stderr)
+    return SALIDA_OK if all(r['exito'] for r in resultados) else SALIDA_ERROR
+
+
+def main(argv=None):
+    """Punto de entrada de la carga sin interfaz; devuelve el código de salida"""
+    args = crear_parser().parse_args(argv)
+
+    bd = args.bd
+    if not bd.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+        bd += '.db'
+
+    processor = DataProcessor()
+    processor.perfil_carga = args.perfil
+    processor.modo_carga = args.modo
+    processor.columnas_clave = [c.strip() for clave in args.clave for c in clave.split(',') if c.strip()] or None
+    processor.tamano_chunk = args.chunk
+    processor.presupuesto_memoria_mb = args.memoria
+    processor.muestreo_tipos = args.muestreo
+    processor.intervalo_commit = args.commit
+    processor.forzar_recarga = args.forzar
+    processor.tipos_forzados = dict(args.tipo) or None
+    processor.reutilizar_esquemas = not args.reinferir
+    processor.guardar_esquemas = args.guardar_esquema
+    if args.eventos:
+        # Una sola escritura por evento: los emiten varios hilos del pipeline a la vez
+        processor.callback_metricas = lambda evento: sys.stderr.write(json.dumps(evento) + "\n")
+
+    try:
+        if os.path.isfile(args.archivo) and args.hojas:
+            return _cargar_hojas(processor, args, bd)
+        if os.path.isfile(args.archivo):
+            processor.workers_conversion = args.workers
+            return _cargar_archivo(processor, args, bd)
+        return _cargar_varios(processor, args, bd)
+    except KeyboardInterrupt:
+        processor.cancelar()
+        print("⚠️ Carga cancelada", file=sys.stderr)
+        return SALIDA_CANCELADA
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return SALIDA_ERROR
@@ -1,6 +1,5 @@
 import customtkinter as ctk
 from tkinter import messagebox
-import pandas as pd
 
 class VentanaCorreccionTipos:
     def __init__(self, parent, df, esquema_inicial, callback_resultado):
@@ -77,11 +76,12 @@ class VentanaCorreccionTipos:
         from processor import DataProcessor
         temp_processor = DataProcessor()
         problemas = temp_processor.detectar_problemas_tipos(self.df, self.esquema_inicial)
-        problemas_dict = {p['columna']: p for p in problemas}
+        # Si una columna tiene varios problemas se muestra el de mayor confianza
+        self.problemas_dict = {p['columna']: p for p in sorted(problemas, key=lambda p: p['confianza'])}
         
         # Crear fila para cada columna
         for col_limpio, info in self.esquema_inicial.items():
-            self.crear_fila_columna(col_limpio, info, problemas_dict)
+            self.crear_fila_columna(col_limpio, info, self.problemas_dict)
         
         # Botones
         buttons_frame = ctk.CTkFrame(self.ventana)
@@ -181,7 +181,7 @@ class VentanaCorreccionTipos:
             problema = problemas_dict[col_original]
             problema_label = ctk.CTkLabel(
                 row_frame,
-                text=f"⚠️ {problema['problema'][:30]}...",
+                text=f"⚠️ [{problema['confianza']:.0%}] {problema['problema'][:30]}...",
                 width=200,
                 font=ctk.CTkFont(size=9),
                 text_color="#DC3545",
@@ -217,6 +217,11 @@ class VentanaCorreccionTipos:
             info_corregida['tipo'] = nuevo_tipo
             info_corregida['es_fecha'] = nuevo_tipo in ['DATE', 'DATETIME']
             
+            # Fecha no detectada: usar el formato con el que se midió la sugerencia
+            problema = self.problemas_dict.get(info['columna_original'])
+            if info_corregida['es_fecha'] and not info.get('formato_fecha') and problema and problema.get('formato_fecha'):
+                info_corregida['formato_fecha'] = problema['formato_fecha']
+            
             tipos_corregidos[col_limpio] = info_corregida
             
             # Contar cambios
@@ -247,12 +252,8 @@ class VentanaCorreccionTipos:
     
     def usar_deteccion_automatica(self):
         """Usa la detección automática para todos los problemas encontrados"""
-        from processor import DataProcessor
-        temp_processor = DataProcessor()
-        problemas = temp_processor.detectar_problemas_tipos(self.df, self.esquema_inicial)
-        
         cambios_automaticos = 0
-        for problema in problemas:
+        for problema in self.problemas_dict.values():
             # Buscar la columna correspondiente
             for col_limpio, info in self.esquema_inicial.items():
                 if info['columna_original'] == problema['columna']:
@@ -0,0 +1,191 @@
+# explorador_bd.py
+"""
+🗄️ EXPLORADOR DE TABLAS SQLITE
+Conteos de filas y estadísticas de columnas a partir de metadatos baratos (rango de
+rowid, índices, sqlite_stat1, manifiesto de cargas y una muestra repartida por rowid):
+ninguna consulta recorre la tabla completa, aunque tenga decenas de millones de filas
+"""
+import json
+import sqlite3
+
+from manifiesto import TABLA_MANIFIESTO
+from metricas import TABLA_EJECUCIONES
+from fuentes_vista import TEXTO_NULO
+
+# Muestra para nulos y ejemplos: TRAMOS_MUESTRA tramos de FILAS_POR_TRAMO filas repartidos por rowid
+TRAMOS_MUESTRA = 10
+FILAS_POR_TRAMO = 100
+
+
+def conectar_lectura(bd):
+    """Conexión que no puede escribir en la base"""
+    conn = sqlite3.connect(bd, timeout=30)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def citar(nombre):
+    """Identificador SQL entre comillas dobles"""
+    return '"' + str(nombre).replace('"', '""') + '"'
+
+
+def _existe_tabla(conn, tabla):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)).fetchone() is not None
+
+
+def _cargas_manifiesto(conn):
+    """{tabla: (archivo, fecha_carga, esquema)} de la última carga registrada de cada tabla"""
+    if not _existe_tabla(conn, TABLA_MANIFIESTO):
+        return {}
+    cargas = {}
+    for tabla, ruta, fecha, esquema in conn.execute(
+        f"SELECT tabla, ruta, fecha_carga, esquema FROM {TABLA_MANIFIESTO} ORDER BY fecha_carga"
+    ):
+        cargas[tabla] = (ruta, fecha, esquema)
+    return cargas
+
+
+def _rango_rowid(conn, tabla):
+    """(mínimo, máximo) rowid: dos búsquedas en el árbol de la tabla, sin recorrerla"""
+    nombre = citar(tabla)
+    minimo = conn.execute(f"SELECT min(rowid) FROM {nombre}").fetchone()[0]
+    maximo = conn.execute(f"SELECT max(rowid) FROM {nombre}").fetchone()[0]
+    return minimo, maximo
+
+
+def resumen_tablas(bd):
+    """Una entrada por tabla con filas estimadas, columnas y última carga
+
+    ``filas`` es el rango de rowid (máximo - mínimo + 1): exacto en las tablas que
+    carga el ETL (rowids consecutivos) y una cota superior si se borraron filas.
+    Las tablas WITHOUT ROWID quedan con ``filas`` None.
+    """
+    conn = conectar_lectura(bd)
+    try:
+        tablas = [fila[0] for fila in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT GLOB 'sqlite_*' "
+            "AND name NOT IN (?, ?) ORDER BY name", (TABLA_MANIFIESTO, TABLA_EJECUCIONES)
+        )]
+        cargas = _cargas_manifiesto(conn)
+        resumen = []
+        for tabla in tablas:
+            try:
+                minimo, maximo = _rango_rowid(conn, tabla)
+                filas = 0 if minimo is None else maximo - minimo + 1
+            except sqlite3.OperationalError:
+                filas = None  # WITHOUT ROWID
+            ruta, fecha, _ = cargas.get(tabla, (None, None, None))
+            resumen.append({
+                'tabla': tabla,
+                'filas': filas,
+                'columnas': len(conn.execute(f"PRAGMA table_info({citar(tabla)})").fetchall()),
+                'archivo': ruta,
+                'fecha_carga': fecha,
+            })
+        return resumen
+    finally:
+        conn.close()
+
+
+def _columnas_indexadas(conn, tabla):
+    """{columna: (índice, distintos estimados o None)} para la primera columna de cada índice
+
+    Los distintos salen de sqlite_stat1 (solo si la base tiene ANALYZE): su segundo
+    número es el promedio de filas por valor de la primera columna del índice.
+    """
+    estadisticas = {}
+    if _existe_tabla(conn, 'sqlite_stat1'):
+        estadisticas = dict(conn.execute("SELECT idx, stat FROM sqlite_stat1 WHERE tbl = ?", (tabla,)).fetchall())
+
+    indexadas = {}
+    for fila in conn.execute(f"PRAGMA index_list({citar(tabla)})").fetchall():
+        indice = fila[1]
+        columnas = conn.execute(f"PRAGMA index_info({citar(indice)})").fetchall()
+        if not columnas or columnas[0][2] is None or columnas[0][2] in indexadas:
+            continue
+        distintos = None
+        numeros = (estadisticas.get(indice) or '').split()
+        if len(numeros) >= 2 and numeros[0].isdigit() and numeros[1].isdigit() and int(numeros[1]):
+            distintos = int(numeros[0]) // int(numeros[1])
+        indexadas[columnas[0][2]] = (indice, distintos)
+    return indexadas
+
+
+def _muestra_repartida(conn, tabla, minimo, maximo):
+    """Filas de TRAMOS_MUESTRA tramos equiespaciados por rowid (cada uno, un salto en el árbol)"""
+    if minimo is None:
+        return []
+    nombre = citar(tabla)
+    filas = []
+    for i in range(TRAMOS_MUESTRA):
+        desde = minimo + (maximo - minimo) * i // TRAMOS_MUESTRA
+        filas.extend(conn.execute(
+            f"SELECT * FROM {nombre} WHERE rowid >= ? ORDER BY rowid LIMIT {FILAS_POR_TRAMO}", (desde,)
+        ).fetchall())
+    return filas
+
+
+def estadisticas_columnas(bd, tabla):
+    """Estadísticas por columna sin recorrer la tabla
+
+    - tipo, clave primaria y NOT NULL: PRAGMA table_info
+    - columna de origen y formato de fecha: esquema de la última carga en el manifiesto
+    - mínimo y máximo: solo en columnas indexadas (o la clave INTEGER que es el rowid),
+      donde SQLite los resuelve con una búsqueda en el índice
+    - distintos: estimados con sqlite_stat1 en columnas indexadas
+    - proporción de nulos y ejemplo: de la muestra repartida por rowid
+    """
+    conn = conectar_lectura(bd)
+    try:
+        info_columnas = conn.execute(f"PRAGMA table_info({citar(tabla)})").fetchall()
+        if not info_columnas:
+            raise ValueError(f"La tabla '{tabla}' no existe en {bd}")
+        _, _, esquema_json = _cargas_manifiesto(conn).get(tabla, (None, None, None))
+        esquema = json.loads(esquema_json) if esquema_json else {}
+        indexadas = _columnas_indexadas(conn, tabla)
+
+        try:
+            minimo_rowid, maximo_rowid = _rango_rowid(conn, tabla)
+            muestra = _muestra_repartida(conn, tabla, minimo_rowid, maximo_rowid)
+        except sqlite3.OperationalError:
+            muestra = []  # WITHOUT ROWID: sin muestra por rowid
+
+        # La clave INTEGER PRIMARY KEY es el propio rowid
+        claves = [fila for fila in info_columnas if fila[5]]
+        alias_rowid = claves[0][1] if len(claves) == 1 and claves[0][2].upper() == 'INTEGER' else None
+
+        estadisticas = []
+        for posicion, nombre, tipo, no_nulo, _, clave in info_columnas:
+            valores = [fila[posicion] for fila in muestra]
+            no_nulos = [v for v in valores if v is not None]
+            indice, distintos = indexadas.get(nombre, (None, None))
+            if nombre == alias_rowid:
+                indice = 'rowid'
+            minimo = maximo = None
+            if indice:
+                minimo = conn.execute(f"SELECT min({citar(nombre)}) FROM {citar(tabla)}").fetchone()[0]
+                maximo = conn.execute(f"SELECT max({citar(nombre)}) FROM {citar(tabla)}").fetchone()[0]
+            origen = esquema.get(nombre, {})
+            estadisticas.append({
+                'columna': nombre,
+                'tipo': tipo or '(sin tipo)',
+                'clave': bool(clave),
+                'no_nulo': bool(no_nulo),
+                'columna_original': origen.get('columna_original'),
+                'formato_fecha': origen.get('formato_fecha'),
+                'indice': indice,
+                'distintos': distintos,
+                'minimo': minimo,
+                'maximo': maximo,
+                'nulos_muestra': 1 - len(no_nulos) / len(valores) if valores else None,
+                'ejemplo': no_nulos[0] if no_nulos else None,
+                'filas_muestra': len(valores),
+            })
+        return estadisticas
+    finally:
+        conn.close()
+
+
+def texto_valor(valor):
+    """Valor para mostrar en la interfaz (nulos como en la vista previa)"""
+    return TEXTO_NULO if valor is None else str(valor)
@@ -0,0 +1,290 @@
+# fuentes_vista.py
+"""
+📜 FUENTES PAGINADAS PARA LA VISTA DE DATOS
+Entregan cualquier rango de filas (ya como texto) sin materializar el resto: la vista
+virtual solo pide las filas visibles. El total se va conociendo en segundo plano.
+
+- FuenteDataFrame: un DataFrame ya en memoria
+- FuenteCSV: índice de posiciones de bytes cada FILAS_POR_MARCA filas; cada página se
+  lee saltando a la marca más cercana
+- FuenteLotes: lotes de un iterador (Excel) guardados a medida que se leen
+- FuenteSQLite: tabla paginada desde marcas de rowid; el OFFSET nunca pasa de un tramo
+  de FILAS_POR_MARCA filas desde la marca
+"""
+import bisect
+import io
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Texto con el que se muestran los nulos
+TEXTO_NULO = "(vacío)"
+
+# Filas entre dos marcas del índice (posición de bytes en CSV, rowid en SQLite)
+FILAS_POR_MARCA = 1000
+
+# Bytes leídos por vez al indexar los saltos de línea de un CSV
+BYTES_POR_BLOQUE = 8 * 1024 * 1024
+
+# Máximo de filas que FuenteLotes guarda en memoria (Excel no permite saltar a una fila)
+FILAS_MAXIMAS_EN_MEMORIA = 1000000
+
+# Lectura de páginas CSV: los valores tal como están en el archivo
+OPCIONES_CSV_TEXTO = {'dtype': str, 'keep_default_na': False}
+
+
+def formatear_filas(df):
+    """Filas de un DataFrame como tuplas de texto, con TEXTO_NULO en los nulos (sin bucle por celda)"""
+    valores = df.to_numpy(dtype=object)
+    if valores.size == 0:
+        return [()] * len(df)
+    texto = valores.astype(str).astype(object)
+    texto[pd.isna(valores)] = TEXTO_NULO
+    return list(map(tuple, texto.tolist()))
+
+
+def formatear_tuplas(filas):
+    """Filas de una consulta SQLite como tuplas de texto"""
+    return [tuple(TEXTO_NULO if v is None else str(v) for v in fila) for fila in filas]
+
+
+class FuenteFilas:
+    """Base de las fuentes: columnas, total conocido y filas por rango
+
+    Un hilo de fondo (si la fuente lo necesita) va contando filas: ``total`` crece
+    hasta que ``completo`` es True. Un fallo del hilo queda en ``error``.
+    """
+
+    def __init__(self, columnas):
+        self.columnas = list(columnas)
+        self.total = 0
+        self.completo = False
+        self.error = None
+        self._detener = threading.Event()
+        self._hilo = None
+
+    def filas(self, inicio, cantidad):
+        """Tuplas de texto de las filas [inicio, inicio + cantidad) ya conocidas"""
+        raise NotImplementedError
+
+    def _iniciar(self, objetivo, nombre):
+        """Lanza el hilo de fondo que cuenta (o indexa) las filas"""
+        def correr():
+            try:
+                objetivo()
+            except Exception as e:
+                self.error = str(e)
+            finally:
+                self.completo = True
+
+        self._hilo = threading.Thread(target=correr, name=nombre, daemon=True)
+        self._hilo.start()
+
+    def cerrar(self):
+        """Detiene el hilo de fondo (la vista pasó a otra fuente)"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+
+
+class FuenteDataFrame(FuenteFilas):
+    """Filas de un DataFrame en memoria"""
+
+    def __init__(self, df):
+        super().__init__(df.columns)
+        self.df = df
+        self.total = len(df)
+        self.completo = True
+
+    def filas(self, inicio, cantidad):
+        return formatear_filas(self.df.iloc[inicio:inicio + cantidad])
+
+
+class FuenteCSV(FuenteFilas):
+    """Filas de un CSV con acceso directo por posición de bytes
+
+    El índice guarda dónde empieza una de cada FILAS_POR_MARCA filas; pedir la fila N
+    lee como mucho FILAS_POR_MARCA líneas antes de llegar a ella. Las líneas se
+    cuentan por saltos de línea: un campo entre comillas con saltos de línea corre
+    las filas siguientes (igual que muestra_repartida_csv, es una vista aproximada).
+    """
+
+    def __init__(self, archivo, transformar=None):
+        with open(archivo, 'rb') as f:
+            self._encabezado = f.readline()
+            inicio_datos = f.tell()
+        super().__init__(pd.read_csv(io.BytesIO(self._encabezado), **OPCIONES_CSV_TEXTO).columns)
+        self.archivo = archivo
+        self.transformar = transformar
+        self._marcas = [inicio_datos]
+        self._iniciar(lambda: self._indexar(inicio_datos), "vista-indice-csv")
+
+    def _indexar(self, inicio_datos):
+        """Recorre el archivo por bloques anotando el inicio de cada FILAS_POR_MARCA filas"""
+        lineas = 0
+        posicion = inicio_datos
+        ultimo = b'\n'
+        with open(self.archivo, 'rb') as f:
+            f.seek(inicio_datos)
+            while not self._detener.is_set():
+                bloque = f.read(BYTES_POR_BLOQUE)
+                if not bloque:
+                    break
+                # Cada salto de línea cierra una fila; la siguiente empieza justo después
+                inicios = np.flatnonzero(np.frombuffer(bloque, dtype=np.uint8) == 10) + posicion + 1
+                numeros = np.arange(lineas + 1, lineas + 1 + len(inicios))
+                self._marcas.extend(inicios[numeros % FILAS_POR_MARCA == 0].tolist())
+                lineas += len(inicios)
+                posicion += len(bloque)
+                ultimo = bloque[-1:]
+                self.total = lineas
+        # Última fila sin salto de línea final
+        if ultimo != b'\n' and not self._detener.is_set():
+            self.total = lineas + 1
+
+    def filas(self, inicio, cantidad):
+        cantidad = min(cantidad, self.total - inicio)
+        if cantidad <= 0:
+            return []
+        marca = inicio // FILAS_POR_MARCA
+        with open(self.archivo, 'rb') as f:
+            f.seek(self._marcas[marca])
+            for _ in range(inicio - marca * FILAS_POR_MARCA):
+                f.readline()
+            lineas = [f.readline() for _ in range(cantidad)]
+        datos = b''.join(linea if linea.endswith(b'\n') else linea + b'\n' for linea in lineas if linea)
+        pagina = pd.read_csv(io.BytesIO(self._encabezado + datos), skip_blank_lines=False, **OPCIONES_CSV_TEXTO)
+        if self.transformar:
+            pagina = self.transformar(pagina)
+        return formatear_filas(pagina)
+
+
+class FuenteLotes(FuenteFilas):
+    """Filas de un iterador de (lote, fracción) que solo se puede recorrer en orden
+
+    Los lotes se guardan a medida que llegan, hasta FILAS_MAXIMAS_EN_MEMORIA filas
+    (``truncada`` indica que el origen tenía más).
+    """
+
+    def __init__(self, lotes, columnas, transformar=None):
+        super().__init__(columnas)
+        self.transformar = transformar
+        self.truncada = False
+        self._lotes = []
+        self._inicios = []
+        self._iniciar(lambda: self._leer(lotes), "vista-lotes")
+
+    def _leer(self, lotes):
+        """Guarda cada lote leído hasta agotar el iterador o el máximo de filas"""
+        try:
+            for lote, _ in lotes:
+                if self._detener.is_set():
+                    return
+                if self.total + len(lote) > FILAS_MAXIMAS_EN_MEMORIA:
+                    lote = lote.iloc[:FILAS_MAXIMAS_EN_MEMORIA - self.total]
+                    self.truncada = True
+                # El índice se publica después del lote: filas() nunca ve un lote a medias
+                self._lotes.append(lote.reset_index(drop=True))
+                self._inicios.append(self.total)
+                self.total += len(lote)
+                if self.truncada:
+                    return
+        finally:
+            lotes.close()
+
+    def filas(self, inicio, cantidad):
+        fin = min(inicio + cantidad, self.total)
+        partes = []
+        posicion = inicio
+        while posicion < fin:
+            i = bisect.bisect_right(self._inicios, posicion) - 1
+            lote = self._lotes[i]
+            desde = posicion - self._inicios[i]
+            parte = lote.iloc[desde:desde + fin - posicion]
+            partes.append(parte)
+            posicion += len(parte)
+        if not partes:
+            return []
+        pagina = pd.concat(partes) if len(partes) > 1 else partes[0]
+        if self.transformar:
+            pagina = self.transformar(pagina)
+        return formatear_filas(pagina)
+
+
+class FuenteSQLite(FuenteFilas):
+    """Filas de una tabla SQLite paginadas por rowid
+
+    Cada FILAS_POR_MARCA filas se anota su rowid con ``LIMIT 1 OFFSET FILAS_POR_MARCA``
+    desde la marca anterior: el OFFSET recorre solo ese tramo, nunca la tabla desde el
+    principio. Una página se lee con ``WHERE rowid >= marca ORDER BY rowid LIMIT n`` y
+    se descartan las filas previas al inicio dentro del tramo (menos de FILAS_POR_MARCA).
+    Así el costo de la fila diez millones es el mismo que el de la primera.
+    """
+
+    def __init__(self, bd, tabla):
+        self.bd = bd
+        self.tabla = tabla
+        self._conn = self._conectar()
+        self._bloqueo = threading.Lock()
+        self._nombre = '"' + tabla.replace('"', '""') + '"'
+        columnas = [fila[1] for fila in self._conn.execute(f"PRAGMA table_info({self._nombre})")]
+        if not columnas:
+            raise ValueError(f"La tabla '{tabla}' no existe en {bd}")
+        sin_rowid = self._conn.execute(
+            "SELECT sql LIKE '%WITHOUT ROWID%' FROM sqlite_master WHERE type = 'table' AND name = ?", (tabla,)
+        ).fetchone()
+        if sin_rowid and sin_rowid[0]:
+            raise ValueError(f"La tabla '{tabla}' es WITHOUT ROWID: no se puede paginar por rowid")
+        super().__init__(columnas)
+        self._marcas = []
+        self._iniciar(self._indexar, "vista-indice-sqlite")
+
+    def _conectar(self):
+        """Conexión de solo lectura (la vista nunca escribe en la base)"""
+        conn = sqlite3.connect(self.bd, timeout=30, check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _indexar(self):
+        """Anota el rowid de una de cada FILAS_POR_MARCA filas (conexión propia del hilo)"""
+        conn = self._conectar()
+        try:
+            primera = conn.execute(f"SELECT min(rowid) FROM {self._nombre}").fetchone()[0]
+            if primera is None:
+                return
+            self._marcas.append(primera)
+            while not self._detener.is_set():
+                siguiente = conn.execute(
+                    f"SELECT rowid FROM {self._nombre} WHERE rowid >= ? ORDER BY rowid LIMIT 1 OFFSET {FILAS_POR_MARCA}",
+                    (self._marcas[-1],)
+                ).fetchone()
+                if siguiente is None:
+                    # Último tramo: menos de FILAS_POR_MARCA filas desde la última marca
+                    self.total += conn.execute(
+                        f"SELECT count(*) FROM {self._nombre} WHERE rowid >= ?", (self._marcas[-1],)
+                    ).fetchone()[0]
+                    return
+                self._marcas.append(siguiente[0])
+                self.total += FILAS_POR_MARCA
+        finally:
+            conn.close()
+
+    def filas(self, inicio, cantidad):
+        cantidad = min(cantidad, self.total - inicio)
+        if cantidad <= 0:
+            return []
+        marca = inicio // FILAS_POR_MARCA
+        salto = inicio - marca * FILAS_POR_MARCA
+        with self._bloqueo:
+            filas = self._conn.execute(
+                f"SELECT * FROM {self._nombre} WHERE rowid >= ? ORDER BY rowid LIMIT ?",
+                (self._marcas[marca], salto + cantidad)
+            ).fetchall()
+        return formatear_tuplas(filas[salto:])
+
+    def cerrar(self):
+        super().cerrar()
+        with self._bloqueo:
+            self._conn.close()
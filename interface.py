@@ -6,8 +6,21 @@ Ventana principal con control dinámico de expansión y corrección gráfica de
 import customtkinter as ctk
 from tkinter import filedialog, messagebox, ttk
 import threading
-import pandas as pd
-from processor import DataProcessor
+from tabla_virtual import TablaVirtual
+
+# Opciones de carga de hojas en libros Excel
+HOJAS_PRIMERA = "primera hoja"
+HOJAS_SEPARADAS = "todas: una tabla por hoja"
+HOJAS_UNIDAS = "todas: tabla unida"
+
+# Lote: por defecto se lee el archivo completo (detección y corrección de tipos sobre
+# todas las filas); el automático elige las filas por lote con este presupuesto de memoria
+LOTE_COMPLETO = "completo"
+PRESUPUESTO_MEMORIA_MB = 512
+LOTE_AUTOMATICO = f"auto ({PRESUPUESTO_MEMORIA_MB} MB)"
+
+# pandas/processor no se importan aquí: los precarga arranque.py en segundo plano
+# y la interfaz los usa a través de la propiedad ``processor``
 
 class ETLInterface(ctk.CTk):
     """Interfaz principal de la aplicación ETL con control dinámico"""
@@ -21,7 +34,7 @@ class ETLInterface(ctk.CTk):
         self.minsize(1000, 700)
         
         # Variables de estado
-        self.processor = DataProcessor()
+        self._processor = None
         self.archivo_actual = None
         self.cargando = False
         self.preview_expandida = False  # Control de expansión
@@ -29,6 +42,14 @@ class ETLInterface(ctk.CTk):
         # Crear interfaz con scroll
         self.crear_interfaz_con_scroll()
     
+    @property
+    def processor(self):
+        """DataProcessor creado al primer uso (si la precarga sigue en curso, espera a que termine)"""
+        if self._processor is None:
+            from processor import DataProcessor
+            self._processor = DataProcessor()
+        return self._processor
+    
     def crear_interfaz_con_scroll(self):
         """Crea la interfaz con barras de desplazamiento"""
         
@@ -153,6 +174,16 @@ class ETLInterface(ctk.CTk):
             anchor="w"
         )
         self.lbl_archivo.grid(row=0, column=1, sticky="w", padx=5, pady=10)
+        
+        self.btn_carpeta = ctk.CTkButton(
+            controles_frame,
+            text="📦 Cargar carpeta",
+            command=self.cargar_carpeta,
+            fg_color="#6C757D",
+            hover_color="#5A6268",
+            width=150
+        )
+        self.btn_carpeta.grid(row=0, column=2, padx=10, pady=10)
     
     def crear_seccion_preview(self):
         """Crea la sección de vista previa CON CONTROL DINÁMICO"""
@@ -205,6 +236,19 @@ class ETLInterface(ctk.CTk):
         )
         self.btn_ajustar.grid(row=0, column=1)
         
+        # Botón ver la tabla ya cargada en la base destino
+        self.btn_ver_tabla = ctk.CTkButton(
+            controles_frame,
+            text="🗃️ Tabla cargada",
+            command=self.ver_tabla_cargada,
+            width=110,
+            height=28,
+            font=("Segoe UI", 10),
+            fg_color="#28A745",
+            hover_color="#218838"
+        )
+        self.btn_ver_tabla.grid(row=0, column=2, padx=(5, 0))
+        
         # Info de datos
         info_frame = ctk.CTkFrame(self.frame_preview, fg_color="transparent")
         info_frame.grid(row=1, column=0, sticky="ew", padx=15, pady=(0, 5))
@@ -261,17 +305,17 @@ class ETLInterface(ctk.CTk):
         )
         self.tabla.grid(row=0, column=0, sticky="nsew")
         
-        # Scrollbars
-        scroll_v = ttk.Scrollbar(self.tabla_container, orient="vertical", command=self.tabla.yview)
+        # Scrollbars: la vertical recorre todas las filas de la fuente, no solo los items creados
+        scroll_v = ttk.Scrollbar(self.tabla_container, orient="vertical")
         scroll_v.grid(row=0, column=1, sticky="ns")
         
         scroll_h = ttk.Scrollbar(self.tabla_container, orient="horizontal", command=self.tabla.xview)
         scroll_h.grid(row=1, column=0, sticky="ew")
         
-        self.tabla.configure(
-            yscrollcommand=scroll_v.set,
-            xscrollcommand=scroll_h.set
-        )
+        self.tabla.configure(xscrollcommand=scroll_h.set)
+        
+        # Vista virtual: solo existen los items de las filas visibles
+        self.vista_tabla = TablaVirtual(self.tabla, scroll_v, self.actualizar_info_vista)
     
     def toggle_preview_size(self):
         """🔄 FUNCIÓN CLAVE: Controla expansión dinámica"""
@@ -464,9 +508,52 @@ class ETLInterface(ctk.CTk):
         ctk.CTkLabel(opciones_frame, text="Lote:", font=("Segoe UI", 11)).grid(
             row=2, column=0, sticky="w", padx=10, pady=10
         )
-        self.combo_chunk = ctk.CTkComboBox(opciones_frame, values=["1000", "2500", "5000", "10000"], width=120)
-        self.combo_chunk.set("1000")
+        self.combo_chunk = ctk.CTkComboBox(
+            opciones_frame, values=[LOTE_COMPLETO, LOTE_AUTOMATICO, "1000", "2500", "5000", "10000"], width=140
+        )
+        self.combo_chunk.set(LOTE_COMPLETO)
         self.combo_chunk.grid(row=2, column=1, sticky="w", padx=10, pady=10)
+        
+        # Perfil SQLite
+        ctk.CTkLabel(opciones_frame, text="Perfil:", font=("Segoe UI", 11)).grid(
+            row=2, column=2, sticky="w", padx=10, pady=10
+        )
+        self.combo_perfil = ctk.CTkComboBox(opciones_frame, values=["seguro", "carga_masiva"], width=160)
+        self.combo_perfil.set("seguro")
+        self.combo_perfil.grid(row=2, column=3, sticky="w", padx=10, pady=10)
+        
+        # Modo de carga y columnas clave (upsert incremental)
+        ctk.CTkLabel(opciones_frame, text="Modo:", font=("Segoe UI", 11)).grid(
+            row=3, column=0, sticky="w", padx=10, pady=10
+        )
+        self.combo_modo = ctk.CTkComboBox(opciones_frame, values=["reemplazar", "incremental"], width=120)
+        self.combo_modo.set("reemplazar")
+        self.combo_modo.grid(row=3, column=1, sticky="w", padx=10, pady=10)
+        
+        ctk.CTkLabel(opciones_frame, text="Clave:", font=("Segoe UI", 11)).grid(
+            row=3, column=2, sticky="w", padx=10, pady=10
+        )
+        self.entry_clave = ctk.CTkEntry(opciones_frame, placeholder_text="Auto (ej: id, codigo)", width=200)
+        self.entry_clave.grid(row=3, column=3, sticky="ew", padx=10, pady=10)
+        
+        # Encabezados conocidos: cargar con el esquema guardado tras la última corrección
+        self.check_esquema_guardado = ctk.CTkCheckBox(opciones_frame, text="Usar esquema guardado", font=("Segoe UI", 11))
+        self.check_esquema_guardado.select()
+        self.check_esquema_guardado.grid(row=4, column=0, sticky="w", padx=10, pady=10)
+        
+        # Recargar aunque el manifiesto indique que el archivo no cambió
+        self.check_forzar = ctk.CTkCheckBox(opciones_frame, text="Forzar recarga", font=("Segoe UI", 11))
+        self.check_forzar.grid(row=4, column=1, sticky="w", padx=10, pady=10)
+        
+        # Hojas de libros Excel
+        ctk.CTkLabel(opciones_frame, text="Hojas:", font=("Segoe UI", 11)).grid(
+            row=4, column=2, sticky="w", padx=10, pady=10
+        )
+        self.combo_hojas = ctk.CTkComboBox(
+            opciones_frame, values=[HOJAS_PRIMERA, HOJAS_SEPARADAS, HOJAS_UNIDAS], width=200
+        )
+        self.combo_hojas.set(HOJAS_PRIMERA)
+        self.combo_hojas.grid(row=4, column=3, sticky="w", padx=10, pady=10)
     
     def crear_seccion_carga(self):
         """Crea la sección de carga"""
@@ -612,13 +699,14 @@ class ETLInterface(ctk.CTk):
                 nombre_archivo = archivo.split('/')[-1].split('\\')[-1]
                 self.lbl_archivo.configure(text=f"Archivo: {nombre_archivo}")
                 
-                # Cargar vista previa Y esquema
+                # Cargar vista previa (todas las filas, paginadas) Y esquema (primeras filas)
                 df = self.processor.cargar_preview(archivo)
-                self.actualizar_tabla(df)
+                self.mostrar_fuente(self.processor.fuente_vista_previa(archivo))
                 self.actualizar_esquema(df)
                 
                 # Auto-completar nombre tabla
-                nombre_tabla = nombre_archivo.split('.')[0].replace('-', '_').replace(' ', '_')
+                from processor import nombre_tabla_desde_archivo
+                nombre_tabla = nombre_tabla_desde_archivo(archivo)
                 self.entry_tabla.delete(0, "end")
                 self.entry_tabla.insert(0, nombre_tabla)
                 
@@ -629,45 +717,62 @@ class ETLInterface(ctk.CTk):
                 messagebox.showerror("Error", f"Error al cargar archivo:\n{str(e)}")
     
     def actualizar_tabla(self, df):
-        """Actualiza la tabla con formato uniforme"""
-        # Limpiar
-        for item in self.tabla.get_children():
-            self.tabla.delete(item)
+        """Muestra un DataFrame en la vista previa"""
+        if df is None or df.empty:
+            self.vista_tabla.limpiar()
+            return
+        from fuentes_vista import FuenteDataFrame
+        self.mostrar_fuente(FuenteDataFrame(df))
+    
+    def mostrar_fuente(self, fuente):
+        """Muestra una fuente paginada (archivo o tabla SQLite) en la vista previa virtual"""
+        columnas = fuente.columnas
+        self.tabla["columns"] = columnas
+        self.tabla["show"] = "headings"
+        
+        # Configurar columnas inteligentemente
+        num_cols = len(columnas)
+        if num_cols <= 5:
+            col_width = 150
+        elif num_cols <= 10:
+            col_width = 120
+        else:
+            col_width = 100
         
-        if df is not None and not df.empty:
-            columnas = list(df.columns)
-            self.tabla["columns"] = columnas
-            self.tabla["show"] = "headings"
-            
-            # Configurar columnas inteligentemente
-            num_cols = len(columnas)
-            if num_cols <= 5:
-                col_width = 150
-            elif num_cols <= 10:
-                col_width = 120
-            else:
-                col_width = 100
-            
-            for col in columnas:
-                self.tabla.heading(col, text=str(col))
-                self.tabla.column(col, width=col_width, minwidth=80, stretch=True, anchor='w')
-            
-            # Insertar datos con formato especial para nulos
-            for i, (_, fila) in enumerate(df.iterrows()):
-                valores_formateados = []
-                for val in fila:
-                    if val is None or pd.isna(val):
-                        valores_formateados.append("(vacío)")
-                    else:
-                        valores_formateados.append(str(val))
-                
-                tag = 'evenrow' if i % 2 == 0 else 'oddrow'
-                self.tabla.insert("", "end", values=valores_formateados, tags=(tag,))
-            
-            # Actualizar info
-            self.lbl_preview_info.configure(
-                text=f"📊 {len(df)} filas × {len(columnas)} columnas - Use 'Expandir' y 'Ajustar' para mejor vista"
-            )
+        for col in columnas:
+            self.tabla.heading(col, text=str(col))
+            self.tabla.column(col, width=col_width, minwidth=80, stretch=True, anchor='w')
+        
+        self.vista_tabla.mostrar(fuente)
+    
+    def actualizar_info_vista(self, fuente):
+        """Texto de la vista previa con el total de filas (que crece mientras se cuentan)"""
+        texto = f"📊 {fuente.total:,} filas × {len(fuente.columnas)} columnas"
+        if fuente.error:
+            texto += f" - ⚠️ {fuente.error}"
+        elif not fuente.completo:
+            texto += " - ⏳ contando filas..."
+        elif getattr(fuente, 'truncada', False):
+            texto += " - solo las primeras (límite de la vista)"
+        else:
+            texto += " - Use 'Expandir' y 'Ajustar' para mejor vista"
+        self.lbl_preview_info.configure(text=texto)
+    
+    def ver_tabla_cargada(self):
+        """Muestra en la vista previa la tabla destino de la base indicada, paginada por rowid"""
+        import os
+        bd = self.entry_bd.get().strip() or "datos"
+        if not bd.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+            bd += '.db'
+        tabla = self.entry_tabla.get().strip()
+        if not tabla or not os.path.exists(bd):
+            messagebox.showwarning("Aviso", "Indique una base de datos existente y el nombre de la tabla")
+            return
+        try:
+            from fuentes_vista import FuenteSQLite
+            self.mostrar_fuente(FuenteSQLite(bd, tabla))
+        except Exception as e:
+            messagebox.showerror("Error", f"No se pudo abrir la tabla:\n{str(e)}")
     
     def actualizar_esquema(self, df):
         """Actualiza la tabla de esquema"""
@@ -681,6 +786,10 @@ class ETLInterface(ctk.CTk):
                 for col_limpio, info in esquema.items():
                     if info['es_fecha']:
                         formato = 'Fecha ISO (YYYY-MM-DD)'
+                        if info.get('fecha_ambigua'):
+                            formato += ' ⚠️ ambigua'
+                        elif info.get('formato_fecha'):
+                            formato += f" ← {info['formato_fecha']}"
                         tag = 'fecha'
                     elif info['tipo'] in ['INTEGER', 'REAL']:
                         formato = 'Número'
@@ -711,6 +820,18 @@ class ETLInterface(ctk.CTk):
             messagebox.showwarning("Advertencia", "Debe ingresar un nombre de tabla")
             return
         
+        modo_hojas = self.combo_hojas.get()
+        if modo_hojas != HOJAS_PRIMERA and self.archivo_actual.lower().endswith(('.xlsx', '.xlsm', '.xls')):
+            # Libro completo: las hojas se leen en paralelo con el cargador múltiple
+            tabla_unida = tabla if modo_hojas == HOJAS_UNIDAS else None
+            archivo = self.archivo_actual
+            self.ejecutar_carga_multiple(
+                lambda cargador: cargador.cargar_hojas(archivo, bd, tabla_unida=tabla_unida,
+                                                       callback_progreso=self.callback_progreso),
+                bd, "hojas"
+            )
+            return
+        
         self.cargando = True
         self.btn_cargar.configure(state="disabled", text="⏳ Cargando...")
         self.btn_cancelar.configure(state="normal")
@@ -736,6 +857,7 @@ class ETLInterface(ctk.CTk):
         
         # IMPORTANTE: Configurar callback para ventana gráfica
         self.processor.callback_correccion_tipos = self.abrir_ventana_correccion_tipos
+        self.configurar_processor()
         
         thread = threading.Thread(
             target=self.processor.procesar_archivo,
@@ -751,6 +873,77 @@ class ETLInterface(ctk.CTk):
         thread.daemon = True
         thread.start()
     
+    def configurar_processor(self):
+        """Traslada las opciones de carga de la interfaz al procesador"""
+        self.processor.perfil_carga = self.combo_perfil.get()
+        self.processor.modo_carga = self.combo_modo.get()
+        claves = [c.strip() for c in self.entry_clave.get().split(",") if c.strip()]
+        self.processor.columnas_clave = claves or None
+        self.processor.forzar_recarga = bool(self.check_forzar.get())
+        self.processor.reutilizar_esquemas = bool(self.check_esquema_guardado.get())
+        
+        # Completo: sin lotes; fijo: el elegido; automático: el que quepa en el presupuesto de memoria
+        lote = self.combo_chunk.get().strip()
+        self.processor.presupuesto_memoria_mb = PRESUPUESTO_MEMORIA_MB if lote == LOTE_AUTOMATICO else None
+        self.processor.tamano_chunk = int(lote) if lote.isdigit() else None
+    
+    def cargar_carpeta(self):
+        """Carga todos los CSV/Excel de una carpeta, cada uno en la tabla con su nombre"""
+        carpeta = filedialog.askdirectory(title="Seleccionar carpeta con archivos")
+        if not carpeta or self.cargando:
+            return
+        
+        bd = self.entry_bd.get().strip() or "datos"
+        if not bd.lower().endswith(('.db', '.sqlite', '.sqlite3')):
+            bd += '.db'
+        
+        self.ejecutar_carga_multiple(
+            lambda cargador: cargador.cargar(carpeta, bd, self.callback_progreso), bd, "archivos"
+        )
+    
+    def ejecutar_carga_multiple(self, cargar, bd, elementos):
+        """Corre una carga del CargadorMultiple en un hilo y muestra el resumen por archivo/hoja
+        
+        Args:
+            cargar: función que recibe el CargadorMultiple y devuelve sus resultados
+            elementos: texto para el resumen ("archivos", "hojas")
+        """
+        self.cargando = True
+        self.btn_cargar.configure(state="disabled", text="⏳ Cargando...")
+        self.btn_cancelar.configure(state="normal")
+        self.progreso.set(0)
+        self.configurar_processor()
+        
+        def ejecutar():
+            from carga_multiple import CargadorMultiple
+            try:
+                resultados = cargar(CargadorMultiple(self.processor))
+            except Exception as e:
+                self.callback_completado(False, str(e))
+                return
+            
+            correctos = [r for r in resultados if r['exito']]
+            lineas = []
+            for r in resultados:
+                origen = f"{r['tabla']} ({r['hoja']})" if r['hoja'] else r['tabla']
+                lineas.append(
+                    f"{'✅' if r['exito'] else '❌'} {origen}: {r['filas']:,} filas "
+                    f"({r['segundos_total']:.1f} s) {'' if r['exito'] else r['mensaje']}"
+                )
+            resumen = f"{len(correctos)}/{len(resultados)} {elementos} cargados en {bd}\n\n" + "\n".join(lineas[:30])
+            
+            self.cargando = False
+            self.after(0, self.restablecer_ui)
+            self.after(0, lambda: self.progreso.set(1.0))
+            self.after(0, lambda: self.lbl_estado.configure(
+                text=f"¡Completado! {sum(r['filas'] for r in correctos):,} filas en {len(correctos)} {elementos}"
+            ))
+            self.after(0, lambda: messagebox.showinfo("Carga múltiple", resumen))
+        
+        thread = threading.Thread(target=ejecutar)
+        thread.daemon = True
+        thread.start()
+    
     def callback_progreso(self, progreso, mensaje):
         """Callback progreso"""
         self.after(0, lambda: self.progreso.set(progreso))
@@ -801,8 +994,7 @@ class ETLInterface(ctk.CTk):
             self.radio_var_bd.set("nueva")
             self.toggle_bd_mode()
             
-            for item in self.tabla.get_children():
-                self.tabla.delete(item)
+            self.vista_tabla.limpiar()
             for item in self.tabla_esquema.get_children():
                 self.tabla_esquema.delete(item)
             
@@ -816,18 +1008,18 @@ class ETLInterface(ctk.CTk):
             messagebox.showinfo("Limpieza", "✅ Programa reiniciado")
     
     def ver_tablas_bd(self):
-        """Muestra tablas en BD"""
+        """Abre el explorador de tablas de la BD (conteos, estadísticas y filas paginadas)"""
+        import os
         bd_path = self.entry_bd.get().strip() or "datos"
         # Asegurar que la base de datos tenga extensión .db
         if not bd_path.lower().endswith(('.db', '.sqlite', '.sqlite3')):
             bd_path += '.db'
+        if not os.path.exists(bd_path):
+            messagebox.showinfo(f"BD {bd_path}", "📭 La base de datos todavía no existe")
+            return
         try:
-            tablas = self.processor.obtener_tablas_bd(bd_path)
-            if tablas:
-                lista = "\n".join([f"• {tabla}" for tabla in tablas])
-                messagebox.showinfo(f"Tablas en {bd_path}", f"📊 Tablas:\n\n{lista}")
-            else:
-                messagebox.showinfo(f"BD {bd_path}", "📭 No hay tablas")
+            from ventana_explorador import VentanaExplorador
+            VentanaExplorador(self, bd_path)
         except Exception as e:
             messagebox.showerror("Error", f"Error:\n{str(e)}")
     
@@ -0,0 +1,129 @@
+# lector_excel.py
+"""
+📗 LECTOR EXCEL EN STREAMING
+Lee libros .xlsx con openpyxl en modo read-only y entrega lotes de filas como DataFrame
+"""
+import pandas as pd
+from openpyxl import load_workbook
+
+# Formatos que openpyxl puede abrir (los .xls antiguos siguen usando pd.read_excel)
+EXTENSIONES_OPENPYXL = ('.xlsx', '.xlsm', '.xltx', '.xltm')
+
+# Marca en DataFrame.attrs de los lotes leídos de un libro: solo ahí un número puede ser
+# un serial de fecha de Excel (en un CSV es un número más)
+ORIGEN_EXCEL = 'excel'
+
+
+def es_excel_streaming(archivo):
+    """Indica si el archivo puede leerse con el lector read-only de openpyxl"""
+    return archivo.lower().endswith(EXTENSIONES_OPENPYXL)
+
+
+def marcar_origen_excel(df):
+    """Marca el DataFrame como leído de un libro Excel (se conserva en copias y cortes)"""
+    df.attrs['origen'] = ORIGEN_EXCEL
+    return df
+
+
+def es_origen_excel(df):
+    """Indica si el DataFrame salió de un lector de Excel (openpyxl o xlrd)"""
+    return df.attrs.get('origen') == ORIGEN_EXCEL
+
+
+def listar_hojas(archivo):
+    """Nombres de las hojas del libro, en orden"""
+    if not es_excel_streaming(archivo):
+        # .xls antiguo: xlrd vía pandas
+        with pd.ExcelFile(archivo) as libro:
+            return list(libro.sheet_names)
+
+    libro = load_workbook(archivo, read_only=True, keep_links=False)
+    try:
+        return list(libro.sheetnames)
+    finally:
+        libro.close()
+
+
+def nombres_columnas(encabezado):
+    """Genera los nombres de columna igual que pd.read_excel (Unnamed: N y duplicados .1, .2)"""
+    nombres = []
+    usados = {}
+    for i, valor in enumerate(encabezado):
+        nombre = f"Unnamed: {i}" if valor is None else valor
+        if nombre in usados:
+            usados[nombre] += 1
+            nombre = f"{nombre}.{usados[nombre]}"
+        else:
+            usados[nombre] = 0
+        nombres.append(nombre)
+    return nombres
+
+
+def iterar_excel(archivo, tamano_lote=None, nrows=None, hoja=0):
+    """Recorre una hoja fila a fila sin cargar el libro completo
+
+    Devuelve tuplas (DataFrame, fracción de la hoja ya leída). Sin tamaño de lote
+    se entrega un único DataFrame; con ``nrows`` se deja de parsear tras esas filas.
+    """
+    libro = load_workbook(archivo, read_only=True, data_only=True, keep_links=False)
+    try:
+        hoja_ws = libro.worksheets[hoja] if isinstance(hoja, int) else libro[hoja]
+        filas = hoja_ws.iter_rows(values_only=True)
+
+        encabezado = list(next(filas, None) or [])
+        while encabezado and encabezado[-1] is None:
+            encabezado.pop()
+        columnas = nombres_columnas(encabezado)
+        ancho = len(columnas)
+
+        # max_row sale de la dimensión declarada en el archivo (puede no existir)
+        total_declarado = (hoja_ws.max_row or 0) - 1
+
+        lote = []
+        leidas = 0
+        vacias_pendientes = 0
+        entregado = False
+
+        for fila in filas:
+            if nrows is not None and leidas >= nrows:
+                break
+
+            fila = fila[:ancho]
+            if all(valor is None for valor in fila):
+                # Las filas vacías solo cuentan si luego aparecen datos (pandas descarta las finales)
+                vacias_pendientes += 1
+                continue
+
+            if vacias_pendientes:
+                lote.extend([(None,) * ancho] * vacias_pendientes)
+                leidas += vacias_pendientes
+                vacias_pendientes = 0
+
+            if len(fila) < ancho:
+                fila = fila + (None,) * (ancho - len(fila))
+            lote.append(fila)
+            leidas += 1
+
+            if tamano_lote and len(lote) >= tamano_lote:
+                fraccion = min(leidas / total_declarado, 1.0) if total_declarado > 0 else 0.0
+                yield marcar_origen_excel(pd.DataFrame.from_records(lote, columns=columnas)), fraccion
+                lote = []
+                entregado = True
+
+        if nrows is not None:
+            lote = lote[:max(nrows - (leidas - len(lote)), 0)]
+        if lote or not entregado:
+            yield marcar_origen_excel(pd.DataFrame.from_records(lote, columns=columnas)), 1.0
+    finally:
+        # En modo read-only el archivo queda abierto hasta cerrar el libro
+        libro.close()
+
+
+def leer_excel(archivo, nrows=None, hoja=0):
+    """Lee una hoja (o sus primeras ``nrows`` filas) en un único DataFrame"""
+    lotes = iterar_excel(archivo, nrows=nrows, hoja=hoja)
+    try:
+        df, _ = next(lotes)
+    finally:
+        lotes.close()
+    return df
@@ -2,21 +2,59 @@
 """
 🚀 ETL VISUAL - PUNTO DE ENTRADA ÚNICO
 Aplicación para cargar datos Excel/CSV a SQLite
+
+Sin argumentos (o con --gui) abre la interfaz gráfica; con un archivo
+ejecuta la carga por consola sin importar customtkinter:
+
+    python main.py ventas.csv --bd datos --perfil carga_masiva
+
+Con --tiempos (o ETL_TIEMPOS_ARRANQUE=1) se imprime en stderr el tiempo de
+cada etapa del arranque de la interfaz.
 """
-import customtkinter as ctk
-from interface import ETLInterface
+import sys
 
-def main():
-    """Función principal que inicia la aplicación"""
+import arranque
+
+
+def iniciar_gui():
+    """Abre la interfaz gráfica (solo aquí se importan los módulos de GUI)"""
     print("🚀 Iniciando ETL Visual...")
-    
+
+    import customtkinter as ctk
+    arranque.marcar("customtkinter importado")
+    from interface import ETLInterface
+    arranque.marcar("interface importado")
+
     # Configurar CustomTkinter
     ctk.set_appearance_mode("System")
     ctk.set_default_color_theme("blue")
-    
+
     # Crear y ejecutar aplicación
     app = ETLInterface()
+    arranque.marcar("ventana creada")
+
+    # pandas/numpy se importan cuando la ventana ya está en pantalla
+    def ventana_visible():
+        arranque.marcar("ventana visible")
+        arranque.precargar_datos()
+    app.after_idle(ventana_visible)
+
     app.mainloop()
 
+
+def main():
+    """Función principal: interfaz gráfica o carga por consola según los argumentos"""
+    argumentos = sys.argv[1:]
+    if "--tiempos" in argumentos:
+        argumentos.remove("--tiempos")
+        arranque.reporte_activo = True
+
+    if not argumentos or argumentos == ["--gui"]:
+        iniciar_gui()
+        return
+
+    from cli import main as main_cli
+    sys.exit(main_cli(argumentos))
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,149 @@
+# manifiesto.py
+"""
+🧾 MANIFIESTO DE CARGAS
+Registra en la base destino qué archivo se cargó en cada tabla para omitir recargas idénticas
+
+Una recarga se omite solo si el archivo no cambió, se pide con los mismos parámetros
+(modo, claves, tipos forzados, hojas) y fue la última carga de la tabla: si después
+se cargó otro archivo, la tabla ya no tiene lo que dejó esta.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime
+
+TABLA_MANIFIESTO = '_etl_manifiesto'
+
+# Bytes leídos por bloque al calcular la huella (inicio, centro y final del archivo)
+BYTES_BLOQUE_HUELLA = 1024 * 1024
+
+
+def huella_archivo(ruta):
+    """Huella rápida del contenido: tamaño + blake2b de tres bloques
+
+    Los archivos de hasta tres bloques se leen completos; los mayores solo en
+    el inicio, el centro y el final, así el costo no crece con el tamaño.
+    """
+    tamano = os.path.getsize(ruta)
+    h = hashlib.blake2b(str(tamano).encode(), digest_size=16)
+    with open(ruta, 'rb') as f:
+        if tamano <= 3 * BYTES_BLOQUE_HUELLA:
+            h.update(f.read())
+        else:
+            for posicion in (0, (tamano - BYTES_BLOQUE_HUELLA) // 2, tamano - BYTES_BLOQUE_HUELLA):
+                f.seek(posicion)
+                h.update(f.read(BYTES_BLOQUE_HUELLA))
+    return h.hexdigest()
+
+
+def datos_archivo(ruta):
+    """Ruta absoluta, tamaño, mtime y huella de un archivo"""
+    info = os.stat(ruta)
+    return {
+        'ruta': os.path.abspath(ruta),
+        'tamano': info.st_size,
+        'mtime': info.st_mtime,
+        'huella': huella_archivo(ruta),
+    }
+
+
+def crear_tabla_manifiesto(conn):
+    """Crea la tabla del manifiesto si aún no existe"""
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLA_MANIFIESTO} (
+            ruta TEXT NOT NULL,
+            tabla TEXT NOT NULL,
+            tamano INTEGER,
+            mtime REAL,
+            huella TEXT,
+            esquema TEXT,
+            filas INTEGER,
+            fecha_carga TEXT,
+            parametros TEXT,
+            PRIMARY KEY (ruta, tabla)
+        )
+    """)
+    # Manifiestos anteriores a la huella de parámetros: sus entradas nunca coinciden
+    existentes = {fila[1] for fila in conn.execute(f"PRAGMA table_info({TABLA_MANIFIESTO})")}
+    if 'parametros' not in existentes:
+        conn.execute(f"ALTER TABLE {TABLA_MANIFIESTO} ADD COLUMN parametros TEXT")
+
+
+def huella_parametros(modo, claves=None, tipos_forzados=None, hojas=None):
+    """Huella de los parámetros que deciden qué queda en la tabla además del archivo
+
+    ``tipos_forzados`` fija el esquema aplicado (el resto se infiere del mismo contenido);
+    ``hojas`` solo cuenta en la tabla unida de varias hojas, y sin orden.
+    """
+    parametros = {
+        'modo': modo,
+        'claves': [claves] if isinstance(claves, str) else list(claves or []),
+        'tipos_forzados': {str(col): tipo for col, tipo in (tipos_forzados or {}).items()},
+        'hojas': sorted(map(str, hojas)) if hojas else None,
+    }
+    texto = json.dumps(parametros, sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(texto.encode(), digest_size=16).hexdigest()
+
+
+def buscar_carga_previa(conn, archivo, tabla, parametros):
+    """Devuelve la entrada del manifiesto si el archivo ya se cargó sin cambios en la tabla
+
+    ``archivo`` es el dict de :func:`datos_archivo` y ``parametros`` el de
+    :func:`huella_parametros`. Devuelve None si la huella o los parámetros no
+    coinciden, si otra carga llegó después a la tabla o si la tabla ya no tiene
+    las columnas de esa carga.
+    """
+    existe = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name IN (?, ?)", (TABLA_MANIFIESTO, tabla)
+    ).fetchall()
+    if len(existe) < 2:
+        return None
+    if 'parametros' not in {fila[1] for fila in conn.execute(f"PRAGMA table_info({TABLA_MANIFIESTO})")}:
+        return None
+
+    # INSERT OR REPLACE da a cada registro un rowid mayor que los anteriores: el último es la última carga
+    fila = conn.execute(
+        f"SELECT ruta, tamano, huella, parametros, esquema, filas, fecha_carga FROM {TABLA_MANIFIESTO} "
+        "WHERE tabla = ? ORDER BY rowid DESC LIMIT 1",
+        (tabla,)
+    ).fetchone()
+    if fila is None or fila[0] != archivo['ruta']:
+        return None
+    if fila[1] != archivo['tamano'] or fila[2] != archivo['huella'] or fila[3] != parametros:
+        return None
+
+    columnas = {col[1] for col in conn.execute(f"PRAGMA table_info({tabla})")}
+    if not set(json.loads(fila[4] or '{}')) <= columnas:
+        return None
+    return {'filas': fila[5], 'fecha_carga': fila[6]}
+
+
+def esquema_a_json(esquema):
+    """Serializa lo relevante del esquema aplicado (tipo y columna de origen)"""
+    return json.dumps({
+        col: {
+            'tipo': info['tipo'],
+            'columna_original': str(info['columna_original']),
+            'formato_fecha': info.get('formato_fecha'),
+        }
+        for col, info in esquema.items()
+    }, ensure_ascii=False)
+
+
+def registrar_carga(conn, archivo, tabla, esquema, filas, parametros, reemplazo=True):
+    """Guarda (o reemplaza) la entrada del manifiesto de una carga terminada
+
+    Con ``reemplazo`` la tabla solo tiene este archivo: se borran las entradas de
+    los demás archivos cargados antes en ella.
+    """
+    crear_tabla_manifiesto(conn)
+    if reemplazo:
+        conn.execute(f"DELETE FROM {TABLA_MANIFIESTO} WHERE tabla = ?", (tabla,))
+    conn.execute(
+        f"INSERT OR REPLACE INTO {TABLA_MANIFIESTO} "
+        "(ruta, tabla, tamano, mtime, huella, esquema, filas, fecha_carga, parametros) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (archivo['ruta'], tabla, archivo['tamano'], archivo['mtime'], archivo['huella'],
+         esquema_a_json(esquema), filas, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), parametros)
+    )
+    conn.commit()
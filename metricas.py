@@ -0,0 +1,280 @@
+# metricas.py
+"""
+⏱️ MÉTRICAS POR ETAPA DE CADA CARGA
+Eventos de tiempo (con filas, bytes y memoria) por etapa de procesar_archivo y un historial
+de ejecuciones en la tabla _etl_runs de la base destino para seguir el rendimiento
+"""
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TABLA_EJECUCIONES = '_etl_runs'
+
+# Etapas de una carga en orden; cada una tiene su columna segundos_<etapa> en _etl_runs
+ETAPAS = (
+    'lectura',            # Lectura del archivo (lote a lote en streaming)
+    'inferencia',         # Detección de fechas, perfiles de tipo y esquema
+    'espera_correccion',  # Ventana de corrección de tipos abierta
+    'creacion_tabla',     # Tabla staging o preparación del upsert
+    'fechas',             # Normalización de columnas de fecha a ISO
+    'nulos',              # Normalización de nulos en columnas de texto
+    'conversion',         # Conversión de INTEGER/REAL/BOOLEAN (o todo, si es en paralelo)
+    'insercion',          # executemany de los lotes
+    'publicacion',        # Swap de la staging o resumen del upsert y manifiesto
+)
+
+# Columnas agregadas a _etl_runs después de su primera versión (se suman a las bases existentes)
+COLUMNAS_AGREGADAS = (
+    ('memoria_inicial_mb', 'REAL'),
+    ('pico_memoria_mb', 'REAL'),
+)
+
+_MB = 1024 * 1024
+
+
+def pico_rss_mb():
+    """Pico de memoria residente del proceso actual en MB (None si no se puede medir)"""
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa KB; macOS, bytes
+        return pico / _MB if sys.platform == 'darwin' else pico / 1024
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, 'peak_wset', info.rss) / _MB
+
+
+def rss_actual_mb():
+    """Memoria residente actual del proceso en MB (None si no se puede medir)
+
+    A diferencia de pico_rss_mb no arrastra el máximo de cargas anteriores del mismo
+    proceso (la interfaz hace muchas cargas en un solo proceso).
+    """
+    try:
+        # Linux: lectura directa, sin dependencias y en microsegundos
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / _MB
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / _MB
+
+
+class MedicionCarga:
+    """Acumula los eventos de tiempo de una carga y arma su resumen
+
+    Las etapas se solapan en el pipeline (lectura, conversión e inserción corren en
+    hilos distintos): la suma de sus segundos puede superar ``segundos_total``.
+    Cada evento se entrega además a ``callback`` (si lo hay) en el hilo que lo mide.
+    La memoria residente se toma en cada evento (entre lotes); si el pico del proceso
+    creció durante la carga, ese pico (exacto) reemplaza al máximo observado.
+    """
+
+    def __init__(self, archivo, tabla, callback=None):
+        self.archivo = archivo
+        self.tabla = tabla
+        self.callback = callback
+        self.fecha_inicio = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.estado = 'en_curso'
+        self.mensaje = None
+        self.filas = 0
+        self.bytes_archivo = 0
+        self.configuracion = {}
+        self.etapas = {}
+        self.memoria_inicial_mb = rss_actual_mb()
+        self.pico_memoria_mb = self.memoria_inicial_mb
+        self._pico_proceso_inicial = pico_rss_mb()
+        self._inicio = time.perf_counter()
+        self._inicio_espera = None
+        self._bloqueo = threading.Lock()
+
+    def registrar(self, etapa, segundos, filas=0, num_bytes=0):
+        """Suma un evento a su etapa y lo entrega al callback"""
+        memoria = rss_actual_mb()
+        evento = {
+            'etapa': etapa,
+            'inicio': time.perf_counter() - self._inicio - segundos,
+            'segundos': segundos,
+            'filas': filas,
+            'bytes': num_bytes,
+            'memoria_mb': memoria,
+            'hilo': threading.current_thread().name,
+        }
+        with self._bloqueo:
+            total = self.etapas.setdefault(etapa, {'segundos': 0.0, 'filas': 0, 'bytes': 0, 'eventos': 0})
+            total['segundos'] += segundos
+            total['filas'] += filas
+            total['bytes'] += num_bytes
+            total['eventos'] += 1
+            if memoria is not None and (self.pico_memoria_mb is None or memoria > self.pico_memoria_mb):
+                self.pico_memoria_mb = memoria
+        if self.callback:
+            self.callback(evento)
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide el bloque ``with``; el dict entregado admite 'filas' y 'bytes' del evento"""
+        datos = {'filas': 0, 'bytes': 0}
+        inicio = time.perf_counter()
+        try:
+            yield datos
+        finally:
+            self.registrar(nombre, time.perf_counter() - inicio, datos['filas'], datos['bytes'])
+
+    def medir_lotes(self, lotes, tamano_archivo):
+        """Envuelve un iterador de (lote, fracción) midiendo la lectura de cada lote
+
+        Los bytes de cada evento se estiman con el avance de la fracción leída.
+        """
+        fraccion_previa = 0.0
+        try:
+            while True:
+                inicio = time.perf_counter()
+                try:
+                    lote, fraccion = next(lotes)
+                except StopIteration:
+                    return
+                self.registrar('lectura', time.perf_counter() - inicio, len(lote),
+                               int((fraccion - fraccion_previa) * tamano_archivo))
+                fraccion_previa = fraccion
+                yield lote, fraccion
+        finally:
+            lotes.close()
+
+    def iniciar_espera(self):
+        """Marca el inicio de una pausa a la espera del usuario (ventana de corrección)"""
+        self._inicio_espera = time.perf_counter()
+
+    def terminar_espera(self):
+        """Registra la pausa iniciada con iniciar_espera como etapa espera_correccion"""
+        if self._inicio_espera is not None:
+            self.registrar('espera_correccion', time.perf_counter() - self._inicio_espera)
+            self._inicio_espera = None
+
+    def finalizar(self, estado, mensaje=None):
+        """Fija el estado final (ok, error, cancelada, sin_cambios) si aún no se fijó"""
+        if self.estado == 'en_curso':
+            self.estado = estado
+            self.mensaje = mensaje
+            self._actualizar_pico()
+
+    def _actualizar_pico(self):
+        """Toma el pico del proceso si lo alcanzó esta carga (capta picos entre eventos)"""
+        pico_proceso = pico_rss_mb()
+        if pico_proceso is None or self._pico_proceso_inicial is None or pico_proceso <= self._pico_proceso_inicial:
+            return
+        with self._bloqueo:
+            if self.pico_memoria_mb is None or pico_proceso > self.pico_memoria_mb:
+                self.pico_memoria_mb = pico_proceso
+
+    def resumen(self):
+        """Resumen de la ejecución: totales, configuración y etapas"""
+        segundos_total = time.perf_counter() - self._inicio
+        return {
+            'fecha_inicio': self.fecha_inicio,
+            'archivo': self.archivo,
+            'tabla': self.tabla,
+            'estado': self.estado,
+            'mensaje': self.mensaje,
+            'filas': self.filas,
+            'bytes_archivo': self.bytes_archivo,
+            'segundos_total': segundos_total,
+            'filas_por_segundo': self.filas / segundos_total if segundos_total else 0.0,
+            'memoria_inicial_mb': self.memoria_inicial_mb,
+            'pico_memoria_mb': self.pico_memoria_mb,
+            'configuracion': dict(self.configuracion),
+            'etapas': {etapa: dict(datos) for etapa, datos in self.etapas.items()},
+        }
+
+    def texto_etapas(self):
+        """Línea corta con las etapas más costosas: '⏱️ lectura 1.2 s · insercion 0.8 s'"""
+        costosas = sorted(self.etapas.items(), key=lambda item: item[1]['segundos'], reverse=True)[:4]
+        return "⏱️ " + " · ".join(f"{etapa} {datos['segundos']:.2f} s" for etapa, datos in costosas)
+
+    def texto_memoria(self):
+        """Línea con el pico de memoria: '🧠 Memoria: pico 310 MB (+180 MB en la carga, presupuesto 512 MB)'"""
+        if self.pico_memoria_mb is None:
+            return ""
+        detalles = []
+        if self.memoria_inicial_mb is not None:
+            detalles.append(f"+{self.pico_memoria_mb - self.memoria_inicial_mb:,.0f} MB en la carga")
+        if self.configuracion.get('presupuesto_memoria_mb'):
+            detalles.append(f"presupuesto {self.configuracion['presupuesto_memoria_mb']:,} MB")
+        sufijo = f" ({', '.join(detalles)})" if detalles else ""
+        return f"🧠 Memoria: pico {self.pico_memoria_mb:,.0f} MB{sufijo}"
+
+
+def crear_tabla_ejecuciones(conn):
+    """Crea la tabla del historial de cargas si aún no existe"""
+    columnas_etapas = ",\n".join(f"            segundos_{etapa} REAL" for etapa in ETAPAS)
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {TABLA_EJECUCIONES} (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fecha_inicio TEXT,
+            archivo TEXT,
+            tabla TEXT,
+            estado TEXT,
+            mensaje TEXT,
+            filas INTEGER,
+            bytes_archivo INTEGER,
+            segundos_total REAL,
+            filas_por_segundo REAL,
+            memoria_inicial_mb REAL,
+            pico_memoria_mb REAL,
+            modo TEXT,
+            perfil TEXT,
+            tamano_chunk INTEGER,
+{columnas_etapas},
+            configuracion TEXT,
+            etapas TEXT
+        )
+    """)
+    existentes = {fila[1] for fila in conn.execute(f"PRAGMA table_info({TABLA_EJECUCIONES})")}
+    for columna, tipo in COLUMNAS_AGREGADAS:
+        if columna not in existentes:
+            conn.execute(f"ALTER TABLE {TABLA_EJECUCIONES} ADD COLUMN {columna} {tipo}")
+
+
+def registrar_ejecucion(conn, resumen):
+    """Inserta el resumen de una carga en _etl_runs y devuelve su id"""
+    crear_tabla_ejecuciones(conn)
+    configuracion = resumen['configuracion']
+    valores = {
+        'fecha_inicio': resumen['fecha_inicio'],
+        'archivo': resumen['archivo'],
+        'tabla': resumen['tabla'],
+        'estado': resumen['estado'],
+        'mensaje': resumen['mensaje'],
+        'filas': resumen['filas'],
+        'bytes_archivo': resumen['bytes_archivo'],
+        'segundos_total': resumen['segundos_total'],
+        'filas_por_segundo': resumen['filas_por_segundo'],
+        'memoria_inicial_mb': resumen['memoria_inicial_mb'],
+        'pico_memoria_mb': resumen['pico_memoria_mb'],
+        'modo': configuracion.get('modo_carga'),
+        'perfil': configuracion.get('perfil_carga'),
+        'tamano_chunk': configuracion.get('tamano_chunk'),
+        **{f"segundos_{etapa}": resumen['etapas'].get(etapa, {}).get('segundos') for etapa in ETAPAS},
+        'configuracion': json.dumps(configuracion, ensure_ascii=False),
+        'etapas': json.dumps(resumen['etapas'], ensure_ascii=False),
+    }
+    cursor = conn.execute(
+        f"INSERT INTO {TABLA_EJECUCIONES} ({', '.join(valores)}) VALUES ({', '.join('?' * len(valores))})",
+        list(valores.values())
+    )
+    conn.commit()
+    return cursor.lastrowid
@@ -0,0 +1,144 @@
+# motor_insercion.py
+"""
+💾 MOTOR DE INSERCIÓN SQLITE
+Inserción masiva con sentencia preparada, executemany y lotes según el límite de variables
+"""
+import sqlite3
+import time
+from itertools import chain, islice
+
+import numpy as np
+
+# Más filas por sentencia apenas mejora el rendimiento y alarga el SQL a compilar
+MAX_FILAS_POR_SENTENCIA = 500
+
+# Sentencias multi-fila por llamada a executemany (entre bloques se revisa cancelación y progreso)
+SENTENCIAS_POR_BLOQUE = 20
+
+# Filas que se convierten a la vez al generar tuplas desde un DataFrame
+FILAS_POR_TRAMO = 10000
+
+
+def limite_variables_sqlite(conn):
+    """Devuelve el máximo de parámetros '?' por sentencia que admite la conexión"""
+    try:
+        return conn.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+    except AttributeError:
+        # Python < 3.11 no expone getlimit: usar el valor por defecto de SQLite < 3.32
+        return 999
+
+
+def _valores_nativos(serie):
+    """Lista de valores de una columna con tipos nativos de Python y None para nulos"""
+    if serie.dtype.kind == 'M':
+        # Mismo formato que usaba to_sql para fechas sin normalizar
+        serie = serie.dt.strftime('%Y-%m-%d %H:%M:%S')
+
+    nulos = serie.isna().to_numpy()
+    if not nulos.any() and isinstance(serie.dtype, np.dtype):
+        # tolist() de numpy ya entrega int/float/bool de Python
+        return serie.to_numpy().tolist()
+
+    valores = serie.to_numpy(dtype=object, copy=True)
+    valores[nulos] = None
+    return valores.tolist()
+
+
+def filas_desde_dataframe(df, columnas, filas_por_tramo=FILAS_POR_TRAMO):
+    """Genera tuplas perezosamente a partir de las columnas indicadas
+
+    Cada tramo de filas se convierte columna a columna y se recorre con zip,
+    sin bucles por celda ni una lista intermedia con la tabla completa.
+    """
+    for inicio in range(0, len(df), filas_por_tramo):
+        tramo = df.iloc[inicio:inicio + filas_por_tramo]
+        yield from zip(*[_valores_nativos(tramo[col]) for col in columnas])
+
+
+class MotorInsercion:
+    """Inserta filas en una tabla SQLite reutilizando una única sentencia preparada"""
+
+    def __init__(self, conn, nombre_tabla, columnas, intervalo_commit=None, clausula_conflicto=None,
+                 filas_por_bloque=None):
+        """
+        Args:
+            columnas: nombres de columna en la tabla destino, en el orden de las tuplas
+            intervalo_commit: filas entre commits; None = toda la carga en una transacción
+            clausula_conflicto: texto ON CONFLICT ... que se añade al INSERT (upsert)
+            filas_por_bloque: filas que se acumulan por llamada a executemany (se redondea
+                a sentencias completas); None = SENTENCIAS_POR_BLOQUE sentencias
+        """
+        self.conn = conn
+        self.nombre_tabla = nombre_tabla
+        self.columnas = list(columnas)
+        self.intervalo_commit = intervalo_commit
+
+        # Filas por sentencia según el límite real de variables de SQLite
+        num_columnas = max(len(self.columnas), 1)
+        self.filas_por_sentencia = max(1, min(limite_variables_sqlite(conn) // num_columnas,
+                                              MAX_FILAS_POR_SENTENCIA))
+        sentencias = SENTENCIAS_POR_BLOQUE if filas_por_bloque is None else filas_por_bloque // self.filas_por_sentencia
+        self.filas_por_bloque = self.filas_por_sentencia * max(sentencias, 1)
+
+        marcador = "(" + ", ".join(["?"] * len(self.columnas)) + ")"
+        base = f"INSERT INTO {nombre_tabla} ({', '.join(self.columnas)}) VALUES "
+        sufijo = f" {clausula_conflicto}" if clausula_conflicto else ""
+        self.sql_fila = base + marcador + sufijo
+        self.sql_multi = base + ", ".join([marcador] * self.filas_por_sentencia) + sufijo
+
+        self.filas_insertadas = 0
+        self.segundos = 0.0
+        self._filas_sin_commit = 0
+
+    @property
+    def filas_por_segundo(self):
+        """Rendimiento medido solo sobre el tiempo de inserción"""
+        return self.filas_insertadas / self.segundos if self.segundos > 0 else 0.0
+
+    def insertar(self, filas, callback_bloque=None, cancelado=None):
+        """Inserta un iterable de tuplas; devuelve False si se canceló a mitad
+
+        Args:
+            callback_bloque: recibe el total de filas insertadas tras cada bloque
+            cancelado: función sin argumentos que devuelve True para detener la carga
+        """
+        filas = iter(filas)
+        k = self.filas_por_sentencia
+
+        while True:
+            if cancelado and cancelado():
+                return False
+
+            bloque = list(islice(filas, self.filas_por_bloque))
+            if not bloque:
+                return True
+
+            inicio = time.perf_counter()
+
+            # Grupos completos con la sentencia multi-fila; el resto fila a fila
+            completas = len(bloque) - len(bloque) % k
+            if completas:
+                self.conn.executemany(
+                    self.sql_multi,
+                    (tuple(chain.from_iterable(bloque[i:i + k])) for i in range(0, completas, k))
+                )
+            if completas < len(bloque):
+                self.conn.executemany(self.sql_fila, bloque[completas:])
+
+            self.filas_insertadas += len(bloque)
+            self._filas_sin_commit += len(bloque)
+            if self.intervalo_commit and self._filas_sin_commit >= self.intervalo_commit:
+                self.conn.commit()
+                self._filas_sin_commit = 0
+
+            self.segundos += time.perf_counter() - inicio
+
+            if callback_bloque:
+                callback_bloque(self.filas_insertadas)
+
+    def finalizar(self):
+        """Confirma la transacción pendiente"""
+        inicio = time.perf_counter()
+        self.conn.commit()
+        self._filas_sin_commit = 0
+        self.segundos += time.perf_counter() - inicio
@@ -0,0 +1,129 @@
+# pipeline.py
+"""
+🔀 PIPELINE LECTURA → TRANSFORMACIÓN → ESCRITURA
+Etapas en hilos conectadas por colas acotadas: mientras se inserta el lote N
+ya se está leyendo y convirtiendo el N+1
+"""
+import queue
+import threading
+
+# Lotes que pueden esperar entre dos etapas (backpressure: la etapa rápida se bloquea)
+CAPACIDAD_COLA = 2
+
+# Segundos entre revisiones de cancelación mientras una etapa espera en una cola
+_ESPERA = 0.1
+
+
+class _Fin:
+    """Marca de fin de datos que recorre las colas detrás del último lote"""
+
+
+class _Error:
+    """Excepción de una etapa, reenviada por la cola para relanzarla en el consumidor"""
+
+    def __init__(self, excepcion):
+        self.excepcion = excepcion
+
+
+class Pipeline:
+    """Lee de ``fuente`` en un hilo, aplica ``transformar`` en otro y entrega los resultados
+
+    El hilo que itera el pipeline es la etapa de escritura (el dueño de la conexión
+    SQLite). Un error en cualquier etapa detiene las demás y se relanza al iterar;
+    ``cancelado`` (función sin argumentos) se revisa antes de leer cada lote.
+    Usar como context manager para que los hilos terminen aunque la escritura se corte.
+    """
+
+    def __init__(self, fuente, transformar, capacidad=CAPACIDAD_COLA, cancelado=None):
+        self.fuente = fuente
+        self.transformar = transformar
+        self.cancelado = cancelado or (lambda: False)
+        self._leidos = queue.Queue(maxsize=capacidad)
+        self._transformados = queue.Queue(maxsize=capacidad)
+        self._detener = threading.Event()
+        self._hilos = [
+            threading.Thread(target=self._etapa_lectura, name="pipeline-lectura", daemon=True),
+            threading.Thread(target=self._etapa_transformacion, name="pipeline-transformacion", daemon=True),
+        ]
+
+    def __enter__(self):
+        for hilo in self._hilos:
+            hilo.start()
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        self.cerrar()
+        return False
+
+    def __iter__(self):
+        while True:
+            item = self._obtener(self._transformados)
+            if item is None or isinstance(item, _Fin):
+                return
+            if isinstance(item, _Error):
+                raise item.excepcion
+            yield item
+
+    def cerrar(self):
+        """Detiene las etapas, vacía las colas y espera a que terminen los hilos"""
+        self._detener.set()
+        for hilo in self._hilos:
+            while hilo.is_alive():
+                self._vaciar()
+                hilo.join(_ESPERA)
+        self._vaciar()
+
+    def _vaciar(self):
+        """Libera los lotes encolados (y desbloquea a quien espera para encolar)"""
+        for cola in (self._leidos, self._transformados):
+            try:
+                while True:
+                    cola.get_nowait()
+            except queue.Empty:
+                pass
+
+    def _poner(self, cola, item):
+        """Encola esperando lugar; devuelve False si el pipeline se detuvo mientras tanto"""
+        while not self._detener.is_set():
+            try:
+                cola.put(item, timeout=_ESPERA)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _obtener(self, cola):
+        """Desencola esperando datos; devuelve None si el pipeline se detuvo"""
+        while not self._detener.is_set():
+            try:
+                return cola.get(timeout=_ESPERA)
+            except queue.Empty:
+                continue
+        return None
+
+    def _etapa_lectura(self):
+        """Hilo lector: recorre la fuente hasta agotarla, cancelar o fallar"""
+        try:
+            for item in self.fuente:
+                if self.cancelado() or not self._poner(self._leidos, item):
+                    break
+            self._poner(self._leidos, _Fin())
+        except Exception as e:
+            self._poner(self._leidos, _Error(e))
+
+    def _etapa_transformacion(self):
+        """Hilo transformador: convierte cada lote leído y lo pasa a la escritura"""
+        while True:
+            item = self._obtener(self._leidos)
+            if item is None:
+                return
+            if isinstance(item, (_Fin, _Error)):
+                self._poner(self._transformados, item)
+                return
+            try:
+                resultado = self.transformar(item)
+            except Exception as e:
+                self._poner(self._transformados, _Error(e))
+                return
+            if not self._poner(self._transformados, resultado):
+                return
@@ -10,6 +10,537 @@ import os
 import numpy as np
 from datetime import datetime
 import re
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from lector_excel import es_excel_streaming, es_origen_excel, iterar_excel, leer_excel, marcar_origen_excel
+from motor_insercion import MotorInsercion, filas_desde_dataframe, FILAS_POR_TRAMO
+from pipeline import Pipeline, CAPACIDAD_COLA
+from manifiesto import TABLA_MANIFIESTO, datos_archivo, buscar_carga_previa, huella_parametros, registrar_carga
+from cache_esquemas import buscar_esquema, guardar_esquema, registrar_uso, ruta_cache
+from metricas import TABLA_EJECUCIONES, MedicionCarga, registrar_ejecucion
+from fuentes_vista import OPCIONES_CSV_TEXTO, FuenteCSV, FuenteLotes
+
+# Textos que se tratan como nulos además de NaN/NaT/None
+VALORES_NULOS = ['NaN', 'NaT', 'nan', 'null', 'NULL', '', ' ']
+
+# Textos reconocidos al convertir a BOOLEAN
+VALORES_BOOLEANOS = {
+    '1': 1, 'true': 1, 't': 1, 'yes': 1, 'si': 1, 'sí': 1, 'y': 1,
+    '0': 0, 'false': 0, 'f': 0, 'no': 0, 'n': 0
+}
+
+TIPOS_REAL = ('REAL', 'NUMERIC', 'DECIMAL', 'FLOAT', 'DOUBLE')
+
+# Perfiles de PRAGMAs por carga; "seguro" es el comportamiento histórico
+PERFILES_SQLITE = {
+    'seguro': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': 10000,
+    },
+    # Reconstrucciones de bases desechables: sin durabilidad hasta terminar la carga
+    'carga_masiva': {
+        'page_size': 16384,           # Solo tiene efecto en bases nuevas
+        'journal_mode': 'MEMORY',     # MEMORY (no OFF) para que cancelar pueda hacer rollback
+        'synchronous': 'OFF',
+        'locking_mode': 'EXCLUSIVE',
+        'cache_size': -262144,        # 256 MB
+        'temp_store': 'MEMORY',
+    },
+}
+
+# Por debajo de estas filas la conversión en paralelo cuesta más de lo que ahorra
+FILAS_MINIMAS_PARALELO = 50000
+
+# Formatos de fecha candidatos en orden de preferencia (dd/mm antes que mm/dd)
+FORMATOS_FECHA = [
+    '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M', 'ISO8601', '%Y/%m/%d', '%Y%m%d',
+    '%d/%m/%Y', '%d/%m/%Y %H:%M', '%d/%m/%Y %H:%M:%S', '%d-%m-%Y', '%d.%m.%Y', '%d/%m/%y',
+    '%m/%d/%Y', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S', '%m-%d-%Y', '%m/%d/%y',
+]
+
+# Marcador de formato para números de serie de Excel (días desde 1899-12-30)
+FORMATO_SERIAL_EXCEL = 'excel'
+
+# Rango de seriales de Excel aceptados como fecha (1954-10-03 .. 2119-01-10)
+RANGO_SERIAL_EXCEL = (20000, 80000)
+
+# Nombres que admiten un serial de Excel como fecha: fecha/date/fec como palabra o prefijo
+# ("fecha_alta", "date_created", "fec_ini"); "ingreso", "alta" o "monto_alta" no bastan
+_NOMBRE_FECHA_SERIAL = re.compile(r'(^|[\W_])(fecha|date|fec(?=[\W_]|$))')
+
+_SEPARADORES_FECHA = re.compile(r'[-/]')
+
+# Formatos cuyos valores nunca son un número ni un booleano (llevan separadores)
+_FORMATOS_FECHA_TEXTO = frozenset(FORMATOS_FECHA) - {'%Y%m%d', 'ISO8601'}
+
+# Filas observadas por columna al inferir tipos (muestra repartida por todo el archivo)
+FILAS_MUESTRA_TIPOS = 100000
+
+# Tramos de un CSV de donde se toma la muestra en modo streaming (inicio, medio, final...)
+BLOQUES_MUESTRA_CSV = 20
+
+# Proporción mínima de valores que deben cumplir cada regla de detectar_problemas_tipos;
+# las que cambian el tipo de todos los valores exigen el 100% para no perder datos
+UMBRALES_PROBLEMAS = {
+    'numeros_como_texto': 0.7,
+    'fecha_no_detectada': 0.7,
+    'real_podria_ser_integer': 1.0,
+    'posible_boolean': 1.0,
+}
+
+# Filas repartidas que evalúa detectar_problemas_tipos en columnas sin estadísticas completas
+FILAS_MUESTRA_PROBLEMAS = 10000
+
+# Filas repartidas con que detectar_problemas_tipos arma los contadores de tipo cuando el
+# esquema no trae estadísticas (muestreo desactivado o esquema guardado sin ellas): la
+# confianza de cada problema ya refleja que la muestra es menor
+FILAS_PERFIL_PROBLEMAS = 1000
+
+# Valores repartidos para sondear fechas: forma de fecha en columnas de texto (antes de
+# probar formatos) y proporción de fechas ambiguas
+FILAS_SONDEO_FECHA = 1000
+
+# Forma de fecha con separadores: 2024-03-01, 01/03/2024, 1.3.24...
+_PATRON_FORMA_FECHA = re.compile(r'^\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}')
+
+# Presupuesto de memoria: filas repartidas por el archivo para medir los bytes de cada fila
+FILAS_MUESTRA_MEMORIA = 2000
+
+# Copias de un lote vivas a la vez en el pipeline: el leído y su versión convertida
+COPIAS_POR_LOTE = 2
+
+# Parte del presupuesto para las tuplas de Python del bloque de inserción en curso
+FRACCION_PRESUPUESTO_INSERCION = 0.1
+
+# Límites del lote calculado: muy pequeño multiplica la sobrecarga por lote,
+# muy grande deja de ser streaming
+LOTE_MINIMO = 1000
+LOTE_MAXIMO = 1000000
+
+# Filas por lote al leer un Excel para la vista previa virtual
+FILAS_LOTE_VISTA = 5000
+
+# Enteros con magnitud desde 2**63 no caben en INTEGER; desde 2**53 un REAL pierde dígitos
+_LIMITE_INT64 = 2 ** 63
+_LIMITE_REAL_EXACTO = 2 ** 53
+
+# Columna con el hash del contenido de cada fila (modo incremental)
+COLUMNA_HASH = '_hash_fila'
+
+# Nombres de columna que suelen identificar una fila (id, codigo, cliente_id, id_cliente...)
+_PATRON_CLAVE = re.compile(r'^(id|codigo|cod|clave|key|uuid)$|_id$|^id_|_(cod|codigo|clave|key)$')
+
+
+def _primeros_validos(s, n):
+    """Primeros ``n`` valores no nulos sin copiar la columna completa (a diferencia de dropna)"""
+    posiciones = np.flatnonzero(s.notna().to_numpy())[:n]
+    return s.iloc[posiciones]
+
+
+def _mascara_nulos(s):
+    """Marca NaN/None y los textos de VALORES_NULOS"""
+    nulos = s.isna()
+    if s.dtype.kind == 'O':
+        nulos |= s.isin(VALORES_NULOS)
+    return nulos
+
+
+def _a_texto(s):
+    """TEXT/BLOB: conserva los valores y deja None en los nulos"""
+    nulos = _mascara_nulos(s)
+    return s.astype(object).where(~nulos, None)
+
+
+def _a_entero(s):
+    """INTEGER: quita separadores de miles y deja dígitos/signo"""
+    if s.dtype.kind in 'iub':
+        return s.astype('Int64')
+    if s.dtype.kind == 'f':
+        # Columnas ya numéricas (p. ej. enteros con nulos): truncar como CAST(x AS INTEGER)
+        return np.trunc(s.where(np.isfinite(s))).astype('Int64')
+
+    return pd.to_numeric(
+        s.astype(str).str.replace(r'[^\d\-]+', '', regex=True),
+        errors='coerce'
+    ).astype('Int64')
+
+
+def _a_real(s):
+    """REAL: parser vectorizado que conserva decimales originales (US 1,234.5 / EU 1.234,5)"""
+    if s.dtype.kind in 'iuf':
+        return s.astype('float64')
+
+    t = s.astype(str).str.strip()
+    tiene_coma = t.str.contains(',', regex=False, na=False)
+
+    # Decisión por columna: sin comas → decimal US o sin separadores, convertir directo
+    if not tiene_coma.any():
+        return pd.to_numeric(t, errors='coerce').astype('float64')
+
+    # Solo comas → decimal EU, cambiar coma por punto
+    if not t.str.contains('.', regex=False, na=False).any():
+        return pd.to_numeric(t.str.replace(',', '.', regex=False), errors='coerce').astype('float64')
+
+    # Columna mixta: en cada celda el separador decimal es el que aparece más a la derecha
+    coma_decimal = t.str.rfind(',') > t.str.rfind('.')
+
+    # Punto = decimal, Coma = miles → eliminar comas
+    normalizado = t.str.replace(',', '', regex=False)
+    # Coma = decimal, Punto = miles → eliminar puntos y convertir coma a punto
+    normalizado[coma_decimal] = (
+        t[coma_decimal].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+    )
+    return pd.to_numeric(normalizado, errors='coerce').astype('float64')
+
+
+def inferir_formato_fecha(muestra):
+    """Infiere el formato de una muestra de fechas en texto
+
+    Devuelve (formato, ambiguo). El formato es None si ninguno de FORMATOS_FECHA
+    explica toda la muestra; es ambiguo si el formato con día y mes invertidos
+    también la explica (ningún día supera 12).
+    """
+    if len(muestra) == 0:
+        return None, False
+
+    for formato in FORMATOS_FECHA:
+        if pd.to_datetime(muestra, format=formato, errors='coerce').notna().all():
+            invertido = formato.replace('%d', '%_').replace('%m', '%d').replace('%_', '%m')
+            ambiguo = (
+                invertido != formato and invertido in FORMATOS_FECHA
+                and pd.to_datetime(muestra, format=invertido, errors='coerce').notna().all()
+            )
+            return formato, bool(ambiguo)
+
+    return None, False
+
+
+def _es_serial_excel(muestra):
+    """Indica si una muestra numérica parece números de serie de fecha de Excel"""
+    minimo, maximo = RANGO_SERIAL_EXCEL
+    return len(muestra) > 0 and bool(((muestra >= minimo) & (muestra <= maximo)).all())
+
+
+def _parsear_fecha(s, formato=None, respaldo=True):
+    """Serie datetime64 con lo que se entiende como fecha (NaT en el resto)
+    
+    Con ``respaldo`` los valores que no siguen ``formato`` pasan por el parser general.
+    """
+    if formato == FORMATO_SERIAL_EXCEL:
+        return pd.to_datetime(pd.to_numeric(s, errors='coerce'), unit='D', origin='1899-12-30', errors='coerce')
+    if not formato:
+        return pd.to_datetime(s, errors='coerce')
+    
+    # Formato explícito: parseo vectorizado sin caer en dateutil por elemento
+    dt = pd.to_datetime(s, format=formato, errors='coerce')
+    
+    if not respaldo:
+        return dt
+    
+    # Solo los valores que no siguen el formato inferido pasan por el parser general
+    fallidos = dt.isna() & ~_mascara_nulos(s)
+    if fallidos.any():
+        dt[fallidos] = pd.to_datetime(
+            s[fallidos], format='mixed', dayfirst=formato.startswith('%d'), errors='coerce'
+        )
+    return dt
+
+
+def _a_fecha(s, tipo, formato=None):
+    """DATE/DATETIME: texto ISO; lo que no se pueda convertir queda como None"""
+    dt = _parsear_fecha(s, formato)
+    formato = '%Y-%m-%d %H:%M:%S' if tipo == 'DATETIME' else '%Y-%m-%d'
+    return dt.dt.strftime(formato).astype(object).where(dt.notna(), None)
+
+
+def _a_booleano(s):
+    """BOOLEAN: 1/0 a partir de los textos de VALORES_BOOLEANOS"""
+    m = s.astype(str).str.strip().str.lower()
+    return m.map(VALORES_BOOLEANOS).astype('Int64')
+
+
+def convertir_columna(s, info):
+    """Normaliza nulos, fechas y tipo de una columna según su entrada en el esquema"""
+    tipo = str(info['tipo']).upper()
+
+    if tipo == 'INTEGER':
+        return _a_entero(s)
+    if tipo in TIPOS_REAL:
+        return _a_real(s)
+    if tipo in ('DATE', 'DATETIME') or info.get('es_fecha'):
+        return _a_fecha(s, tipo, info.get('formato_fecha'))
+    if tipo == 'BOOLEAN':
+        return _a_booleano(s)
+    return _a_texto(s)
+
+
+class PerfilColumna:
+    """Contadores de una columna, acumulables lote a lote, para elegir su tipo SQLite
+    
+    Cada llamada a ``observar`` usa operaciones vectorizadas sobre la serie completa:
+    cuántos valores no nulos hay y cuántos se pueden guardar como entero, real,
+    fecha (con el formato inferido) o booleano, además del largo máximo del texto.
+    """
+    
+    def __init__(self, es_fecha=False, formato_fecha=None):
+        self.es_fecha = es_fecha
+        self.formato_fecha = formato_fecha
+        self.observados = 0
+        self.validos = 0
+        self.enteros = 0
+        self.reales = 0
+        self.fechas = 0
+        self.booleanos = 0
+        self.largo_max = 0
+    
+    def observar(self, serie):
+        """Suma a los contadores los valores de ``serie``"""
+        self.observados += len(serie)
+        valores = serie[~_mascara_nulos(serie).to_numpy()]
+        if len(valores) == 0:
+            return
+        self.validos += len(valores)
+        
+        tipo = valores.dtype.kind
+        pesos = None
+        if tipo not in 'iufMmb':
+            # Texto: cada valor distinto se analiza una vez y cuenta tantas veces como aparece
+            conteos = valores.value_counts(sort=False)
+            valores = conteos.index.to_series(index=None)
+            pesos = conteos.to_numpy()
+        
+        def contar(mascara):
+            mascara = np.asarray(mascara, dtype=bool)
+            return int(mascara.sum() if pesos is None else pesos[mascara].sum())
+        
+        fechas = None
+        if self.es_fecha:
+            # Solo los que siguen el formato inferido: sin formatear a ISO ni parsear valor a valor
+            fechas = _parsear_fecha(valores, self.formato_fecha, respaldo=False).notna().to_numpy()
+            self.fechas += contar(fechas)
+        
+        if tipo in 'iu':
+            self.enteros += len(valores)
+            self.reales += len(valores)
+            self.booleanos += contar(valores.isin([0, 1]))
+            return
+        if tipo in 'Mmb':
+            self.booleanos += len(valores) if tipo == 'b' else 0
+            return
+        
+        if tipo == 'f':
+            numeros = valores
+        else:
+            texto = valores.astype(str).str.strip()
+            self.largo_max = max(self.largo_max, int(texto.str.len().max()))
+            if fechas is not None and self.formato_fecha in _FORMATOS_FECHA_TEXTO and fechas.any():
+                # Una fecha con separadores no es número ni booleano: el resto solo mira las demás
+                texto, pesos = texto[~fechas], pesos[~fechas]
+                if len(texto) == 0:
+                    return
+            numeros = pd.to_numeric(texto, errors='coerce').astype('float64')
+            self.booleanos += contar(texto.str.lower().isin(VALORES_BOOLEANOS))
+        
+        es_numero = numeros.notna()
+        enteros = es_numero & np.isfinite(numeros) & (numeros % 1 == 0)
+        self.enteros += contar(enteros & (numeros.abs() < _LIMITE_INT64))
+        if tipo == 'f':
+            self.booleanos += contar(numeros.isin([0.0, 1.0]))
+            self.reales += contar(es_numero)
+        else:
+            # REAL se cuenta con el mismo parser que la conversión (separadores US 1,234.5 / EU 1.234,5)
+            reales = _a_real(texto) if texto.str.contains(',', regex=False).any() else numeros
+            es_real = reales.notna()
+            enteros_reales = es_real & np.isfinite(reales) & (reales % 1 == 0)
+            # Un identificador de 20 dígitos en texto no es un REAL seguro
+            self.reales += contar(es_real & ~(enteros_reales & (reales.abs() >= _LIMITE_REAL_EXACTO)))
+    
+    @property
+    def fecha_segura(self):
+        """Todos los valores observados se convierten con el formato de fecha inferido"""
+        return self.es_fecha and self.fechas == self.validos
+    
+    def tipo_sugerido(self):
+        """Tipo más estrecho que guarda todos los valores observados sin perder datos"""
+        if self.validos == 0:
+            return 'TEXT'
+        if self.enteros == self.validos:
+            return 'INTEGER'
+        if self.reales == self.validos:
+            return 'REAL'
+        return 'TEXT'
+    
+    def proporcion(self, contador):
+        """Fracción de los valores no nulos que cumple ``contador`` ('enteros', 'fechas'...)"""
+        return getattr(self, contador) / self.validos if self.validos else 0.0
+    
+    def como_dict(self):
+        """Contadores para guardar junto al esquema"""
+        return {
+            'observados': self.observados,
+            'validos': self.validos,
+            'enteros': self.enteros,
+            'reales': self.reales,
+            'fechas': self.fechas,
+            'booleanos': self.booleanos,
+            'largo_max': self.largo_max,
+        }
+
+
+def _posiciones_repartidas(total, filas):
+    """Índices equiespaciados de ``filas`` posiciones entre 0 y ``total``"""
+    return np.linspace(0, total - 1, filas).astype(np.int64)
+
+
+def muestra_repartida_csv(archivo, filas=FILAS_MUESTRA_TIPOS, bloques=BLOQUES_MUESTRA_CSV):
+    """Lee unas ``filas`` de un CSV repartidas en bloques a lo largo de todo el archivo
+    
+    Salta a posiciones de bytes equiespaciadas y lee líneas completas desde ahí,
+    sin recorrer el archivo entero. Las líneas que no cuadren (campos entre comillas
+    con saltos de línea cortados por el salto) se descartan.
+    """
+    tamano = os.path.getsize(archivo)
+    filas_por_bloque = max(filas // bloques, 1)
+    partes = []
+    with open(archivo, 'rb') as f:
+        encabezado = f.readline()
+        inicio_datos = f.tell()
+        for i in range(bloques):
+            f.seek(inicio_datos + (tamano - inicio_datos) * i // bloques)
+            if i:
+                f.readline()  # Descartar la línea cortada por el salto
+            for _ in range(filas_por_bloque):
+                linea = f.readline()
+                if not linea:
+                    break
+                partes.append(linea if linea.endswith(b'\n') else linea + b'\n')
+    return pd.read_csv(io.BytesIO(encabezado + b''.join(partes)), on_bad_lines='skip')
+
+
+def _primer_valor(serie):
+    """Primer valor no nulo (tampoco entre VALORES_NULOS) o None"""
+    candidatos = _primeros_validos(serie, 50)
+    candidatos = candidatos[~_mascara_nulos(candidatos).to_numpy()]
+    return candidatos.iloc[0] if len(candidatos) else None
+
+
+def confianza_proporcion(proporcion, muestras, z=1.96):
+    """Cota inferior del intervalo de Wilson: la proporción con la que se puede contar
+    
+    Con pocas muestras la confianza queda muy por debajo de la proporción observada
+    (5 de 5 → 0.57); con miles, prácticamente coincide.
+    """
+    if muestras <= 0:
+        return 0.0
+    z2 = z * z / muestras
+    centro = proporcion + z2 / 2
+    margen = z * np.sqrt(proporcion * (1 - proporcion) / muestras + z2 / (4 * muestras))
+    return float(max(0.0, (centro - margen) / (1 + z2)))
+
+
+def _valores_distintos(serie):
+    """(valores distintos no nulos como texto sin espacios, veces que aparece cada uno)"""
+    valores = serie[~_mascara_nulos(serie).to_numpy()]
+    conteos = valores.value_counts(sort=False)
+    return conteos.index.to_series(index=None).astype(str).str.strip(), conteos.to_numpy()
+
+
+def _sondeo(serie, filas=FILAS_SONDEO_FECHA):
+    """``filas`` valores repartidos por la serie (la serie entera si es más corta)"""
+    if len(serie) <= filas:
+        return serie
+    return serie.iloc[_posiciones_repartidas(len(serie), filas)]
+
+
+def _proporcion_fechas(serie):
+    """Proporción de valores de texto que se leen como fecha con el mejor de FORMATOS_FECHA
+    
+    Devuelve (proporción, valores no nulos, formato); formato None si ningún valor
+    tiene forma de fecha. Un sondeo de FILAS_SONDEO_FECHA valores descarta primero,
+    sin recorrer la columna, las que no contienen ninguna.
+    """
+    if serie.dtype.kind != 'O' or len(serie) == 0:
+        return 0.0, 0, None
+    if not _sondeo(serie).astype(str).str.contains(_PATRON_FORMA_FECHA, na=False).any():
+        return 0.0, 0, None
+    
+    valores, pesos = _valores_distintos(serie)
+    total = int(pesos.sum())
+    forma = valores.str.contains(_PATRON_FORMA_FECHA, na=False).to_numpy()
+    valores, pesos = valores[forma], pesos[forma]
+    mejor, mejor_formato = 0, None
+    for formato in FORMATOS_FECHA:
+        aciertos = int(pesos[pd.to_datetime(valores, format=formato, errors='coerce').notna().to_numpy()].sum())
+        if aciertos > mejor:
+            mejor, mejor_formato = aciertos, formato
+        if mejor == int(pesos.sum()):
+            break
+    return (mejor / total if total else 0.0), total, mejor_formato
+
+
+def _proporcion_fecha_ambigua(serie, formato):
+    """Proporción de valores que se leen igual de bien con día y mes invertidos (día ≤ 12)"""
+    valores, pesos = _valores_distintos(serie)
+    total = int(pesos.sum())
+    if not formato or formato == FORMATO_SERIAL_EXCEL or not total:
+        return 0.0, total
+    dias = pd.to_datetime(valores, format=formato, errors='coerce').dt.day
+    return int(pesos[(dias <= 12).to_numpy()].sum()) / total, total
+
+
+def _es_conversion_pesada(info):
+    """INTEGER, REAL, fechas y BOOLEAN compensan enviarse a otro proceso; TEXT no"""
+    tipo = str(info['tipo']).upper()
+    return tipo in ('INTEGER', 'BOOLEAN', 'DATE', 'DATETIME') + TIPOS_REAL or bool(info.get('es_fecha'))
+
+
+def _etapa_conversion(info):
+    """Etapa de métricas de la conversión de una columna (mismo orden que convertir_columna)"""
+    tipo = str(info['tipo']).upper()
+    if tipo == 'INTEGER' or tipo in TIPOS_REAL:
+        return 'conversion'
+    if tipo in ('DATE', 'DATETIME') or info.get('es_fecha'):
+        return 'fechas'
+    if tipo == 'BOOLEAN':
+        return 'conversion'
+    return 'nulos'
+
+
+def _convertir_columnas(tareas):
+    """Convierte un grupo de columnas dentro de un proceso trabajador
+
+    Recibe [(columna, serie, info)] y devuelve [(columna, serie_convertida)].
+    """
+    return [(col, convertir_columna(serie, info)) for col, serie, info in tareas]
+
+
+def nombre_tabla_desde_archivo(archivo):
+    """Nombre de tabla por defecto: nombre del archivo sin extensión, sin guiones ni espacios"""
+    nombre_archivo = archivo.split('/')[-1].split('\\')[-1]
+    return nombre_archivo.split('.')[0].replace('-', '_').replace(' ', '_')
+
+
+def inferir_columnas_clave(df, esquema):
+    """Elige la clave del upsert: una columna sin nulos ni duplicados en la muestra
+
+    Prefiere nombres tipo id/codigo/clave; si ninguno sirve, la primera columna única.
+    Devuelve la lista de nombres limpios (de ``esquema``).
+    """
+    candidatas = []
+    for col_limpio, info in esquema.items():
+        serie = df[info['columna_original']]
+        if len(serie) and not serie.isna().any() and serie.is_unique:
+            candidatas.append(col_limpio)
+
+    for col_limpio in candidatas:
+        if _PATRON_CLAVE.search(col_limpio.lower()):
+            return [col_limpio]
+    if candidatas:
+        return [candidatas[0]]
+    raise Exception("No se encontró una columna clave única; indique columnas_clave para la carga incremental")
+
 
 class DataProcessor:
     """Procesador de datos para ETL con manejo uniforme de fechas y nulos"""
@@ -19,7 +550,63 @@ class DataProcessor:
         self.callback_progreso = None
         self.callback_completado = None
         self.callback_correccion_tipos = None  # Para ventana gráfica de corrección
+
+        # Modo streaming: None = archivo completo en memoria, entero = filas por lote
+        self.tamano_chunk = None
+        
+        # Presupuesto de memoria en MB para los datos de la carga: si se indica, las filas por
+        # lote de lectura y por bloque de inserción se calculan con los bytes medidos por fila
+        # (reemplaza a tamano_chunk)
+        self.presupuesto_memoria_mb = None
+        self._filas_por_bloque = None
+        
+        # Filas entre commits durante la inserción: None = toda la carga en una transacción
+        self.intervalo_commit = None
+        
+        # Procesos para convertir columnas en paralelo: 1 = conversión en serie
+        self.workers_conversion = 1
+        self._pool_conversion = None
+        
+        # Perfil de PRAGMAs de SQLite para la carga (ver PERFILES_SQLITE)
+        self.perfil_carga = 'seguro'
         
+        # Tabla staging de la carga en curso (se descarta si la carga no termina)
+        self._tabla_staging = None
+        
+        # Modo de carga: "reemplazar" = tabla completa vía staging, "incremental" = upsert por clave
+        self.modo_carga = 'reemplazar'
+        self.columnas_clave = None  # None = inferir del esquema en modo incremental
+        self._claves_incrementales = None
+        self._conteo_inicial = None
+        self.resumen_incremental = None
+        
+        # True = recargar aunque el manifiesto indique que el archivo no cambió
+        self.forzar_recarga = False
+        
+        # Lotes en espera entre las etapas lectura → conversión → inserción
+        self.capacidad_pipeline = CAPACIDAD_COLA
+        
+        # Inferencia de tipos: "muestra" = muestra repartida por el archivo, "completo" = todos
+        # los valores (en streaming, una pasada extra), "desactivado" = solo dtypes de pandas
+        self.muestreo_tipos = 'muestra'
+        self.filas_muestra_tipos = FILAS_MUESTRA_TIPOS
+        
+        # Tipos impuestos sin ventana de corrección: {columna (limpia u original): tipo SQLite}
+        self.tipos_forzados = None
+        
+        # Esquemas confirmados (ventana de corrección o tipos forzados) recordados por encabezado:
+        # un archivo con las mismas columnas se carga sin inferir tipos ni abrir la ventana
+        self.guardar_esquemas = True
+        self.reutilizar_esquemas = True
+        self.ruta_cache_esquemas = None  # None = ETL_CACHE_ESQUEMAS o ~/.etl_visual/esquemas.json
+        
+        # Métricas por etapa: callback_metricas recibe cada evento (dict); el resumen de cada
+        # carga queda en ultima_medicion y, con registrar_ejecuciones, en _etl_runs de la base destino
+        self.callback_metricas = None
+        self.registrar_ejecuciones = True
+        self.ultima_medicion = None
+        self._medicion = None
+
         # Patrones para detectar columnas de fecha
         self.fecha_patterns = [
             r'\bfecha\b', r'\bdate\b', r'\bfec\b', r'\bfech[a|.]', r'_dt', r'_date', r'_fecha',
@@ -27,189 +614,279 @@ class DataProcessor:
             r'creado', r'actualizado', r'modificado',
             r'registro', r'ingreso', r'alta', r'baja'
         ]
+        # Un único regex compilado en lugar de un re.search por patrón y columna
+        self._regex_fecha_nombre = re.compile('|'.join(self.fecha_patterns))
     
     def detectar_columnas_fecha(self, df):
         """Detecta automáticamente columnas que contienen fechas con filtros más estrictos"""
-        columnas_fecha = []
+        return list(self.inferir_formatos_fecha(df))
+    
+    def inferir_formatos_fecha(self, df):
+        """Detecta columnas de fecha e infiere su formato a partir de una muestra
+        
+        Devuelve {columna: (formato, ambiguo)}; el formato es FORMATO_SERIAL_EXCEL para
+        seriales numéricos de Excel (solo en DataFrames leídos de un libro) y None si solo
+        el parser general entiende la muestra.
+        """
+        formatos = {}
+        origen_excel = es_origen_excel(df)
         
         for col in df.columns:
             col_lower = str(col).lower()
-            es_fecha_por_nombre = any(re.search(p, col_lower) for p in self.fecha_patterns)
+            es_fecha_por_nombre = self._regex_fecha_nombre.search(col_lower) is not None
+            serie = df[col]
+            
+            if serie.dtype.kind == 'M':
+                formatos[col] = (None, False)
+                continue
 
-            # 🔒 Evitar tratar números como fecha salvo por nombre/patrón
-            if df[col].dtype.kind in 'iuf' and not es_fecha_por_nombre:
+            # 🔒 Un número solo es fecha si viene de un libro Excel, la columna se llama
+            # claramente como fecha y los valores caben en el rango de seriales
+            if serie.dtype.kind in 'iuf':
+                if (
+                    origen_excel and _NOMBRE_FECHA_SERIAL.search(col_lower)
+                    and _es_serial_excel(_primeros_validos(serie, 20))
+                ):
+                    formatos[col] = (FORMATO_SERIAL_EXCEL, False)
                 continue
 
             # Trabajar con strings; usar indicadores visuales de fecha
-            muestra = df[col].dropna().astype(str).head(20)
-            candidatos = muestra[muestra.str.contains(r'[-/]', regex=True)]
+            muestra = _primeros_validos(serie, 20).astype(str)
+            candidatos = muestra[muestra.str.contains(_SEPARADORES_FECHA, na=False)]
 
             if len(candidatos) == 0 and not es_fecha_por_nombre:
                 continue
+            
+            muestra_fecha = candidatos if len(candidatos) else muestra
+            formato, ambiguo = inferir_formato_fecha(muestra_fecha)
+            if formato:
+                formatos[col] = (formato, ambiguo)
+                continue
 
             try:
-                # Especificar formato para evitar advertencias de pandas
-                pd.to_datetime(candidatos if len(candidatos) else muestra, 
-                             errors='raise')
-                columnas_fecha.append(col)
+                # Ningún formato conocido: aceptar si el parser general entiende la muestra
+                pd.to_datetime(muestra_fecha, errors='raise')
+                formatos[col] = (None, False)
             except Exception:
                 continue
         
-        return columnas_fecha
+        return formatos
     
     def normalizar_fechas(self, df):
         """Normaliza todas las fechas a formato ISO YYYY-MM-DD"""
-        df_copy = df.copy()
-        columnas_fecha = self.detectar_columnas_fecha(df_copy)
+        df_copy = df.copy(deep=False)
+        formatos = self.inferir_formatos_fecha(df_copy)
         
-        for col in columnas_fecha:
+        for col, (formato, _) in formatos.items():
             try:
-                # Convertir a datetime con manejo de errores
-                df_copy[col] = pd.to_datetime(df_copy[col], errors='coerce')
-                
-                # Convertir a formato ISO (solo fecha, sin hora)
-                df_copy[col] = df_copy[col].dt.strftime('%Y-%m-%d')
-                
-                # Los valores que no se pudieron convertir quedan como None
-                df_copy[col] = df_copy[col].replace('NaT', None)
-                
+                # Convertir a formato ISO (solo fecha, sin hora); lo no convertible queda como None
+                df_copy[col] = _a_fecha(df_copy[col], 'DATE', formato)
             except Exception:
                 continue
         
-        return df_copy, columnas_fecha
+        return df_copy, list(formatos)
     
     def normalizar_nulos(self, df):
         """Normaliza todos los valores nulos a None estándar"""
-        df_copy = df.copy()
-        
-        # Reemplazar diferentes tipos de nulos con None
-        df_copy = df_copy.replace({
-            np.nan: None,
-            pd.NaT: None,
-            'NaN': None,
-            'NaT': None,
-            'nan': None,
-            'null': None,
-            'NULL': None,
-            '': None,
-            ' ': None
-        })
-        
-        # Convertir objetos NaN a None
+        # Copia superficial: solo se reemplazan las columnas que tienen nulos
+        df_copy = df.copy(deep=False)
+        
         for col in df_copy.columns:
-            if df_copy[col].dtype == 'object':
-                df_copy[col] = df_copy[col].where(pd.notna(df_copy[col]), None)
+            nulos = _mascara_nulos(df_copy[col])
+            if nulos.any():
+                df_copy[col] = df_copy[col].astype(object).where(~nulos, None)
         
         return df_copy
     
     def aplicar_esquema_a_df(self, df_src, esquema):
-        """Aplica el esquema final a los valores del DataFrame original antes de insertar"""
-        df2 = df_src.copy()
-
-        def to_int_series(s):
-            # Quita separadores de miles y deja dígitos/signo
-            return pd.to_numeric(
-                s.astype(str).str.replace(r'[^\d\-]+', '', regex=True),
-                errors='coerce'
-            ).astype('Int64')
-
-        def to_real_series(s):
-            # Parser inteligente que conserva decimales originales
-            def parse_one(x):
-                t = str(x).strip()
-                if t == '' or t.lower() in {'nan', 'none', 'null'}:
-                    return None
-
-                has_dot = '.' in t
-                has_comma = ',' in t
-
-                # Solo punto → decimal US
-                if has_dot and not has_comma:
-                    # No tocar el punto decimal
-                    return pd.to_numeric(t, errors='coerce')
-
-                # Solo coma → decimal EU
-                if has_comma and not has_dot:
-                    # Cambiar coma por punto
-                    return pd.to_numeric(t.replace(',', '.'), errors='coerce')
-
-                if has_dot and has_comma:
-                    # Ambos presentes: el separador decimal suele ser el que aparece más a la derecha
-                    last_dot = t.rfind('.')
-                    last_comma = t.rfind(',')
-                    if last_dot > last_comma:
-                        # Punto = decimal, Coma = miles → eliminar comas
-                        t2 = t.replace(',', '')
-                        return pd.to_numeric(t2, errors='coerce')
-                    else:
-                        # Coma = decimal, Punto = miles → eliminar puntos y convertir coma a punto
-                        t2 = t.replace('.', '').replace(',', '.')
-                        return pd.to_numeric(t2, errors='coerce')
-
-                # Sin separadores: convertir directo
-                return pd.to_numeric(t, errors='coerce')
-
-            return s.map(parse_one)
-
-        def to_bool_series(s):
-            m = s.astype(str).str.strip().str.lower()
-            return m.map({
-                '1':1,'true':1,'t':1,'yes':1,'si':1,'sí':1,'y':1,
-                '0':0,'false':0,'f':0,'no':0,'n':0
-            }).astype('Int64')
-
+        """Aplica el esquema final a los valores del DataFrame original antes de insertar
+        
+        Nulos, fechas y tipos se normalizan en una sola pasada columna a columna sobre
+        una copia superficial: cada columna se reemplaza por su versión convertida.
+        """
+        df2 = df_src.copy(deep=False)
+        
+        tareas = []
         for col_limpio, info in esquema.items():
             col = info.get('columna_original', col_limpio)
-            tipo = str(info['tipo']).upper()
-
-            if col not in df2.columns:
-                continue
-
-            if tipo == 'INTEGER':
-                df2[col] = to_int_series(df2[col])
-            elif tipo in ('REAL', 'NUMERIC', 'DECIMAL', 'FLOAT', 'DOUBLE'):
-                df2[col] = to_real_series(df2[col])
-            elif tipo in ('DATE', 'DATETIME') or info.get('es_fecha'):
-                dt = pd.to_datetime(df2[col], errors='coerce')
-                if tipo == 'DATETIME':
-                    df2[col] = dt.dt.strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    df2[col] = dt.dt.strftime('%Y-%m-%d')
-                df2[col] = df2[col].replace('NaT', None)
-            elif tipo == 'BOOLEAN':
-                df2[col] = to_bool_series(df2[col])
+            if col in df2.columns:
+                tareas.append((col, info))
+        
+        if self.workers_conversion > 1 and len(df2) >= FILAS_MINIMAS_PARALELO:
+            # En los procesos no se distingue fechas/nulos/tipos: todo cuenta como conversión
+            inicio = time.perf_counter()
+            for col, serie in self._convertir_en_paralelo(df2, tareas):
+                df2[col] = serie
+            segundos = {'conversion': time.perf_counter() - inicio}
+        else:
+            segundos = dict.fromkeys(('fechas', 'nulos', 'conversion'), 0.0)
+            for col, info in tareas:
+                inicio = time.perf_counter()
+                df2[col] = convertir_columna(df2[col], info)
+                segundos[_etapa_conversion(info)] += time.perf_counter() - inicio
+        
+        if self._medicion is not None:
+            for etapa, duracion in segundos.items():
+                if duracion:
+                    self._medicion.registrar(etapa, duracion, len(df2))
+        
+        return df2
+    
+    def _convertir_en_paralelo(self, df, tareas):
+        """Reparte los conversores pesados entre procesos y devuelve las columnas en orden de esquema"""
+        pool = self._obtener_pool_conversion()
+        pesadas = [(col, info) for col, info in tareas if _es_conversion_pesada(info)]
+        
+        # Grupos balanceados por columnas: menos envíos que una tarea por columna
+        num_grupos = min(len(pesadas), self.workers_conversion * 2)
+        futuros = []
+        for i in range(num_grupos):
+            grupo = [(col, df[col], info) for col, info in pesadas[i::num_grupos]]
+            futuros.append(pool.submit(_convertir_columnas, grupo))
+        
+        # TEXT solo marca nulos: se resuelve aquí mientras trabajan los procesos
+        resultados = {}
+        for col, info in tareas:
+            if not _es_conversion_pesada(info):
+                resultados[col] = convertir_columna(df[col], info)
+        
+        for futuro in futuros:
+            resultados.update(futuro.result())
+        
+        return [(col, resultados[col]) for col, _ in tareas]
+    
+    def _obtener_pool_conversion(self):
+        """Crea (una vez por carga) el pool de procesos para la conversión de columnas"""
+        if self._pool_conversion is None:
+            # spawn: la carga corre en un hilo y fork con hilos activos no es seguro
+            self._pool_conversion = ProcessPoolExecutor(
+                max_workers=self.workers_conversion,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+        return self._pool_conversion
+    
+    def cerrar_pool_conversion(self):
+        """Libera los procesos de conversión en paralelo"""
+        if self._pool_conversion is not None:
+            self._pool_conversion.shutdown(cancel_futures=True)
+            self._pool_conversion = None
+    
+    def perfilar_columnas(self, df, formatos_fecha=None):
+        """Contadores de tipo por columna: {columna: PerfilColumna}
+        
+        Las columnas numéricas se observan completas (es barato); las de texto, en una
+        muestra repartida de ``filas_muestra_tipos`` filas. Si la muestra sugiere un tipo
+        numérico, se confirma con la columna completa antes de aceptarlo.
+        """
+        if formatos_fecha is None:
+            formatos_fecha = self.inferir_formatos_fecha(df)
+        completo = self.muestreo_tipos == 'completo' or not self.filas_muestra_tipos
+        posiciones = None
+        if not completo and len(df) > self.filas_muestra_tipos:
+            posiciones = _posiciones_repartidas(len(df), self.filas_muestra_tipos)
+        
+        perfiles = {}
+        for col in df.columns:
+            serie = df[col]
+            formato, _ = formatos_fecha.get(col, (None, False))
+            perfil = PerfilColumna(col in formatos_fecha, formato)
+            
+            if posiciones is None or serie.dtype.kind in 'iufbM':
+                perfil.observar(serie)
             else:
-                # TEXT/BLOB: aseguramos None donde aplique
-                df2[col] = df2[col].where(pd.notna(df2[col]), None)
-
-        # Normalizar nulos con helper existente
-        return self.normalizar_nulos(df2)
+                perfil.observar(serie.iloc[posiciones])
+                if perfil.tipo_sugerido() != 'TEXT':
+                    perfil = PerfilColumna(col in formatos_fecha, formato)
+                    perfil.observar(serie)
+            perfiles[col] = perfil
+        return perfiles
     
-    def obtener_esquema_tabla(self, df):
-        """Genera esquema de tabla con tipos SQLite apropiados"""
+    def perfilar_archivo(self, archivo, primer_lote, tamano_lote=None, hoja=0):
+        """Perfiles de tipo para el modo streaming: primer lote + resto del archivo
+        
+        En modo "muestra" se suman filas repartidas por todo el CSV (Excel no permite
+        saltar a mitad de la hoja: solo cuenta el primer lote); en modo "completo"
+        se recorre el archivo (o la hoja ``hoja``) entero contando valores, sin guardarlos.
+        """
+        formatos_fecha = self.inferir_formatos_fecha(primer_lote)
+        perfiles = self.perfilar_columnas(primer_lote, formatos_fecha)
+        
+        if self.muestreo_tipos == 'completo':
+            lotes = self.iterar_lotes(archivo, tamano_lote or self.tamano_chunk, hoja=hoja)
+            try:
+                next(lotes)  # El primer lote ya está contado
+                for lote, _ in lotes:
+                    if self.cancelado:
+                        break
+                    for col, perfil in perfiles.items():
+                        perfil.observar(lote[col])
+            finally:
+                lotes.close()
+        elif archivo.lower().endswith('.csv'):
+            filas_muestra = self.filas_muestra_tipos
+            if self.presupuesto_memoria_mb and tamano_lote:
+                # La muestra se lee de una vez (y el parser de pandas ocupa otro tanto mientras
+                # tanto): no más filas que las de los lotes en vuelo del pipeline
+                filas_muestra = min(filas_muestra, tamano_lote * self._lotes_en_vuelo())
+            try:
+                muestra = muestra_repartida_csv(archivo, filas_muestra)
+            except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+                muestra = None  # Sin muestra válida: queda el primer lote
+            if muestra is not None and list(muestra.columns) == list(primer_lote.columns):
+                for col, perfil in perfiles.items():
+                    perfil.observar(muestra[col])
+        return perfiles
+    
+    def obtener_esquema_tabla(self, df, perfiles=None):
+        """Genera esquema de tabla con tipos SQLite apropiados
+        
+        Con ``perfiles`` (de perfilar_archivo) el tipo sale de esos contadores; si no,
+        se perfila el propio DataFrame salvo con muestreo_tipos = "desactivado".
+        """
         esquema = {}
-        df_normalizado, columnas_fecha = self.normalizar_fechas(df)
+        formatos_fecha = self.inferir_formatos_fecha(df)
+        if perfiles is None and self.muestreo_tipos != 'desactivado':
+            perfiles = self.perfilar_columnas(df, formatos_fecha)
         
-        for col in df_normalizado.columns:
+        for col in df.columns:
             # Limpiar nombre de columna
             col_limpio = str(col).replace(' ', '_').replace('-', '_')
             col_limpio = re.sub(r'[^\w]', '_', col_limpio)
             
+            serie = df[col]
+            
             # Determinar tipo
-            if col in columnas_fecha:
+            perfil = perfiles.get(col) if perfiles else None
+            es_fecha = col in formatos_fecha and (perfil is None or perfil.fecha_segura)
+            formato_fecha, fecha_ambigua = formatos_fecha.get(col, (None, False)) if es_fecha else (None, False)
+            if es_fecha:
                 tipo_sql = 'TEXT'  # Fechas como TEXT en formato ISO
-                ejemplo = df_normalizado[col].dropna().iloc[0] if len(df_normalizado[col].dropna()) > 0 else None
+                # Ejemplo ya normalizado: solo se convierten los primeros valores
+                muestra = _a_fecha(_primeros_validos(serie, 20), 'DATE', formato_fecha).dropna()
+                ejemplo = muestra.iloc[0] if len(muestra) > 0 else None
+            elif perfil is not None:
+                # Tipo más estrecho compatible con todos los valores observados
+                tipo_sql = perfil.tipo_sugerido()
+                ejemplo = _primer_valor(serie)
+                if ejemplo is not None and tipo_sql == 'INTEGER':
+                    ejemplo = int(float(pd.to_numeric(str(ejemplo).strip())))
+                elif ejemplo is not None and tipo_sql == 'REAL':
+                    # Ejemplo con los separadores decididos sobre los primeros valores, como al convertir
+                    muestra = _a_real(_primeros_validos(serie, 20)).dropna()
+                    ejemplo = float(muestra.iloc[0]) if len(muestra) > 0 else None
+                elif ejemplo is not None:
+                    ejemplo = str(ejemplo)
             else:
                 # Inferir tipo para otros campos
-                muestra_sin_nulos = df_normalizado[col].dropna()
+                muestra_sin_nulos = _primeros_validos(serie, 1)
                 
                 if len(muestra_sin_nulos) == 0:
                     tipo_sql = 'TEXT'
                     ejemplo = None
-                elif muestra_sin_nulos.dtype in ['int64', 'int32']:
+                elif serie.dtype in ['int64', 'int32']:
                     tipo_sql = 'INTEGER'
                     ejemplo = int(muestra_sin_nulos.iloc[0])
-                elif muestra_sin_nulos.dtype in ['float64', 'float32']:
+                elif serie.dtype in ['float64', 'float32']:
                     tipo_sql = 'REAL'
                     ejemplo = float(muestra_sin_nulos.iloc[0])
                 else:
@@ -219,92 +896,186 @@ class DataProcessor:
             esquema[col_limpio] = {
                 'tipo': tipo_sql,
                 'columna_original': col,
-                'es_fecha': col in columnas_fecha,
-                'ejemplo': ejemplo
+                'es_fecha': es_fecha,
+                'formato_fecha': formato_fecha,
+                'fecha_ambigua': fecha_ambigua,
+                'ejemplo': ejemplo,
+                'estadisticas': perfil.como_dict() if perfil is not None else None
             }
         
         return esquema
     
+    def aplicar_tipos_forzados(self, esquema):
+        """Sobrescribe los tipos inferidos con los de ``tipos_forzados`` (como la ventana de corrección)"""
+        if not self.tipos_forzados:
+            return esquema
+        
+        por_original = {str(info['columna_original']): col_limpio for col_limpio, info in esquema.items()}
+        esquema = {col_limpio: info.copy() for col_limpio, info in esquema.items()}
+        for columna, tipo in self.tipos_forzados.items():
+            col_limpio = columna if columna in esquema else por_original.get(str(columna))
+            if col_limpio is None:
+                raise ValueError(f"La columna '{columna}' no existe en el archivo")
+            
+            tipo = tipo.upper()
+            esquema[col_limpio]['tipo'] = tipo
+            esquema[col_limpio]['es_fecha'] = tipo in ['DATE', 'DATETIME']
+        return esquema
+    
     def detectar_problemas_tipos(self, df, esquema):
-        """Detecta problemas potenciales en los tipos de datos detectados automáticamente"""
+        """Detecta problemas potenciales en los tipos de datos detectados automáticamente
+        
+        Cada regla mide sobre la columna la proporción de valores que la cumplen y se reporta si alcanza su umbral
+        de UMBRALES_PROBLEMAS. Los contadores de entero/real/booleano salen de las
+        'estadisticas' del esquema cuando las hay y, si no, de un PerfilColumna sobre
+        FILAS_PERFIL_PROBLEMAS filas repartidas; lo demás se mide en una muestra
+        repartida de FILAS_MUESTRA_PROBLEMAS filas. Cada problema incluye 'proporcion', 'muestras' (valores no
+        nulos evaluados) y 'confianza' (cota inferior de la proporción al 95%).
+        """
         problemas = []
+        if len(df) > FILAS_MUESTRA_PROBLEMAS:
+            df = df.iloc[_posiciones_repartidas(len(df), FILAS_MUESTRA_PROBLEMAS)]
+        
+        def reportar(col_original, categoria, proporcion, muestras, problema, sugerencia, **extra):
+            if sugerencia is not None and proporcion < UMBRALES_PROBLEMAS[categoria]:
+                return
+            problemas.append({
+                'columna': col_original,
+                'problema': problema,
+                'sugerencia': sugerencia,
+                'categoria': categoria,
+                'proporcion': proporcion,
+                'muestras': muestras,
+                'confianza': confianza_proporcion(proporcion, muestras),
+                **extra
+            })
         
         for col_limpio, info in esquema.items():
             col_original = info['columna_original']
             tipo_detectado = info['tipo']
+            serie = df[col_original]
             
-            # Obtener muestra de datos sin nulos
-            muestra = df[col_original].dropna()
-            if len(muestra) == 0:
+            # Contadores del esquema (columna completa o muestra del archivo) o de la muestra
+            perfil = PerfilColumna()
+            if info.get('estadisticas'):
+                for contador, valor in info['estadisticas'].items():
+                    setattr(perfil, contador, valor)
+            else:
+                perfil.observar(_sondeo(serie, FILAS_PERFIL_PROBLEMAS))
+            if perfil.validos == 0:
                 continue
             
-            # PROBLEMA 1: Números grandes interpretados como texto
-            if tipo_detectado == 'TEXT':
-                # Verificar si contiene números que podrían ser enteros
-                muestra_str = muestra.astype(str)
-                numeros_detectados = 0
-                for valor in muestra_str.head(20):  # Revisar primeros 20
-                    if valor.replace('.', '').replace('-', '').isdigit():
-                        numeros_detectados += 1
-                
-                if numeros_detectados > len(muestra_str.head(20)) * 0.7:  # 70% son números
-                    problemas.append({
-                        'columna': col_original,
-                        'problema': 'Números detectados como TEXT - posible INTEGER/REAL',
-                        'sugerencia': 'INTEGER',  # Cambié tipo_sugerido por sugerencia
-                        'categoria': 'numeros_como_texto'
-                    })
-            
-            # PROBLEMA 2: Fechas no detectadas (campos de texto que parecen fechas)
+            # PROBLEMA 1: Números interpretados como texto (con separadores US o EU, como los convierte _a_real)
+            if tipo_detectado == 'TEXT' and not info['es_fecha'] and perfil.reales:
+                sugerencia = 'INTEGER' if perfil.enteros == perfil.reales else 'REAL'
+                proporcion = perfil.proporcion('reales')
+                reportar(col_original, 'numeros_como_texto', proporcion, perfil.validos,
+                         f"{proporcion:.0%} números detectados como TEXT - posible {sugerencia}", sugerencia)
+            
+            # PROBLEMA 2: Fechas no detectadas (texto cuyos valores se leen como fecha)
             if tipo_detectado == 'TEXT' and not info['es_fecha']:
-                # Buscar patrones de fecha en el nombre de columna
-                col_lower = col_original.lower()
-                if any(patron in col_lower for patron in ['fecha', 'date', 'time', 'created', 'updated']):
-                    problemas.append({
-                        'columna': col_original,
-                        'problema': 'Posible fecha no detectada - revisar formato',
-                        'sugerencia': 'DATE',  # Cambié tipo_sugerido por sugerencia
-                        'categoria': 'fecha_no_detectada'
-                    })
-            
-            # PROBLEMA 3: Campos mixtos (enteros y decimales mezclados)
-            if tipo_detectado == 'REAL':
-                # Verificar si todos los valores son enteros
-                valores_enteros = 0
-                for valor in muestra.head(20):
-                    if pd.notna(valor) and float(valor).is_integer():
-                        valores_enteros += 1
-                
-                if valores_enteros == len(muestra.head(20)):
-                    problemas.append({
-                        'columna': col_original,
-                        'problema': 'Todos los valores son enteros - considerar INTEGER',
-                        'sugerencia': 'INTEGER',  # Cambié tipo_sugerido por sugerencia
-                        'categoria': 'real_podria_ser_integer'
-                    })
+                proporcion, muestras, formato = _proporcion_fechas(serie)
+                if formato:
+                    sugerencia = 'DATETIME' if '%H' in formato else 'DATE'
+                    reportar(col_original, 'fecha_no_detectada', proporcion, muestras,
+                             f"{proporcion:.0%} valores con formato {formato} - posible fecha no detectada",
+                             sugerencia, formato_fecha=formato)
+            
+            # PROBLEMA 2b: Fechas cuya muestra admite dd/mm y mm/dd
+            if info.get('fecha_ambigua'):
+                proporcion, muestras = _proporcion_fecha_ambigua(_sondeo(serie), info.get('formato_fecha'))
+                reportar(col_original, 'fecha_ambigua', proporcion, muestras,
+                         f"Fecha ambigua (dd/mm o mm/dd) - se asume {info.get('formato_fecha')}", None)
+            
+            # PROBLEMA 3: Campos REAL en los que todos los valores son enteros
+            if tipo_detectado in TIPOS_REAL:
+                proporcion = perfil.proporcion('enteros')
+                reportar(col_original, 'real_podria_ser_integer', proporcion, perfil.validos,
+                         f"{proporcion:.0%} valores enteros - considerar INTEGER", 'INTEGER')
             
             # PROBLEMA 4: Campos que podrían ser BOOLEAN
             if tipo_detectado in ['TEXT', 'INTEGER']:
-                valores_unicos = set(muestra.astype(str).str.lower().unique()[:10])
-                if valores_unicos.issubset({'0', '1', 'true', 'false', 'yes', 'no', 'si', 'no', 't', 'f'}):
-                    problemas.append({
-                        'columna': col_original,
-                        'problema': 'Valores binarios detectados - considerar BOOLEAN',
-                        'sugerencia': 'BOOLEAN',  # Cambié tipo_sugerido por sugerencia
-                        'categoria': 'posible_boolean'
-                    })
+                proporcion = perfil.proporcion('booleanos')
+                reportar(col_original, 'posible_boolean', proporcion, perfil.validos,
+                         f"{proporcion:.0%} valores binarios - considerar BOOLEAN", 'BOOLEAN')
         
         return problemas
     
+    def esquema_recordado(self, df):
+        """Esquema guardado para el encabezado de ``df`` (con tipos forzados) o None"""
+        if not self.reutilizar_esquemas:
+            return None
+        esquema = buscar_esquema(list(df.columns), self.ruta_cache_esquemas)
+        return self.aplicar_tipos_forzados(esquema) if esquema else None
+    
+    def _recordar_esquema(self, esquema, nombre_tabla):
+        """Guarda el esquema confirmado por el usuario para los próximos archivos con este encabezado
+        
+        La carga ya terminó: si el archivo de esquemas no se puede escribir solo se avisa.
+        """
+        if not self.guardar_esquemas:
+            return
+        try:
+            guardar_esquema(esquema, nombre_tabla, self.ruta_cache_esquemas)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el esquema en {ruta_cache(self.ruta_cache_esquemas)}: {e}")
+    
+    def _anotar_uso_esquema(self, columnas):
+        """Cuenta un uso del esquema guardado de este encabezado (tras una carga que lo usó)"""
+        if self.reutilizar_esquemas:
+            registrar_uso(list(columnas), self.ruta_cache_esquemas)
+    
+    def _nueva_medicion(self, archivo, nombre_tabla):
+        """Medición por etapas de la carga que empieza, con la configuración que la afecta"""
+        medicion = MedicionCarga(archivo, nombre_tabla, self.callback_metricas)
+        medicion.configuracion = {
+            'modo_carga': self.modo_carga,
+            'perfil_carga': self.perfil_carga,
+            'tamano_chunk': self.tamano_chunk,
+            'presupuesto_memoria_mb': self.presupuesto_memoria_mb,
+            'intervalo_commit': self.intervalo_commit,
+            'workers_conversion': self.workers_conversion,
+            'muestreo_tipos': self.muestreo_tipos,
+            'capacidad_pipeline': self.capacidad_pipeline,
+        }
+        return medicion
+    
+    def _guardar_medicion(self, bd_destino):
+        """Cierra la medición de la carga y agrega su resumen a _etl_runs
+        
+        Un fallo al guardar solo se avisa: nunca convierte una carga correcta en error.
+        """
+        medicion, self._medicion = self._medicion, None
+        if medicion is None:
+            return
+        medicion.finalizar('cancelada')  # Sin estado final: la carga se cortó al cancelar
+        self.ultima_medicion = medicion.resumen()
+        
+        if not self.registrar_ejecuciones or not bd_destino or not os.path.exists(bd_destino):
+            return
+        try:
+            conn = sqlite3.connect(bd_destino, timeout=30)
+            try:
+                registrar_ejecucion(conn, self.ultima_medicion)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"⚠️ No se pudo guardar la medición en {TABLA_EJECUCIONES}: {e}")
+    
     def _continuar_despues_correccion(self, aplicar_cambios, esquema_resultado):
         """Continúa el procesamiento después de que el usuario termine la corrección de tipos"""
+        lotes_restantes = None
+        bd_destino = None
+        if self._medicion is not None:
+            self._medicion.terminar_espera()
         try:
             # Recuperar datos guardados
             datos = self._datos_pendientes
             df_original = datos['df_original']
-            df_final = datos['df_final']
+            lotes_restantes = datos['lotes_restantes']
             bd_destino = datos['bd_destino']
             nombre_tabla = datos['nombre_tabla']
+            archivo_info = datos['archivo_info']
             # NO usar la conexión anterior - crear nueva en este hilo
             esquema_inicial = datos['esquema_inicial']
             
@@ -315,10 +1086,7 @@ class DataProcessor:
                 pass  # Ignorar errores al cerrar
             
             # Crear NUEVA conexión en el hilo correcto
-            conn = sqlite3.connect(bd_destino)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
+            conn = self._conectar(bd_destino)
             
             # Determinar esquema final
             if aplicar_cambios:
@@ -330,84 +1098,395 @@ class DataProcessor:
 
             self.callback_progreso(0.5, "📋 Creando esquema de tabla...")
             
-            # Crear tabla con esquema apropiado (usar esquema personalizado)
+            # Crear tabla staging (o preparar la tabla para upsert) con esquema apropiado
             esquema = esquema_personalizado
-            sql_create = f"CREATE TABLE IF NOT EXISTS {nombre_tabla} (\n"
-            columnas_sql = []
-            for col_limpio, info in esquema.items():
-                columnas_sql.append(f"    {col_limpio} {info['tipo']}")
-            sql_create += ",\n".join(columnas_sql) + "\n)"
-            
-            conn.execute(f"DROP TABLE IF EXISTS {nombre_tabla}")
-            conn.execute(sql_create)
-            conn.commit()
+            with self._medicion.etapa('creacion_tabla'):
+                tabla_destino = self._preparar_tabla_destino(conn, nombre_tabla, esquema, df_original)
             
             if self.cancelado:
-                conn.close()
+                self._cerrar_conexion(conn)
                 return
             
             self.callback_progreso(0.6, "📊 Insertando datos...")
             
-            # ✅ Reconstruir valores según el esquema elegido
-            df_para_insert = self.aplicar_esquema_a_df(df_original, esquema_personalizado)
-            
-            # Preparar datos para inserción
-            datos_insercion = []
-            for _, fila in df_para_insert.iterrows():
-                fila_limpia = []
-                for col_limpio, info in esquema.items():
-                    valor_original = fila[info['columna_original']]
-                    
-                    if pd.isna(valor_original):
-                        fila_limpia.append(None)
-                    else:
-                        fila_limpia.append(valor_original)
-                
-                datos_insercion.append(tuple(fila_limpia))
-                
-                if self.cancelado:
-                    conn.close()
-                    return
+            # Motor de inserción: sentencia preparada + executemany en una transacción
+            motor = self._crear_motor(conn, tabla_destino, esquema)
+            columnas_origen = [info['columna_original'] for info in esquema.values()]
             
-            # Insertar por lotes
-            columnas_limpias = list(esquema.keys())
-            placeholders = ", ".join(["?" for _ in columnas_limpias])
-            sql_insert = f"INSERT INTO {nombre_tabla} ({', '.join(columnas_limpias)}) VALUES ({placeholders})"
+            # El primer lote ya está en memoria; en modo streaming el resto se lee del archivo
+            lotes = self._encadenar_lotes(df_original, datos['fraccion_leida'], lotes_restantes)
+            del df_original
+            self._datos_pendientes = None
             
-            # Procesar en lotes de 1000
-            chunk_size = 1000
-            total_filas = len(datos_insercion)
+            fraccion_previa = 0.0
+            with self._pipeline_carga(lotes, esquema_personalizado) as etapas:
+                # El lote siguiente se lee y convierte mientras se inserta el actual
+                for df_para_insert, fraccion in etapas:
+                    informar = self._callback_insercion(
+                        motor, 0.6 + 0.3 * fraccion_previa, 0.6 + 0.3 * fraccion, len(df_para_insert)
+                    )
+                    if not self._insertar_lote(motor, df_para_insert, columnas_origen, informar,
+                                               fraccion - fraccion_previa):
+                        break
+                    
+                    fraccion_previa = fraccion
             
-            for i in range(0, total_filas, chunk_size):
-                if self.cancelado:
-                    conn.close()
-                    return
-                
-                chunk = datos_insercion[i:i + chunk_size]
-                conn.executemany(sql_insert, chunk)
-                conn.commit()
-                
-                # Actualizar progreso
-                progreso = 0.6 + (0.3 * (i + len(chunk)) / total_filas)
-                self.callback_progreso(progreso, f"📊 Insertando: {i + len(chunk):,}/{total_filas:,} filas")
+            if self.cancelado:
+                self._cerrar_conexion(conn)
+                return
             
-            conn.close()
+            with self._medicion.etapa('publicacion'):
+                motor.finalizar()
+                total_filas = motor.filas_insertadas
+                
+                if self._claves_incrementales is None:
+                    # Reemplazar la tabla destino por la staging en una transacción corta
+                    self._publicar_staging(conn, nombre_tabla)
+                    info_incremental = ""
+                else:
+                    info_incremental = self._resumen_incremental(conn, nombre_tabla, total_filas)
+                registrar_carga(conn, archivo_info, nombre_tabla, esquema, total_filas,
+                                self._parametros_carga(), self._claves_incrementales is None)
+            self._cerrar_conexion(conn)
+            self._medicion.filas = total_filas
+            self._medicion.finalizar('ok')
+            if aplicar_cambios:
+                self._recordar_esquema(esquema, nombre_tabla)
             
             # Éxito
-            self.callback_completado(True, "Carga completada exitosamente", total_filas)
+            self.callback_completado(
+                True,
+                f"Carga completada exitosamente ({motor.filas_por_segundo:,.0f} filas/seg){info_incremental}"
+                f"\n{self._medicion.texto_etapas()}\n{self._medicion.texto_memoria()}",
+                total_filas
+            )
             
         except Exception as e:
+            if self._medicion is not None:
+                self._medicion.finalizar('error', str(e))
             if 'conn' in locals():
-                conn.close()
+                self._cerrar_conexion(conn)
             self.callback_completado(False, f"Error en carga: {str(e)}")
+        finally:
+            # Liberar el archivo si la lectura por lotes quedó a medias
+            if lotes_restantes is not None:
+                lotes_restantes.close()
+            self.cerrar_pool_conversion()
+            self._guardar_medicion(bd_destino)
+    
+    def _muestra_memoria(self, archivo):
+        """Filas de muestra para medir la memoria por fila (repartidas por el CSV si se puede)"""
+        if archivo.lower().endswith('.csv'):
+            try:
+                return muestra_repartida_csv(archivo, FILAS_MUESTRA_MEMORIA)
+            except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError):
+                return pd.read_csv(archivo, nrows=FILAS_MUESTRA_MEMORIA)
+        if es_excel_streaming(archivo):
+            return leer_excel(archivo, nrows=FILAS_MUESTRA_MEMORIA)
+        return marcar_origen_excel(pd.read_excel(archivo, nrows=FILAS_MUESTRA_MEMORIA))
+    
+    def _lotes_en_vuelo(self):
+        """Lotes que conviven en el pipeline: los de las dos colas y los que se leen, convierten e insertan"""
+        return 2 * self.capacidad_pipeline + 3
+    
+    def dimensionar_lotes(self, archivo):
+        """Filas por lote de lectura para esta carga (y por bloque de inserción)
+        
+        Sin presupuesto_memoria_mb se usa tamano_chunk tal cual. Con presupuesto se miden
+        los bytes por fila de una muestra: un archivo angosto lee lotes grandes y uno ancho
+        con mucho texto, lotes pequeños.
+        """
+        self._filas_por_bloque = None
+        if not self.presupuesto_memoria_mb:
+            return self.tamano_chunk
+        
+        muestra = self._muestra_memoria(archivo)
+        if len(muestra) == 0:
+            return LOTE_MINIMO
+        bytes_por_fila = max(muestra.memory_usage(index=False, deep=True).sum() / len(muestra), 1.0)
+        presupuesto = self.presupuesto_memoria_mb * 1024 * 1024
+        
+        # Cada fila del bloque es una tupla con un objeto de Python por valor (~32 bytes más
+        # que en una columna numpy); el texto ya está contado en bytes_por_fila
+        bytes_por_tupla = bytes_por_fila + 56 + 32 * len(muestra.columns)
+        self._filas_por_bloque = max(int(presupuesto * FRACCION_PRESUPUESTO_INSERCION / bytes_por_tupla), 1)
+        
+        filas = presupuesto * (1 - FRACCION_PRESUPUESTO_INSERCION) / (bytes_por_fila * COPIAS_POR_LOTE * self._lotes_en_vuelo())
+        tamano_lote = int(min(max(filas, LOTE_MINIMO), LOTE_MAXIMO))
+        
+        if self._medicion is not None:
+            self._medicion.configuracion.update(
+                tamano_chunk=tamano_lote, filas_por_bloque=self._filas_por_bloque, bytes_por_fila=round(bytes_por_fila)
+            )
+        return tamano_lote
+    
+    def iterar_lotes(self, archivo, tamano_lote=None, hoja=0):
+        """Lee el archivo por lotes y devuelve tuplas (lote, fracción del archivo ya leída)
+        
+        Sin tamaño de lote el archivo se lee completo en un único lote. ``hoja``
+        (índice o nombre) solo aplica a Excel.
+        """
+        if archivo.lower().endswith('.csv'):
+            if not tamano_lote:
+                yield pd.read_csv(archivo), 1.0
+                return
+            
+            # Leer desde un handle propio para estimar el avance por bytes leídos
+            tamano_archivo = os.path.getsize(archivo) or 1
+            with open(archivo, 'rb') as f:
+                with pd.read_csv(f, chunksize=tamano_lote) as lector:
+                    for lote in lector:
+                        yield lote, min(f.tell() / tamano_archivo, 1.0)
+        elif es_excel_streaming(archivo):
+            # openpyxl en modo read-only: el libro nunca se carga completo en memoria
+            yield from iterar_excel(archivo, tamano_lote, hoja=hoja)
+        else:
+            # .xls antiguo: pd.read_excel no lee por bloques, se trocea el DataFrame ya cargado
+            df = marcar_origen_excel(pd.read_excel(archivo, sheet_name=hoja))
+            if not tamano_lote or len(df) == 0:
+                yield df, 1.0
+                return
+            
+            for inicio in range(0, len(df), tamano_lote):
+                yield df.iloc[inicio:inicio + tamano_lote], min((inicio + tamano_lote) / len(df), 1.0)
+    
+    def _parametros_carga(self, hojas=None):
+        """Huella de las opciones de carga que se guarda en el manifiesto junto al archivo"""
+        return huella_parametros(self.modo_carga, self.columnas_clave, self.tipos_forzados, hojas)
+    
+    def _buscar_carga_previa(self, bd_destino, archivo_info, nombre_tabla, hojas=None):
+        """Consulta el manifiesto de la base destino sin aplicar los PRAGMAs de carga"""
+        if not os.path.exists(bd_destino):
+            return None
+        
+        conn = sqlite3.connect(bd_destino)
+        try:
+            return buscar_carga_previa(conn, archivo_info, nombre_tabla, self._parametros_carga(hojas))
+        finally:
+            conn.close()
+    
+    def _conectar(self, bd_destino):
+        """Abre la base destino aplicando los PRAGMAs del perfil de carga seleccionado"""
+        if self.perfil_carga not in PERFILES_SQLITE:
+            raise ValueError(f"Perfil de carga desconocido: {self.perfil_carga}")
+        
+        conn = sqlite3.connect(bd_destino)
+        for pragma, valor in PERFILES_SQLITE[self.perfil_carga].items():
+            conn.execute(f"PRAGMA {pragma}={valor}")
+        return conn
+    
+    def _cerrar_conexion(self, conn):
+        """Cierra la conexión descartando lo no confirmado
+        
+        Si el perfil desactivó la durabilidad, antes de cerrar se vuelve a WAL con
+        los PRAGMAs del perfil seguro y se hace checkpoint del archivo.
+        """
+        try:
+            conn.rollback()
+        except sqlite3.ProgrammingError:
+            return  # Ya estaba cerrada
+        
+        restaurar_wal = self.perfil_carga != 'seguro'
+        ruta_bd = conn.execute("PRAGMA database_list").fetchone()[2]
+        try:
+            if self._tabla_staging:
+                # Carga cancelada o fallida: la tabla anterior queda intacta
+                conn.execute(f"DROP TABLE IF EXISTS {self._tabla_staging}")
+                conn.commit()
+                self._tabla_staging = None
+            
+            if restaurar_wal:
+                conn.execute("PRAGMA locking_mode=NORMAL")
+                for pragma, valor in PERFILES_SQLITE['seguro'].items():
+                    conn.execute(f"PRAGMA {pragma}={valor}")
+        finally:
+            conn.close()
+        
+        if restaurar_wal and ruta_bd:
+            # Tras un RENAME en modo exclusivo el checkpoint falla en la misma conexión
+            # ("database table is locked"): se hace desde una conexión nueva
+            conn_checkpoint = sqlite3.connect(ruta_bd)
+            try:
+                conn_checkpoint.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            finally:
+                conn_checkpoint.close()
+    
+    def _crear_tabla_staging(self, conn, nombre_tabla, esquema):
+        """Crea la tabla staging donde se inserta antes de reemplazar la tabla destino"""
+        tabla_staging = f"{nombre_tabla}__staging"
+        
+        sql_create = f"CREATE TABLE {tabla_staging} (\n"
+        columnas_sql = []
+        for col_limpio, info in esquema.items():
+            columnas_sql.append(f"    {col_limpio} {info['tipo']}")
+        sql_create += ",\n".join(columnas_sql) + "\n)"
+        
+        conn.execute(f"DROP TABLE IF EXISTS {tabla_staging}")
+        conn.execute(sql_create)
+        conn.commit()
+        self._tabla_staging = tabla_staging
+        return tabla_staging
+    
+    def _publicar_staging(self, conn, nombre_tabla):
+        """Reemplaza la tabla destino por la staging con DROP + RENAME en una sola transacción
+        
+        En WAL los lectores siguen viendo la versión anterior hasta el COMMIT.
+        """
+        self.callback_progreso(0.95, "🔁 Publicando tabla...")
+        
+        # Sin esto, las vistas que apuntan a la tabla destino hacen fallar el RENAME tras el DROP
+        conn.execute("PRAGMA legacy_alter_table=ON")
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(f"DROP TABLE IF EXISTS {nombre_tabla}")
+            conn.execute(f"ALTER TABLE {self._tabla_staging} RENAME TO {nombre_tabla}")
+            conn.commit()
+            self._tabla_staging = None
+        finally:
+            conn.execute("PRAGMA legacy_alter_table=OFF")
+    
+    def _preparar_tabla_destino(self, conn, nombre_tabla, esquema, df_muestra):
+        """Devuelve la tabla donde insertar: la staging o, en modo incremental, la propia destino"""
+        self._claves_incrementales = None
+        if self.modo_carga == 'reemplazar':
+            return self._crear_tabla_staging(conn, nombre_tabla, esquema)
+        if self.modo_carga != 'incremental':
+            raise ValueError(f"Modo de carga desconocido: {self.modo_carga}")
+        
+        claves = self._resolver_columnas_clave(df_muestra, esquema)
+        
+        existentes = [fila[1] for fila in conn.execute(f"PRAGMA table_info({nombre_tabla})")]
+        if not existentes:
+            columnas_sql = [f"    {col_limpio} {info['tipo']}" for col_limpio, info in esquema.items()]
+            columnas_sql.append(f"    {COLUMNA_HASH} INTEGER")
+            conn.execute(f"CREATE TABLE {nombre_tabla} (\n" + ",\n".join(columnas_sql) + "\n)")
+        else:
+            # Columnas nuevas del archivo: se añaden sin tocar las filas existentes
+            for col_limpio, info in esquema.items():
+                if col_limpio not in existentes:
+                    conn.execute(f"ALTER TABLE {nombre_tabla} ADD COLUMN {col_limpio} {info['tipo']}")
+            if COLUMNA_HASH not in existentes:
+                conn.execute(f"ALTER TABLE {nombre_tabla} ADD COLUMN {COLUMNA_HASH} INTEGER")
+        
+        # ON CONFLICT necesita un índice único sobre la clave
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{nombre_tabla}_clave ON {nombre_tabla} ({', '.join(claves)})"
+        )
+        conn.commit()
+        
+        self._conteo_inicial = (
+            conn.execute(f"SELECT count(*) FROM {nombre_tabla}").fetchone()[0], conn.total_changes
+        )
+        self._claves_incrementales = claves
+        return nombre_tabla
+    
+    def _resolver_columnas_clave(self, df_muestra, esquema):
+        """Traduce columnas_clave (nombres limpios u originales) o las infiere de la muestra"""
+        if not self.columnas_clave:
+            return inferir_columnas_clave(df_muestra, esquema)
+        
+        claves_solicitadas = [self.columnas_clave] if isinstance(self.columnas_clave, str) else self.columnas_clave
+        por_original = {str(info['columna_original']): col_limpio for col_limpio, info in esquema.items()}
+        claves = []
+        for clave in claves_solicitadas:
+            if clave in esquema:
+                claves.append(clave)
+            elif str(clave) in por_original:
+                claves.append(por_original[str(clave)])
+            else:
+                raise ValueError(f"La columna clave '{clave}' no existe en el archivo")
+        return claves
+    
+    def _crear_motor(self, conn, tabla_destino, esquema):
+        """Motor de inserción simple o, en modo incremental, con upsert por clave y hash"""
+        columnas = list(esquema.keys())
+        if self._claves_incrementales is None:
+            return MotorInsercion(conn, tabla_destino, columnas, self.intervalo_commit,
+                                  filas_por_bloque=self._filas_por_bloque)
+        
+        # Solo se reescriben las filas cuyo hash cambió; las idénticas no generan escritura
+        asignaciones = ", ".join(f"{col}=excluded.{col}" for col in columnas + [COLUMNA_HASH])
+        clausula = (
+            f"ON CONFLICT({', '.join(self._claves_incrementales)}) DO UPDATE SET {asignaciones} "
+            f"WHERE {tabla_destino}.{COLUMNA_HASH} IS NOT excluded.{COLUMNA_HASH}"
+        )
+        return MotorInsercion(conn, tabla_destino, columnas + [COLUMNA_HASH], self.intervalo_commit, clausula,
+                              self._filas_por_bloque)
+    
+    def _filas_lote(self, df_para_insert, columnas_origen):
+        """Tuplas a insertar; en modo incremental se añade el hash del contenido de la fila"""
+        # Con presupuesto de memoria cada tramo convierte a lo sumo un bloque de inserción
+        filas_por_tramo = self._filas_por_bloque or FILAS_POR_TRAMO
+        if self._claves_incrementales is None:
+            return filas_desde_dataframe(df_para_insert, columnas_origen, filas_por_tramo)
+        
+        hashes = pd.util.hash_pandas_object(df_para_insert[columnas_origen], index=False)
+        # SQLite guarda enteros con signo de 64 bits
+        df_con_hash = df_para_insert.assign(**{COLUMNA_HASH: hashes.to_numpy().view(np.int64)})
+        return filas_desde_dataframe(df_con_hash, columnas_origen + [COLUMNA_HASH], filas_por_tramo)
+    
+    def _resumen_incremental(self, conn, nombre_tabla, total_filas):
+        """Cuenta filas nuevas, actualizadas y sin cambios del upsert recién confirmado"""
+        filas_previas, cambios_previos = self._conteo_inicial
+        nuevas = conn.execute(f"SELECT count(*) FROM {nombre_tabla}").fetchone()[0] - filas_previas
+        cambios = conn.total_changes - cambios_previos
+        self.resumen_incremental = {
+            'nuevas': nuevas,
+            'actualizadas': cambios - nuevas,
+            'sin_cambios': total_filas - cambios,
+        }
+        self._claves_incrementales = None
+        return (f"\n🔄 Incremental: {nuevas:,} nuevas, {cambios - nuevas:,} actualizadas, "
+                f"{total_filas - cambios:,} sin cambios")
+    
+    def _callback_insercion(self, motor, progreso_inicio, progreso_fin, filas_lote):
+        """Traduce el avance del motor de inserción a la barra de progreso del lote actual"""
+        filas_previas = motor.filas_insertadas
+        
+        def informar(filas_insertadas):
+            parcial = (filas_insertadas - filas_previas) / filas_lote if filas_lote else 1.0
+            progreso = progreso_inicio + (progreso_fin - progreso_inicio) * parcial
+            self.callback_progreso(
+                progreso, f"📊 Insertando: {filas_insertadas:,} filas ({motor.filas_por_segundo:,.0f} filas/seg)"
+            )
+        
+        return informar
+    
+    def _insertar_lote(self, motor, df_para_insert, columnas_origen, informar, fraccion_lote):
+        """Inserta un lote convertido midiendo la etapa de inserción; False si se canceló"""
+        with self._medicion.etapa('insercion') as evento:
+            filas = self._filas_lote(df_para_insert, columnas_origen)
+            completo = motor.insertar(filas, informar, lambda: self.cancelado)
+            evento['filas'] = len(df_para_insert)
+            evento['bytes'] = int(fraccion_lote * self._medicion.bytes_archivo)
+        return completo
+    
+    def _pipeline_carga(self, lotes, esquema):
+        """Pipeline lectura (hilo) → conversión según el esquema (hilo) → inserción (hilo actual)"""
+        def convertir(item):
+            df_lote, fraccion = item
+            # ✅ Reconstruir valores según el esquema elegido
+            return self.aplicar_esquema_a_df(df_lote, esquema), fraccion
+        
+        return Pipeline(lotes, convertir, self.capacidad_pipeline, lambda: self.cancelado)
+    
+    def _encadenar_lotes(self, primer_lote, fraccion, lotes_restantes):
+        """Vuelve a anteponer el primer lote (ya leído para inferir el esquema) al resto"""
+        yield primer_lote, fraccion
+        # Soltar la referencia para que el primer lote no viva toda la carga
+        del primer_lote
+        yield from lotes_restantes
     
     def cargar_preview(self, archivo):
         """Carga una vista previa del archivo con formato normalizado"""
         try:
             if archivo.lower().endswith('.csv'):
                 df = pd.read_csv(archivo, nrows=100)
+            elif es_excel_streaming(archivo):
+                # Solo se parsean las primeras filas del libro
+                df = leer_excel(archivo, nrows=100)
             else:
-                df = pd.read_excel(archivo, nrows=100)
+                df = marcar_origen_excel(pd.read_excel(archivo, nrows=100))
             
             # Normalizar fechas y nulos
             df_normalizado, _ = self.normalizar_fechas(df)
@@ -417,34 +1496,103 @@ class DataProcessor:
         except Exception as e:
             raise Exception(f"Error al cargar vista previa: {str(e)}")
     
+    def fuente_vista_previa(self, archivo, hoja=0):
+        """Fuente paginada con todas las filas del archivo para la vista previa virtual
+        
+        Cada página se normaliza como en cargar_preview (fechas a ISO y nulos) con los
+        formatos de fecha inferidos una sola vez en las primeras filas. Los CSV se leen
+        como texto: se ve el valor tal como está en el archivo.
+        """
+        if archivo.lower().endswith('.csv'):
+            primeras = pd.read_csv(archivo, nrows=100, **OPCIONES_CSV_TEXTO)
+        elif es_excel_streaming(archivo):
+            primeras = leer_excel(archivo, nrows=100, hoja=hoja)
+        else:
+            primeras = marcar_origen_excel(pd.read_excel(archivo, nrows=100, sheet_name=hoja))
+        formatos = self.inferir_formatos_fecha(primeras)
+        
+        def normalizar(pagina):
+            pagina = pagina.copy(deep=False)
+            for col, (formato, _) in formatos.items():
+                try:
+                    pagina[col] = _a_fecha(pagina[col], 'DATE', formato)
+                except Exception:
+                    continue
+            return self.normalizar_nulos(pagina)
+        
+        if archivo.lower().endswith('.csv'):
+            return FuenteCSV(archivo, normalizar)
+        # Excel no permite saltar a una fila: los lotes se guardan a medida que se leen
+        return FuenteLotes(self.iterar_lotes(archivo, FILAS_LOTE_VISTA, hoja), primeras.columns, normalizar)
+    
     def procesar_archivo(self, archivo, bd_destino, nombre_tabla, callback_progreso, callback_completado, correccion_modo=None):
         """Procesa el archivo completo y lo carga a SQLite con formato normalizado
         
+        Con ``tamano_chunk`` definido el archivo se procesa en modo streaming: se lee,
+        normaliza, convierte e inserta un lote a la vez y el esquema se infiere del primero.
+        
         Args:
             correccion_modo: None/False=automático, "grafica"=ventana gráfica, "consola"=por consola
         """
         self.cancelado = False
         self.callback_progreso = callback_progreso
         self.callback_completado = callback_completado
+        lotes = None
+        esperando_correccion = False
+        self._medicion = self._nueva_medicion(archivo, nombre_tabla)
         
         try:
+            # Huella del archivo: si ya se cargó igual en esta tabla no hace falta leerlo
+            archivo_info = datos_archivo(archivo)
+            self._medicion.bytes_archivo = archivo_info['tamano']
+            if not self.forzar_recarga:
+                carga_previa = self._buscar_carga_previa(bd_destino, archivo_info, nombre_tabla)
+                if carga_previa:
+                    self._medicion.filas = carga_previa['filas']
+                    self._medicion.finalizar('sin_cambios')
+                    self.callback_progreso(1.0, "⏭️ Archivo sin cambios")
+                    self.callback_completado(
+                        True,
+                        f"Archivo sin cambios desde la carga del {carga_previa['fecha_carga']}: "
+                        f"se omitió la recarga ({carga_previa['filas']:,} filas en la tabla)",
+                        carga_previa['filas']
+                    )
+                    return
+            
             # Actualizar progreso
             self.callback_progreso(0.1, "📂 Leyendo archivo...")
             
-            # Leer archivo completo
-            if archivo.lower().endswith('.csv'):
-                df_original = pd.read_csv(archivo)
-            else:
-                df_original = pd.read_excel(archivo)
+            # Filas por lote: tamano_chunk o las que caben en el presupuesto de memoria
+            with self._medicion.etapa('lectura'):
+                tamano_lote = self.dimensionar_lotes(archivo)
+            
+            # Leer archivo completo (o solo el primer lote en modo streaming)
+            lotes = self._medicion.medir_lotes(self.iterar_lotes(archivo, tamano_lote), archivo_info['tamano'])
+            df_original, fraccion_leida = next(lotes)
             
             if self.cancelado:
                 return
             
-            self.callback_progreso(0.2, "🔧 Normalizando fechas y valores...")
-            
-            # Normalizar fechas y nulos
-            df_normalizado, columnas_fecha = self.normalizar_fechas(df_original)
-            df_final = self.normalizar_nulos(df_normalizado)
+            with self._medicion.etapa('inferencia') as evento:
+                evento['filas'] = len(df_original)
+                
+                # Encabezado conocido: el esquema confirmado la otra vez, sin inferir ni corregir
+                esquema_inicial = self.esquema_recordado(df_original)
+                columnas_recordadas = list(df_original.columns) if esquema_inicial else None
+                if esquema_inicial:
+                    self.callback_progreso(0.2, "🧠 Encabezado conocido: usando el esquema guardado...")
+                    correccion_modo = None
+                else:
+                    self.callback_progreso(0.2, "🔍 Detectando fechas y tipos...")
+                    
+                    # Esquema inferido una sola vez; fechas y nulos se normalizan al convertir cada lote
+                    # En streaming los tipos se validan contra todo el archivo, no solo el primer lote
+                    perfiles = None
+                    if tamano_lote and self.muestreo_tipos != 'desactivado':
+                        perfiles = self.perfilar_archivo(archivo, df_original, tamano_lote)
+                    esquema_inicial = self.aplicar_tipos_forzados(self.obtener_esquema_tabla(df_original, perfiles))
+            columnas_fecha = [info['columna_original'] for info in esquema_inicial.values() if info['es_fecha']]
+            fechas_ambiguas = [info['columna_original'] for info in esquema_inicial.values() if info.get('fecha_ambigua')]
             
             if self.cancelado:
                 return
@@ -452,22 +1600,16 @@ class DataProcessor:
             self.callback_progreso(0.3, "🗃️ Preparando base de datos...")
             
             # Conectar a SQLite
-            conn = sqlite3.connect(bd_destino)
-            conn.execute("PRAGMA journal_mode=WAL")
-            conn.execute("PRAGMA synchronous=NORMAL")
-            conn.execute("PRAGMA cache_size=10000")
+            conn = self._conectar(bd_destino)
             
             if self.cancelado:
-                conn.close()
+                self._cerrar_conexion(conn)
                 return
             
             # NUEVO: Corrección de tipos gráfica
             if correccion_modo == "grafica":
                 self.callback_progreso(0.35, "🎨 Abriendo ventana de corrección de tipos...")
                 
-                # Generar esquema inicial para corrección
-                esquema_inicial = self.obtener_esquema_tabla(df_original)
-                
                 # Importar y abrir ventana de corrección
                 try:
                     # La ventana se abrirá usando el callback configurado desde interface.py
@@ -478,110 +1620,117 @@ class DataProcessor:
                         # Preparar datos para continuar después
                         self._datos_pendientes = {
                             'df_original': df_original,
-                            'df_final': df_final,
+                            'lotes_restantes': lotes,  # Resto del archivo en modo streaming
+                            'fraccion_leida': fraccion_leida,
                             'bd_destino': bd_destino,
                             'nombre_tabla': nombre_tabla,
+                            'archivo_info': archivo_info,
                             # NO incluir conn - se creará nueva en el otro hilo
                             'esquema_inicial': esquema_inicial
                         }
+                        lotes = None  # La lectura la termina _continuar_despues_correccion
+                        
+                        # La medición sigue abierta hasta que termine _continuar_despues_correccion
+                        self._medicion.iniciar_espera()
                         
                         # Abrir ventana Y PARAR AQUÍ
                         self.callback_correccion_tipos(df_original, esquema_inicial, self._continuar_despues_correccion)
+                        esperando_correccion = True
                         
                         # Cerrar conexión original ya que se creará nueva en el callback
-                        conn.close()
+                        self._cerrar_conexion(conn)
                         return  # ← CRÍTICO: Parar aquí y esperar
                     else:
-                        esquema_personalizado = self.obtener_esquema_tabla(df_original)
+                        esquema_personalizado = esquema_inicial
                         
                 except ImportError:
                     print("⚠️ No se pudo cargar ventana gráfica, usando esquema automático")
-                    esquema_personalizado = self.obtener_esquema_tabla(df_original)
+                    esquema_personalizado = esquema_inicial
             else:
-                esquema_personalizado = self.obtener_esquema_tabla(df_original)
+                esquema_personalizado = esquema_inicial
 
             self.callback_progreso(0.4, "📋 Creando esquema de tabla...")
             
-            # Crear tabla con esquema apropiado (usar esquema personalizado si existe)
+            # Crear tabla staging (o preparar la tabla para upsert) con esquema apropiado
             esquema = esquema_personalizado
-            sql_create = f"CREATE TABLE IF NOT EXISTS {nombre_tabla} (\n"
-            columnas_sql = []
-            for col_limpio, info in esquema.items():
-                columnas_sql.append(f"    {col_limpio} {info['tipo']}")
-            sql_create += ",\n".join(columnas_sql) + "\n)"
-            
-            conn.execute(f"DROP TABLE IF EXISTS {nombre_tabla}")
-            conn.execute(sql_create)
+            with self._medicion.etapa('creacion_tabla'):
+                tabla_destino = self._preparar_tabla_destino(conn, nombre_tabla, esquema, df_original)
             
             if self.cancelado:
-                conn.close()
+                self._cerrar_conexion(conn)
                 return
             
-            self.callback_progreso(0.5, f"📊 Cargando {len(df_final):,} filas...")
+            self.callback_progreso(0.5, "📊 Cargando datos...")
             
-            # ✅ Reconstruir valores según el esquema elegido
-            df_para_insert = self.aplicar_esquema_a_df(df_original, esquema_personalizado)
-            
-            # Renombrar columnas para que coincidan con el esquema
-            df_para_cargar = df_para_insert.copy()
-            mapeo_columnas = {info['columna_original']: col_limpio 
-                            for col_limpio, info in esquema.items()}
-            df_para_cargar = df_para_cargar.rename(columns=mapeo_columnas)
-            
-            # CARGAR DATOS CON MANEJO SEGURO DE MUCHAS COLUMNAS
-            num_columnas = len(df_para_cargar.columns)
-            
-            # Ajustar chunk_size según número de columnas para evitar "too many SQL variables"
-            if num_columnas > 50:
-                chunk_size = 100  # Muy pocas filas para muchas columnas
-            elif num_columnas > 20:
-                chunk_size = 250  # Pocas filas para bastantes columnas
-            else:
-                chunk_size = 500  # Filas normales para pocas columnas
+            # Motor de inserción: sentencia preparada + executemany en una transacción
+            motor = self._crear_motor(conn, tabla_destino, esquema)
+            columnas_origen = [info['columna_original'] for info in esquema.values()]
             
-            total_chunks = len(df_para_cargar) // chunk_size + (1 if len(df_para_cargar) % chunk_size else 0)
+            # El primer lote ya está en memoria; en modo streaming el resto se lee del archivo
+            lotes_carga = self._encadenar_lotes(df_original, fraccion_leida, lotes)
+            del df_original
             
-            for i, chunk_start in enumerate(range(0, len(df_para_cargar), chunk_size)):
-                if self.cancelado:
-                    conn.close()
-                    return
-                
-                chunk_end = min(chunk_start + chunk_size, len(df_para_cargar))
-                chunk_df = df_para_cargar.iloc[chunk_start:chunk_end]
-                
-                # Cargar chunk de forma segura
-                try:
-                    chunk_df.to_sql(nombre_tabla, conn, if_exists='append', index=False)
-                except Exception as e:
-                    if "too many SQL variables" in str(e).lower():
-                        # Si aún hay error, usar mini-chunks
-                        for mini_start in range(0, len(chunk_df), 50):
-                            mini_end = min(mini_start + 50, len(chunk_df))
-                            mini_chunk = chunk_df.iloc[mini_start:mini_end]
-                            mini_chunk.to_sql(nombre_tabla, conn, if_exists='append', index=False)
-                    else:
-                        raise e
-                
-                # Actualizar progreso
-                progreso = 0.5 + (0.4 * (i + 1) / total_chunks)
-                self.callback_progreso(progreso, f"📊 Procesando lote {i+1:,} de {total_chunks:,}")
-                
-                time.sleep(0.01)  # Pequeña pausa para no bloquear UI
+            fraccion_previa = 0.0
+            with self._pipeline_carga(lotes_carga, esquema_personalizado) as etapas:
+                # El lote siguiente se lee y convierte mientras se inserta el actual
+                for df_para_insert, fraccion in etapas:
+                    informar = self._callback_insercion(
+                        motor, 0.5 + 0.4 * fraccion_previa, 0.5 + 0.4 * fraccion, len(df_para_insert)
+                    )
+                    if not self._insertar_lote(motor, df_para_insert, columnas_origen, informar,
+                                               fraccion - fraccion_previa):
+                        break
+                    
+                    fraccion_previa = fraccion
             
-            conn.close()
+            if self.cancelado:
+                self._cerrar_conexion(conn)
+                return
+            
+            with self._medicion.etapa('publicacion'):
+                motor.finalizar()
+                total_filas = motor.filas_insertadas
+                
+                if self._claves_incrementales is None:
+                    # Reemplazar la tabla destino por la staging en una transacción corta
+                    self._publicar_staging(conn, nombre_tabla)
+                    info_incremental = ""
+                else:
+                    info_incremental = self._resumen_incremental(conn, nombre_tabla, total_filas)
+                registrar_carga(conn, archivo_info, nombre_tabla, esquema, total_filas,
+                                self._parametros_carga(), self._claves_incrementales is None)
+            self._cerrar_conexion(conn)
+            self._medicion.filas = total_filas
+            self._medicion.finalizar('ok')
+            if self.tipos_forzados:
+                self._recordar_esquema(esquema, nombre_tabla)
+            if columnas_recordadas:
+                self._anotar_uso_esquema(columnas_recordadas)
             
             if not self.cancelado:
                 self.callback_progreso(1.0, "✅ ¡Carga completada!")
                 
                 # Información detallada del resultado
                 info_fechas = f"\n📅 Columnas de fecha normalizadas: {len(columnas_fecha)}" if columnas_fecha else ""
-                mensaje_detalle = f"Datos normalizados correctamente:{info_fechas}\n🔧 Valores nulos estandarizados\n📊 {len(df_final):,} filas procesadas"
+                if fechas_ambiguas:
+                    info_fechas += f"\n⚠️ Fechas ambiguas (dd/mm o mm/dd): {', '.join(map(str, fechas_ambiguas))}"
+                mensaje_detalle = f"Datos normalizados correctamente:{info_fechas}\n🔧 Valores nulos estandarizados\n📊 {total_filas:,} filas procesadas\n⚡ {motor.filas_por_segundo:,.0f} filas/seg{info_incremental}\n{self._medicion.texto_etapas()}\n{self._medicion.texto_memoria()}"
                 
-                self.callback_completado(True, mensaje_detalle, len(df_final))
+                self.callback_completado(True, mensaje_detalle, total_filas)
                 
         except Exception as e:
+            self._medicion.finalizar('error', str(e))
+            if 'conn' in locals():
+                self._cerrar_conexion(conn)
             if hasattr(self, 'callback_completado') and self.callback_completado:
                 self.callback_completado(False, str(e))
+        finally:
+            # Liberar el archivo si la lectura por lotes quedó a medias
+            if lotes is not None:
+                lotes.close()
+            self.cerrar_pool_conversion()
+            if not esperando_correccion:
+                self._guardar_medicion(bd_destino)
     
     def obtener_tablas_bd(self, bd_path):
         """Obtiene la lista de tablas en una base de datos"""
@@ -589,8 +1738,11 @@ class DataProcessor:
             conn = sqlite3.connect(bd_path)
             cursor = conn.cursor()
             
-            # Consultar tablas
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+            # Consultar tablas (sin las internas de SQLite, el manifiesto ni el historial de cargas)
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT IN (?, ?)",
+                (TABLA_MANIFIESTO, TABLA_EJECUCIONES)
+            )
             tablas = [row[0] for row in cursor.fetchall()]
             
             conn.close()
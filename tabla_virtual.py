@@ -0,0 +1,242 @@
+# tabla_virtual.py
+"""
+🪟 TREEVIEW VIRTUAL
+Muestra una fuente paginada (ver fuentes_vista.py) con tantos items como filas caben
+en pantalla: al desplazarse se reescriben los valores de esos mismos items
+"""
+import threading
+from tkinter import TclError, ttk
+
+# Milisegundos entre revisiones del total mientras la fuente sigue contando filas
+INTERVALO_VIGILANCIA = 250
+
+# Alto aproximado del encabezado del Treeview (la fila de títulos) en píxeles
+ALTO_ENCABEZADO = 32
+
+
+def cerrar_fuente_en(ejecutor, fuente):
+    """Cierra la fuente detrás de las lecturas en curso del ejecutor, sin bloquear Tk
+
+    Si el ejecutor ya se detuvo (la ventana se está cerrando), la cierra un hilo aparte.
+    """
+    try:
+        ejecutor.submit(fuente.cerrar)
+    except RuntimeError:
+        threading.Thread(target=fuente.cerrar, daemon=True).start()
+
+
+class TablaVirtual:
+    """Controla un ttk.Treeview y su barra vertical como una ventana sobre la fuente
+
+    La barra representa el total de filas de la fuente, no los items del Treeview.
+    ``al_actualizar`` (opcional) recibe la fuente cada vez que cambia su total.
+    Con ``ejecutor`` (un concurrent.futures.Executor) las páginas se leen fuera del
+    hilo de Tk: una sola lectura en curso y, al terminar, se pinta la última ventana
+    pedida. Sin ejecutor se leen en el momento (fuentes rápidas, como un DataFrame).
+    """
+
+    def __init__(self, tabla, barra_vertical, al_actualizar=None, ejecutor=None):
+        self.tabla = tabla
+        self.barra = barra_vertical
+        self.al_actualizar = al_actualizar
+        self.ejecutor = ejecutor
+        self.fuente = None
+        self.inicio = 0
+        self._items = []
+        self._total_mostrado = -1
+        self._refresco = None
+        self._vigilancia = None
+        self._en_curso = False
+
+        self.barra.configure(command=self._desde_barra)
+        self.tabla.configure(yscrollcommand=lambda *args: None)
+        self.tabla.bind("<Configure>", lambda e: self._programar_refresco())
+        self.tabla.bind("<MouseWheel>", self._rueda)
+        self.tabla.bind("<Button-4>", lambda e: self.desplazar(-3))
+        self.tabla.bind("<Button-5>", lambda e: self.desplazar(3))
+        for tecla, filas in (("<Up>", -1), ("<Down>", 1)):
+            self.tabla.bind(tecla, lambda e, filas=filas: self._tecla(filas))
+        self.tabla.bind("<Prior>", lambda e: self._tecla(-self.filas_visibles()))
+        self.tabla.bind("<Next>", lambda e: self._tecla(self.filas_visibles()))
+        self.tabla.bind("<Home>", lambda e: self._tecla(-self.inicio))
+        self.tabla.bind("<End>", lambda e: self._tecla(self._total()))
+
+    def mostrar(self, fuente):
+        """Reemplaza la fuente mostrada (cerrando la anterior) y vuelve al principio"""
+        self._cerrar_fuente()
+        self.fuente = fuente
+        self.inicio = 0
+        self._total_mostrado = -1
+        self._refrescar()
+        self._vigilar()
+
+    def limpiar(self):
+        """Deja la tabla vacía y sin fuente"""
+        self._cerrar_fuente()
+        self.tabla.delete(*self._items)
+        self._items = []
+        self.barra.set(0.0, 1.0)
+
+    def filas_visibles(self):
+        """Filas que caben en el alto actual del Treeview"""
+        estilo = self.tabla.cget("style") or "Treeview"
+        alto_fila = int(ttk.Style(self.tabla).lookup(estilo, "rowheight") or 20)
+        return max((self.tabla.winfo_height() - ALTO_ENCABEZADO) // alto_fila, 1)
+
+    def desplazar(self, filas):
+        """Mueve la ventana ``filas`` filas (negativo = hacia arriba)"""
+        # La selección es de un item, no de una fila: al desplazarse ya no marcaría la misma fila
+        self.tabla.selection_remove(*self.tabla.selection())
+        self._ir_a(self.inicio + filas)
+        return "break"
+
+    def _total(self):
+        return self.fuente.total if self.fuente is not None else 0
+
+    def _ir_a(self, inicio):
+        inicio = max(min(inicio, self._total() - self.filas_visibles()), 0)
+        if inicio != self.inicio:
+            self.inicio = inicio
+            self._programar_refresco()
+
+    def _desde_barra(self, accion, cantidad, unidad=None):
+        """Comando de la barra: 'moveto fracción' o 'scroll n units|pages'"""
+        if accion == "moveto":
+            self._ir_a(int(float(cantidad) * self._total()))
+        elif unidad == "pages":
+            self.desplazar(int(cantidad) * self.filas_visibles())
+        else:
+            self.desplazar(int(cantidad))
+
+    def _rueda(self, evento):
+        # Windows/macOS: múltiplos de 120 por muesca
+        return self.desplazar(-3 if evento.delta > 0 else 3)
+
+    def _tecla(self, filas):
+        """Flechas y avance de página: mueven la ventana cuando la selección llega al borde"""
+        seleccion = self.tabla.selection()
+        if seleccion and seleccion[0] in self._items and abs(filas) == 1:
+            posicion = self._items.index(seleccion[0]) + filas
+            if 0 <= posicion < len(self._items):
+                return None  # Dentro de la ventana: el Treeview mueve la selección
+            # En el borde la selección queda en su item y las filas pasan por debajo
+            self._ir_a(self.inicio + filas)
+        else:
+            self.desplazar(filas)
+        return "break"
+
+    def _programar_refresco(self):
+        """Agrupa varios desplazamientos seguidos (arrastre de la barra) en un solo refresco"""
+        if self._refresco is None:
+            self._refresco = self.tabla.after_idle(self._refrescar)
+
+    def _refrescar(self):
+        """Reescribe los items visibles con las filas [inicio, inicio + visibles)"""
+        self._refresco = None
+        if self.fuente is None:
+            return
+        if self.ejecutor is not None:
+            self._pedir_pagina()
+            return
+        self._pintar(self._leer_pagina(self.fuente, self.inicio, self.filas_visibles()))
+
+    @staticmethod
+    def _leer_pagina(fuente, inicio, cantidad):
+        """Filas de la página; si falla, el error queda en la fuente y devuelve None"""
+        try:
+            return fuente.filas(inicio, cantidad)
+        except Exception as e:
+            # Una página ilegible no debe cortar el bucle de Tk: el aviso lo muestra al_actualizar
+            fuente.error = str(e)
+            return None
+
+    def _pedir_pagina(self):
+        """Lee la ventana actual en el ejecutor (si ya hay una lectura en curso, espera a que termine)"""
+        if self._en_curso:
+            return
+        fuente, inicio, cantidad = self.fuente, self.inicio, self.filas_visibles()
+        try:
+            futuro = self.ejecutor.submit(self._leer_pagina, fuente, inicio, cantidad)
+        except RuntimeError:
+            return  # Ejecutor detenido: la ventana se está cerrando
+        self._en_curso = True
+
+        def entregar(futuro):
+            try:
+                self.tabla.after(0, lambda: self._recibir(fuente, inicio, cantidad, futuro.result()))
+            except (TclError, RuntimeError):
+                pass  # La ventana se cerró mientras se leía la página
+
+        futuro.add_done_callback(entregar)
+
+    def _recibir(self, fuente, inicio, cantidad, filas):
+        """Pinta una página leída en el ejecutor si sigue siendo la ventana visible"""
+        self._en_curso = False
+        if fuente is not self.fuente:
+            if self.fuente is not None:
+                self._pedir_pagina()  # Llegó tarde: la fuente cambió mientras se leía
+            return
+        if (inicio, cantidad) != (self.inicio, self.filas_visibles()):
+            # La ventana se movió durante la lectura: se pinta igual (mejor que nada) y se pide la nueva
+            self._pintar(filas, inicio)
+            self._pedir_pagina()
+            return
+        self._pintar(filas, inicio)
+
+    def _pintar(self, filas, inicio=None):
+        """Vuelca las filas en los items del Treeview y ajusta la barra"""
+        inicio = self.inicio if inicio is None else inicio
+        if filas is None:
+            filas = []
+            if self.al_actualizar:
+                self.al_actualizar(self.fuente)
+
+        # Reutilizar los items existentes; crear o borrar solo la diferencia
+        while len(self._items) < len(filas):
+            self._items.append(self.tabla.insert("", "end"))
+        if len(self._items) > len(filas):
+            self.tabla.delete(*self._items[len(filas):])
+            del self._items[len(filas):]
+        for i, (item, valores) in enumerate(zip(self._items, filas)):
+            tag = 'evenrow' if (inicio + i) % 2 == 0 else 'oddrow'
+            self.tabla.item(item, values=valores, tags=(tag,))
+
+        total = self._total()
+        if total:
+            self.barra.set(inicio / total, min((inicio + len(filas)) / total, 1.0))
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _vigilar(self):
+        """Mientras la fuente cuenta filas, actualiza la barra, el aviso y la ventana si hace falta"""
+        self._vigilancia = None
+        fuente = self.fuente
+        if fuente is None:
+            return
+        completo = fuente.completo  # Antes de leer el total: el último total ya está publicado
+        cambio = fuente.total != self._total_mostrado
+        if cambio:
+            # La ventana puede no estar llena todavía y la barra cambia de escala
+            self._total_mostrado = fuente.total
+            self._refrescar()
+        if not completo:
+            self._vigilancia = self.tabla.after(INTERVALO_VIGILANCIA, self._vigilar)
+        if self.al_actualizar and (cambio or completo):
+            self.al_actualizar(fuente)
+
+    def _cerrar_fuente(self):
+        """Cancela los refrescos pendientes y detiene la fuente actual"""
+        for pendiente in (self._refresco, self._vigilancia):
+            if pendiente is not None:
+                try:
+                    self.tabla.after_cancel(pendiente)
+                except TclError:
+                    pass
+        self._refresco = self._vigilancia = None
+        if self.fuente is not None:
+            if self.ejecutor is not None:
+                # Detrás de la lectura en curso, y sin bloquear Tk esperando al hilo que cuenta
+                cerrar_fuente_en(self.ejecutor, self.fuente)
+            else:
+                self.fuente.cerrar()
+            self.fuente = None
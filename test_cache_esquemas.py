@@ -0,0 +1,65 @@
+# test_cache_esquemas.py
+"""
+🧪 ESQUEMAS RECORDADOS
+Consultar un esquema guardado no escribe el archivo (lo leen a la vez los procesos de
+una carga múltiple); el uso se anota aparte y un fallo al anotarlo no corta la carga
+"""
+import os
+
+import pandas as pd
+
+from cache_esquemas import buscar_esquema, guardar_esquema, listar_esquemas, registrar_uso
+from processor import DataProcessor
+
+
+def _guardado(ruta):
+    df = pd.DataFrame({'id': [1, 2], 'nombre': ['a', 'b']})
+    esquema = DataProcessor().obtener_esquema_tabla(df)
+    guardar_esquema(esquema, 'clientes', ruta)
+    return list(df.columns)
+
+
+def test_buscar_no_escribe(tmp_path):
+    ruta = str(tmp_path / "esquemas.json")
+    columnas = _guardado(ruta)
+    with open(ruta, 'rb') as f:
+        antes = f.read()
+
+    assert buscar_esquema(columnas, ruta)['id']['tipo'] == 'INTEGER'
+    with open(ruta, 'rb') as f:
+        assert f.read() == antes
+    assert listar_esquemas(ruta)[0]['usos'] == 0
+
+
+def test_registrar_uso(tmp_path):
+    ruta = str(tmp_path / "esquemas.json")
+    columnas = _guardado(ruta)
+
+    assert registrar_uso(columnas, ruta)
+    assert not registrar_uso(['otra'], ruta)
+    assert listar_esquemas(ruta)[0]['usos'] == 1
+    assert os.listdir(tmp_path) == ["esquemas.json"]  # Sin temporales sueltos
+
+
+def test_registrar_uso_sin_poder_escribir(tmp_path):
+    # La carpeta del archivo es un archivo: no se puede escribir y el uso simplemente no se anota
+    bloqueo = tmp_path / "no_es_carpeta"
+    bloqueo.write_text("")
+    assert not registrar_uso(['id'], str(bloqueo / "esquemas.json"))
+
+
+def test_carga_con_esquema_recordado_anota_el_uso(tmp_path):
+    ruta = str(tmp_path / "esquemas.json")
+    archivo = tmp_path / "clientes.csv"
+    pd.DataFrame({'id': [1, 2], 'nombre': ['a', 'b']}).to_csv(archivo, index=False)
+    _guardado(ruta)
+
+    processor = DataProcessor()
+    processor.ruta_cache_esquemas = ruta
+    resultado = {}
+    processor.procesar_archivo(
+        str(archivo), str(tmp_path / "destino.db"), 'clientes', lambda *_: None,
+        lambda exito, mensaje, filas=None: resultado.update(exito=exito, mensaje=mensaje)
+    )
+    assert resultado['exito'], resultado['mensaje']
+    assert listar_esquemas(ruta)[0]['usos'] == 1
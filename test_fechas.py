@@ -0,0 +1,66 @@
+# test_fechas.py
+"""
+🧪 DETECCIÓN DE FECHAS EN COLUMNAS NUMÉRICAS
+Un número solo pasa a fecha como serial de Excel si viene de un libro y la columna
+se llama claramente como fecha: "ingreso" o "monto_alta" siguen siendo números.
+PerfilColumna cuenta como fecha solo lo que sigue el formato inferido
+"""
+import pandas as pd
+from openpyxl import Workbook
+
+from lector_excel import marcar_origen_excel
+from processor import FORMATO_SERIAL_EXCEL, DataProcessor, PerfilColumna
+
+
+def _numeros():
+    return pd.DataFrame({
+        'ingreso': [35000, 42000, 51000, 28000],
+        'monto_alta': [30000.5, 40000.0, 50000.25, 60000.0],
+        'fecha_alta': [45000, 45001, 45002, 45003],
+    })
+
+
+def test_csv_numerico_no_es_fecha():
+    assert DataProcessor().inferir_formatos_fecha(_numeros()) == {}
+
+
+def test_excel_solo_convierte_nombres_de_fecha():
+    formatos = DataProcessor().inferir_formatos_fecha(marcar_origen_excel(_numeros()))
+    assert formatos == {'fecha_alta': (FORMATO_SERIAL_EXCEL, False)}
+
+
+def test_libro_excel_conserva_montos(tmp_path):
+    archivo = tmp_path / "montos.xlsx"
+    libro = Workbook()
+    hoja = libro.active
+    df = _numeros()
+    hoja.append(list(df.columns))
+    for fila in df.itertuples(index=False):
+        hoja.append(list(fila))
+    libro.save(archivo)
+
+    processor = DataProcessor()
+    lote, _ = next(processor.iterar_lotes(str(archivo)))
+    esquema = processor.obtener_esquema_tabla(lote)
+    assert esquema['ingreso']['tipo'] == 'INTEGER'
+    assert not esquema['ingreso']['es_fecha']
+    assert esquema['monto_alta']['tipo'] == 'REAL'
+    assert not esquema['monto_alta']['es_fecha']
+    assert esquema['fecha_alta']['es_fecha']
+
+    convertido = processor.aplicar_esquema_a_df(lote, esquema)
+    assert list(convertido['ingreso']) == [35000, 42000, 51000, 28000]
+    assert convertido['fecha_alta'].iloc[0] == '2023-03-15'
+
+
+def test_perfil_cuenta_fechas_con_el_formato_inferido():
+    perfil = PerfilColumna(True, '%d/%m/%Y')
+    perfil.observar(pd.Series(['01/02/2020', '03/04/2021', '01/02/2020'], dtype=object))
+    assert perfil.fecha_segura
+    assert (perfil.fechas, perfil.enteros, perfil.largo_max) == (3, 0, 10)
+
+    # Los valores que no son fecha siguen contando como números
+    perfil.observar(pd.Series(['7', '2020-05-01'], dtype=object))
+    assert not perfil.fecha_segura
+    assert (perfil.fechas, perfil.enteros, perfil.reales) == (3, 1, 1)
+    assert perfil.tipo_sugerido() == 'TEXT'
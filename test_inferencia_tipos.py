@@ -0,0 +1,80 @@
+# test_inferencia_tipos.py
+"""
+🧪 INFERENCIA DE TIPOS CON SEPARADORES DECIMALES Y DE MILES
+PerfilColumna debe aceptar como REAL lo mismo que convierte _a_real (US 1,234.5 / EU 1.234,5)
+"""
+import pandas as pd
+
+from processor import DataProcessor, PerfilColumna, _a_real
+
+
+def _perfil(valores):
+    perfil = PerfilColumna()
+    perfil.observar(pd.Series(valores, dtype=object))
+    return perfil
+
+
+def test_decimales_eu_son_real():
+    perfil = _perfil(['2,5', '10,75', '0,1'])
+    assert perfil.reales == 3
+    assert perfil.tipo_sugerido() == 'REAL'
+
+
+def test_miles_y_decimales_eu_son_real():
+    perfil = _perfil(['1.234,5', '2.000,00', '15,10'])
+    assert perfil.reales == 3
+    assert perfil.tipo_sugerido() == 'REAL'
+
+
+def test_miles_us_son_real():
+    perfil = _perfil(['1,234.50', '2.5', '3,000.25'])
+    assert perfil.reales == 3
+    assert perfil.tipo_sugerido() == 'REAL'
+
+
+def test_conteo_coincide_con_la_conversion():
+    valores = ['1.234,5', '2,5', 'n/d', '7']
+    perfil = _perfil(valores)
+    assert perfil.reales == int(_a_real(pd.Series(valores)).notna().sum())
+    assert perfil.tipo_sugerido() == 'TEXT'
+
+
+def test_enteros_sin_separadores_siguen_siendo_integer():
+    assert _perfil(['1', '20', '300']).tipo_sugerido() == 'INTEGER'
+
+
+def test_identificador_largo_no_es_real():
+    assert _perfil(['12345678901234567890', '1,5']).tipo_sugerido() == 'TEXT'
+
+
+def test_esquema_con_decimales_eu():
+    df = pd.DataFrame({'precio eu': ['1.234,50', '2,5', '10,00'] * 5})
+    esquema = DataProcessor().obtener_esquema_tabla(df)
+    assert esquema['precio_eu']['tipo'] == 'REAL'
+    assert esquema['precio_eu']['ejemplo'] == 1234.5
+
+
+def test_problema_numeros_eu_como_texto():
+    # Sin perfiles (muestreo desactivado) la columna queda TEXT: la regla debe ofrecer REAL
+    processor = DataProcessor()
+    processor.muestreo_tipos = 'desactivado'
+    df = pd.DataFrame({'importe': ['1.234,50', '2.000,75', '15,10'] * 10})
+    esquema = processor.obtener_esquema_tabla(df)
+    assert esquema['importe']['tipo'] == 'TEXT'
+
+    problemas = processor.detectar_problemas_tipos(df, esquema)
+    assert [(p['categoria'], p['sugerencia'], p['proporcion']) for p in problemas] == [
+        ('numeros_como_texto', 'REAL', 1.0)
+    ]
+
+
+def test_problema_numeros_eu_con_valores_sueltos():
+    processor = DataProcessor()
+    df = pd.DataFrame({'importe': ['1.234,50'] * 40 + ['n/d']})
+    esquema = processor.obtener_esquema_tabla(df)
+    assert esquema['importe']['tipo'] == 'TEXT'
+
+    problemas = processor.detectar_problemas_tipos(df, esquema)
+    assert problemas[0]['categoria'] == 'numeros_como_texto'
+    assert problemas[0]['sugerencia'] == 'REAL'
+    assert problemas[0]['proporcion'] == 40 / 41
@@ -0,0 +1,87 @@
+# test_manifiesto.py
+"""
+🧪 RECARGAS OMITIDAS POR EL MANIFIESTO
+Un archivo sin cambios solo se omite si su carga sigue siendo lo que hay en la tabla
+y se pide con los mismos parámetros (modo, tipos forzados, hojas)
+"""
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from carga_multiple import CargadorMultiple
+from processor import DataProcessor
+
+
+@pytest.fixture
+def processor(tmp_path):
+    processor = DataProcessor()
+    processor.ruta_cache_esquemas = str(tmp_path / "esquemas.json")
+    return processor
+
+
+def _cargar(processor, archivo, bd, tabla):
+    resultado = {}
+    processor.procesar_archivo(
+        str(archivo), str(bd), tabla, lambda *_: None,
+        lambda exito, mensaje, filas=None: resultado.update(exito=exito, mensaje=mensaje)
+    )
+    assert resultado['exito'], resultado['mensaje']
+    return resultado['mensaje']
+
+
+def _filas(bd, tabla):
+    with sqlite3.connect(bd) as conn:
+        return conn.execute(f"SELECT * FROM {tabla} ORDER BY 1").fetchall()
+
+
+def test_no_omite_si_otro_archivo_reemplazo_la_tabla(processor, tmp_path):
+    bd = tmp_path / "destino.db"
+    a, b = tmp_path / "a.csv", tmp_path / "b.csv"
+    pd.DataFrame({'id': [1, 2, 3], 'valor': ['x', 'y', 'z']}).to_csv(a, index=False)
+    pd.DataFrame({'id': [7, 8], 'valor': ['p', 'q']}).to_csv(b, index=False)
+
+    _cargar(processor, a, bd, 't')
+    _cargar(processor, b, bd, 't')
+    mensaje = _cargar(processor, a, bd, 't')
+
+    assert "sin cambios" not in mensaje
+    assert _filas(bd, 't') == [(1, 'x'), (2, 'y'), (3, 'z')]
+
+    # Ahora sí: a.csv es la última carga de t y no cambió
+    assert "sin cambios" in _cargar(processor, a, bd, 't')
+
+
+def test_no_omite_si_cambian_los_tipos_forzados(processor, tmp_path):
+    bd = tmp_path / "destino.db"
+    a = tmp_path / "a.csv"
+    pd.DataFrame({'id': [1, 2, 3], 'codigo': [10, 20, 30]}).to_csv(a, index=False)
+
+    _cargar(processor, a, bd, 't')
+    processor.tipos_forzados = {'codigo': 'TEXT'}
+    assert "sin cambios" not in _cargar(processor, a, bd, 't')
+    with sqlite3.connect(bd) as conn:
+        tipos = {fila[1]: fila[2] for fila in conn.execute("PRAGMA table_info(t)")}
+    assert tipos['codigo'] == 'TEXT'
+
+
+def test_tabla_unida_no_omite_si_cambian_las_hojas(processor, tmp_path):
+    bd = tmp_path / "destino.db"
+    libro = tmp_path / "meses.xlsx"
+    with pd.ExcelWriter(libro) as escritor:
+        for hoja, valor in (("Ene", 1), ("Feb", 2), ("Mar 2024", 3)):
+            pd.DataFrame({'id': [valor], 'monto': [valor * 10]}).to_excel(escritor, sheet_name=hoja, index=False)
+
+    cargador = CargadorMultiple(processor, workers=1)
+    cargador.cargar_hojas(str(libro), str(bd), ["Ene", "Feb"], tabla_unida='u')
+    resultados = cargador.cargar_hojas(str(libro), str(bd), ["Ene", "Mar 2024"], tabla_unida='u')
+
+    assert all(r['exito'] for r in resultados)
+    assert not any("sin cambios" in r['mensaje'] for r in resultados)
+    with sqlite3.connect(bd) as conn:
+        hojas = sorted(fila[0] for fila in conn.execute("SELECT DISTINCT hoja FROM u"))
+    assert hojas == ["Ene", "Mar 2024"]
+
+    # Mismas hojas en otro orden: la tabla ya tiene lo mismo
+    resultados = cargador.cargar_hojas(str(libro), str(bd), ["Mar 2024", "Ene"], tabla_unida='u')
+    assert [r['mensaje'] for r in resultados] == ["⏭️ Archivo sin cambios"]
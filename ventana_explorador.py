@@ -0,0 +1,280 @@
+# ventana_explorador.py
+"""
+🗄️ VENTANA DEL EXPLORADOR DE TABLAS
+Lista las tablas de una base, sus estadísticas de columnas y sus filas paginadas por
+rowid. Todas las consultas corren en un hilo aparte: la ventana sigue respondiendo
+aunque la tabla tenga decenas de millones de filas o la base esté ocupada por una carga.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import TclError, messagebox, ttk
+
+import customtkinter as ctk
+
+from explorador_bd import estadisticas_columnas, resumen_tablas, texto_valor
+from fuentes_vista import FuenteSQLite
+from tabla_virtual import TablaVirtual, cerrar_fuente_en
+
+# Columnas de la lista de tablas y de las estadísticas: (clave, título, ancho)
+COLUMNAS_TABLAS = (
+    ('filas', "Filas", 110),
+    ('columnas', "Cols", 50),
+    ('fecha_carga', "Última carga", 140),
+    ('archivo', "Archivo", 200),
+)
+COLUMNAS_ESTADISTICAS = (
+    ('tipo', "Tipo", 80),
+    ('origen', "Columna original", 140),
+    ('indice', "Índice", 120),
+    ('nulos', "Nulos (muestra)", 110),
+    ('distintos', "Distintos", 90),
+    ('minimo', "Mínimo", 130),
+    ('maximo', "Máximo", 130),
+    ('ejemplo', "Ejemplo", 160),
+)
+
+
+class VentanaExplorador:
+    def __init__(self, parent, bd):
+        self.parent = parent
+        self.bd = bd
+        self.tabla_actual = None
+        self.cerrada = False
+
+        # Un único hilo: las consultas (listado, estadísticas y páginas) se atienden en orden
+        self.ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explorador-bd")
+
+        self.ventana = ctk.CTkToplevel(parent)
+        self.ventana.title(f"🗄️ Explorador de tablas - {bd}")
+        self.ventana.geometry("1300x800")
+        self.ventana.transient(parent)
+
+        # ✅ Cerrar con X libera el hilo y la conexión de la tabla abierta
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+
+        self.setup_ui()
+        self.actualizar_tablas()
+
+    def setup_ui(self):
+        self.ventana.grid_columnconfigure(1, weight=1)
+        self.ventana.grid_rowconfigure(1, weight=1)
+
+        # Header
+        header_frame = ctk.CTkFrame(self.ventana)
+        header_frame.grid(row=0, column=0, columnspan=2, sticky="ew", padx=10, pady=(10, 5))
+
+        ctk.CTkLabel(
+            header_frame,
+            text=f"🗄️ {self.bd}",
+            font=ctk.CTkFont(size=16, weight="bold")
+        ).pack(side="left", padx=10, pady=8)
+
+        ctk.CTkButton(
+            header_frame,
+            text="🔄 Actualizar",
+            command=self.actualizar_tablas,
+            width=120,
+            height=32
+        ).pack(side="right", padx=10, pady=8)
+
+        self.lbl_estado = ctk.CTkLabel(header_frame, text="", font=ctk.CTkFont(size=12))
+        self.lbl_estado.pack(side="left", padx=10)
+
+        # Lista de tablas (izquierda)
+        tablas_frame = ctk.CTkFrame(self.ventana)
+        tablas_frame.grid(row=1, column=0, sticky="nsew", padx=(10, 5), pady=(5, 10))
+        tablas_frame.grid_rowconfigure(1, weight=1)
+        tablas_frame.grid_columnconfigure(0, weight=1)
+
+        ctk.CTkLabel(
+            tablas_frame,
+            text="📋 Tablas",
+            font=ctk.CTkFont(size=14, weight="bold")
+        ).grid(row=0, column=0, sticky="w", padx=10, pady=5)
+
+        self.lista_tablas = self._crear_treeview(tablas_frame, 1, "Tabla", 160, COLUMNAS_TABLAS, height=25)
+        self.lista_tablas.bind("<<TreeviewSelect>>", lambda e: self.seleccionar_tabla())
+
+        # Estadísticas y filas de la tabla seleccionada (derecha)
+        detalle_frame = ctk.CTkFrame(self.ventana)
+        detalle_frame.grid(row=1, column=1, sticky="nsew", padx=(5, 10), pady=(5, 10))
+        detalle_frame.grid_columnconfigure(0, weight=1)
+        detalle_frame.grid_rowconfigure(1, weight=1)
+        detalle_frame.grid_rowconfigure(3, weight=2)
+
+        self.lbl_estadisticas = ctk.CTkLabel(
+            detalle_frame,
+            text="📊 Columnas - seleccione una tabla",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        self.lbl_estadisticas.grid(row=0, column=0, sticky="w", padx=10, pady=5)
+
+        self.tabla_estadisticas = self._crear_treeview(
+            detalle_frame, 1, "Columna", 150, COLUMNAS_ESTADISTICAS, height=8
+        )
+
+        self.lbl_filas = ctk.CTkLabel(detalle_frame, text="📄 Filas", font=ctk.CTkFont(size=14, weight="bold"))
+        self.lbl_filas.grid(row=2, column=0, sticky="w", padx=10, pady=5)
+
+        filas_container = ctk.CTkFrame(detalle_frame, fg_color="transparent")
+        filas_container.grid(row=3, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        filas_container.grid_columnconfigure(0, weight=1)
+        filas_container.grid_rowconfigure(0, weight=1)
+
+        self.tabla_filas = ttk.Treeview(filas_container, show="headings", selectmode="browse", style="Treeview")
+        self.tabla_filas.grid(row=0, column=0, sticky="nsew")
+
+        # La barra vertical recorre todas las filas de la tabla, no solo los items visibles
+        scroll_v = ttk.Scrollbar(filas_container, orient="vertical")
+        scroll_v.grid(row=0, column=1, sticky="ns")
+        scroll_h = ttk.Scrollbar(filas_container, orient="horizontal", command=self.tabla_filas.xview)
+        scroll_h.grid(row=1, column=0, sticky="ew")
+        self.tabla_filas.configure(xscrollcommand=scroll_h.set)
+
+        self.vista_filas = TablaVirtual(self.tabla_filas, scroll_v, self.actualizar_info_filas, self.ejecutor)
+
+    def _crear_treeview(self, parent, fila, titulo, ancho, columnas, height):
+        """Treeview con la primera columna (#0) como nombre y barras de desplazamiento"""
+        container = ctk.CTkFrame(parent, fg_color="transparent")
+        container.grid(row=fila, column=0, sticky="nsew", padx=5, pady=(0, 5))
+        container.grid_columnconfigure(0, weight=1)
+        container.grid_rowconfigure(0, weight=1)
+
+        arbol = ttk.Treeview(
+            container,
+            columns=[clave for clave, _, _ in columnas],
+            selectmode="browse",
+            height=height,
+            style="Treeview"
+        )
+        arbol.heading("#0", text=titulo)
+        arbol.column("#0", width=ancho, minwidth=80, stretch=False, anchor='w')
+        for clave, texto, ancho_columna in columnas:
+            arbol.heading(clave, text=texto)
+            arbol.column(clave, width=ancho_columna, minwidth=40, stretch=True, anchor='w')
+        arbol.grid(row=0, column=0, sticky="nsew")
+
+        scroll_v = ttk.Scrollbar(container, orient="vertical", command=arbol.yview)
+        scroll_v.grid(row=0, column=1, sticky="ns")
+        scroll_h = ttk.Scrollbar(container, orient="horizontal", command=arbol.xview)
+        scroll_h.grid(row=1, column=0, sticky="ew")
+        arbol.configure(yscrollcommand=scroll_v.set, xscrollcommand=scroll_h.set)
+        return arbol
+
+    def _en_segundo_plano(self, funcion, al_terminar, *args):
+        """Ejecuta funcion(*args) en el hilo del explorador y entrega el resultado (o el error) a Tk"""
+        def entregar(futuro):
+            error = futuro.exception()
+            resultado = None if error else futuro.result()
+            try:
+                self.ventana.after(0, lambda: self._entregar(al_terminar, resultado, error))
+            except (TclError, RuntimeError):
+                pass  # La ventana ya no existe
+
+        try:
+            self.ejecutor.submit(funcion, *args).add_done_callback(entregar)
+        except RuntimeError:
+            pass  # Ejecutor detenido: la ventana se está cerrando
+
+    def _entregar(self, al_terminar, resultado, error):
+        if self.cerrada:
+            return
+        if error is not None:
+            self.lbl_estado.configure(text="")
+            messagebox.showerror("Error", f"Error al consultar la base:\n{error}", parent=self.ventana)
+            return
+        al_terminar(resultado)
+
+    def actualizar_tablas(self):
+        """Vuelve a leer la lista de tablas con sus conteos"""
+        self.lbl_estado.configure(text="⏳ Leyendo tablas...")
+        self._en_segundo_plano(resumen_tablas, self.mostrar_tablas, self.bd)
+
+    def mostrar_tablas(self, resumen):
+        self.lista_tablas.delete(*self.lista_tablas.get_children())
+        for info in resumen:
+            # Conteo por rango de rowid (aproximado si hubo borrados) hasta que la vista cuente las filas
+            filas = "-" if info['filas'] is None else f"≈ {info['filas']:,}"
+            self.lista_tablas.insert(
+                "", "end", iid=info['tabla'], text=info['tabla'],
+                values=(filas, info['columnas'], texto_valor(info['fecha_carga']), texto_valor(info['archivo']))
+            )
+        self.lbl_estado.configure(text=f"📋 {len(resumen)} tablas" if resumen else "📭 No hay tablas")
+        if self.tabla_actual in {info['tabla'] for info in resumen}:
+            self.lista_tablas.selection_set(self.tabla_actual)
+
+    def seleccionar_tabla(self):
+        seleccion = self.lista_tablas.selection()
+        if not seleccion or seleccion[0] == self.tabla_actual:
+            return
+        self.tabla_actual = tabla = seleccion[0]
+        self.vista_filas.limpiar()
+        self.tabla_estadisticas.delete(*self.tabla_estadisticas.get_children())
+        self.lbl_estadisticas.configure(text=f"📊 Columnas de {tabla} - ⏳ consultando...")
+        self.lbl_filas.configure(text="📄 Filas")
+        self._en_segundo_plano(self._abrir_tabla, lambda resultado: self.mostrar_tabla(tabla, *resultado), tabla)
+
+    def _abrir_tabla(self, tabla):
+        """(En el hilo del explorador) estadísticas y fuente paginada de la tabla"""
+        estadisticas = estadisticas_columnas(self.bd, tabla)
+        try:
+            fuente = FuenteSQLite(self.bd, tabla)
+        except ValueError:
+            fuente = None  # WITHOUT ROWID: solo estadísticas
+        if self.cerrada and fuente is not None:
+            fuente.cerrar()  # La ventana se cerró mientras se abría: nadie va a mostrarla
+            fuente = None
+        return estadisticas, fuente
+
+    def mostrar_tabla(self, tabla, estadisticas, fuente):
+        if self.cerrada or tabla != self.tabla_actual:
+            # Ventana cerrada u otra tabla seleccionada mientras se consultaba esta
+            if fuente is not None:
+                cerrar_fuente_en(self.ejecutor, fuente)
+            return
+
+        filas_muestra = estadisticas[0]['filas_muestra'] if estadisticas else 0
+        self.lbl_estadisticas.configure(
+            text=f"📊 Columnas de {tabla} - nulos y ejemplos sobre {filas_muestra:,} filas repartidas"
+        )
+        for info in estadisticas:
+            tipo = info['tipo'] + (" 🔑" if info['clave'] else "")
+            origen = info['columna_original'] or ""
+            if info['formato_fecha']:
+                origen += f" ({info['formato_fecha']})"
+            nulos = "" if info['nulos_muestra'] is None else f"{info['nulos_muestra']:.1%}"
+            distintos = "" if info['distintos'] is None else f"≈ {info['distintos']:,}"
+            minimo, maximo = (texto_valor(info['minimo']), texto_valor(info['maximo'])) if info['indice'] else ("", "")
+            self.tabla_estadisticas.insert(
+                "", "end", text=info['columna'],
+                values=(tipo, origen, info['indice'] or "", nulos, distintos, minimo, maximo, texto_valor(info['ejemplo']))
+            )
+
+        if fuente is None:
+            self.lbl_filas.configure(text="📄 Filas - tabla WITHOUT ROWID: no se puede paginar")
+            return
+        self.tabla_filas["columns"] = fuente.columnas
+        for col in fuente.columnas:
+            self.tabla_filas.heading(col, text=str(col))
+            self.tabla_filas.column(col, width=120, minwidth=80, stretch=True, anchor='w')
+        self.vista_filas.mostrar(fuente)
+
+    def actualizar_info_filas(self, fuente):
+        """Total de filas (crece mientras se indexa); al terminar corrige el conteo de la lista"""
+        texto = f"📄 Filas - {fuente.total:,} × {len(fuente.columnas)} columnas"
+        if fuente.error:
+            texto += f" - ⚠️ {fuente.error}"
+        elif not fuente.completo:
+            texto += " - ⏳ contando filas..."
+        elif self.lista_tablas.exists(fuente.tabla):
+            self.lista_tablas.set(fuente.tabla, 'filas', f"{fuente.total:,}")
+        self.lbl_filas.configure(text=texto)
+
+    def cerrar(self):
+        if self.cerrada:
+            return
+        self.cerrada = True
+        self.vista_filas.limpiar()
+        # Sin esperar: la consulta en curso termina sola y cierra la conexión de la tabla
+        self.ejecutor.shutdown(wait=False)
+        self.ventana.destroy()
+